@@ -0,0 +1,50 @@
+"""proposal_query_indexes
+
+Revision ID: 3b7f1c2a9d4e
+Revises: eddaed862754
+Create Date: 2026-10-16 09:12:41.208311
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7f1c2a9d4e"
+down_revision: str | None = "eddaed862754"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Sort order for GET /proposals and keyset pagination
+    op.create_index("ix_proposals_created_at_id", "proposals", ["created_at", "id"])
+
+    # Filtered listings: equality column first, then the sort key
+    op.create_index(
+        "ix_proposals_ministry_created_at", "proposals", ["ministry_id", "created_at", "id"]
+    )
+    op.create_index(
+        "ix_proposals_category_created_at", "proposals", ["category_id", "created_at", "id"]
+    )
+    op.create_index("ix_proposals_status_created_at", "proposals", ["status", "created_at", "id"])
+
+    # Duplicate detection in ProposalRepository.check_duplicate
+    op.create_index(
+        "ix_proposals_duplicate_check", "proposals", ["ministry_id", "title", "requested_amount"]
+    )
+
+    # Covering index for the dashboard's approved totals grouped by category
+    op.create_index(
+        "ix_proposals_status_category", "proposals", ["status", "category_id", "approved_amount"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_proposals_status_category", table_name="proposals")
+    op.drop_index("ix_proposals_duplicate_check", table_name="proposals")
+    op.drop_index("ix_proposals_status_created_at", table_name="proposals")
+    op.drop_index("ix_proposals_category_created_at", table_name="proposals")
+    op.drop_index("ix_proposals_ministry_created_at", table_name="proposals")
+    op.drop_index("ix_proposals_created_at_id", table_name="proposals")
@@ -0,0 +1,44 @@
+"""category_budget_shards
+
+Revision ID: 5e2a9b7c4f18
+Revises: 8c41d0e5a7b2
+Create Date: 2026-10-16 14:05:41.208317
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e2a9b7c4f18"
+down_revision: str | None = "8c41d0e5a7b2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Create category_budget_shards table
+    op.create_table(
+        "category_budget_shards",
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("shard", sa.Integer(), nullable=False),
+        sa.Column("remaining_budget", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["category_id"],
+            ["categories.id"],
+        ),
+        sa.PrimaryKeyConstraint("category_id", "shard"),
+    )
+
+
+def downgrade() -> None:
+    # Hand any budget held in shards back to the categories before dropping them
+    op.execute(
+        "UPDATE categories SET remaining_budget = remaining_budget + COALESCE("
+        "(SELECT SUM(s.remaining_budget) FROM category_budget_shards s"
+        " WHERE s.category_id = categories.id), 0)"
+    )
+    op.drop_table("category_budget_shards")
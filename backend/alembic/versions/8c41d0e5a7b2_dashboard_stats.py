@@ -0,0 +1,82 @@
+"""dashboard_stats
+
+Revision ID: 8c41d0e5a7b2
+Revises: 3b7f1c2a9d4e
+Create Date: 2026-10-16 11:47:03.915520
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c41d0e5a7b2"
+down_revision: str | None = "3b7f1c2a9d4e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+STATS_SELECT = """
+    SELECT {key},
+           COALESCE(SUM(requested_amount), 0),
+           COALESCE(SUM(CASE WHEN status = 'Approved' THEN approved_amount ELSE 0 END), 0),
+           COALESCE(SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END), 0),
+           COALESCE(SUM(CASE WHEN status = 'Approved' THEN 1 ELSE 0 END), 0),
+           COALESCE(SUM(CASE WHEN status = 'Rejected' THEN 1 ELSE 0 END), 0)
+    FROM proposals
+    GROUP BY {key}
+"""
+
+
+def stats_columns() -> list[sa.Column]:
+    return [
+        sa.Column("requested_total", sa.Float(), nullable=False),
+        sa.Column("approved_total", sa.Float(), nullable=False),
+        sa.Column("pending_count", sa.Integer(), nullable=False),
+        sa.Column("approved_count", sa.Integer(), nullable=False),
+        sa.Column("rejected_count", sa.Integer(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    # Create category_stats table
+    op.create_table(
+        "category_stats",
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        *stats_columns(),
+        sa.ForeignKeyConstraint(
+            ["category_id"],
+            ["categories.id"],
+        ),
+        sa.PrimaryKeyConstraint("category_id"),
+    )
+
+    # Create ministry_stats table
+    op.create_table(
+        "ministry_stats",
+        sa.Column("ministry_id", sa.Integer(), nullable=False),
+        *stats_columns(),
+        sa.ForeignKeyConstraint(
+            ["ministry_id"],
+            ["ministries.id"],
+        ),
+        sa.PrimaryKeyConstraint("ministry_id"),
+    )
+
+    # Backfill from existing proposals
+    columns = "requested_total, approved_total, pending_count, approved_count, rejected_count"
+    op.execute(
+        f"INSERT INTO category_stats (category_id, {columns}) "  # nosec B608 - constant SQL
+        + STATS_SELECT.format(key="category_id")
+    )
+    op.execute(
+        f"INSERT INTO ministry_stats (ministry_id, {columns}) "  # nosec B608 - constant SQL
+        + STATS_SELECT.format(key="ministry_id")
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ministry_stats")
+    op.drop_table("category_stats")
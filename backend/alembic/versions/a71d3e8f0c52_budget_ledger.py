@@ -0,0 +1,74 @@
+"""budget_ledger
+
+Revision ID: a71d3e8f0c52
+Revises: 5e2a9b7c4f18
+Create Date: 2026-10-16 15:22:09.634871
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a71d3e8f0c52"
+down_revision: str | None = "5e2a9b7c4f18"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Create budget_ledger table
+    op.create_table(
+        "budget_ledger",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("entry_type", sa.String(), nullable=False),
+        sa.Column("allocated_delta", sa.Float(), nullable=False),
+        sa.Column("remaining_delta", sa.Float(), nullable=False),
+        sa.Column("proposal_id", sa.Integer(), nullable=True),
+        sa.Column("note", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_budget_ledger_category_id_id", "budget_ledger", ["category_id", "id"], unique=False
+    )
+
+    # Create budget_snapshots table
+    op.create_table(
+        "budget_snapshots",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("ledger_id", sa.Integer(), nullable=False),
+        sa.Column("as_of", sa.DateTime(), nullable=False),
+        sa.Column("allocated_budget", sa.Float(), nullable=False),
+        sa.Column("remaining_budget", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_budget_snapshots_category_as_of",
+        "budget_snapshots",
+        ["category_id", "as_of"],
+        unique=False,
+    )
+
+    # Open the ledger with each category's current balance (including sharded budget)
+    op.execute(
+        "INSERT INTO budget_ledger"
+        " (category_id, entry_type, allocated_delta, remaining_delta, note, created_at)"
+        " SELECT c.id, 'allocation', c.allocated_budget, c.remaining_budget + COALESCE("
+        "(SELECT SUM(s.remaining_budget) FROM category_budget_shards s"
+        " WHERE s.category_id = c.id), 0), 'Opening balance', CURRENT_TIMESTAMP"
+        " FROM categories c"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_budget_snapshots_category_as_of", table_name="budget_snapshots")
+    op.drop_table("budget_snapshots")
+    op.drop_index("ix_budget_ledger_category_id_id", table_name="budget_ledger")
+    op.drop_table("budget_ledger")
@@ -0,0 +1,58 @@
+"""import_jobs
+
+Revision ID: c3f8e1a9b6d2
+Revises: a71d3e8f0c52
+Create Date: 2026-10-17 10:04:51.218374
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f8e1a9b6d2"
+down_revision: str | None = "a71d3e8f0c52"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Create import_jobs table
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("file_type", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("file_size", sa.Integer(), nullable=False),
+        sa.Column("bytes_read", sa.Integer(), nullable=False),
+        sa.Column("rows_processed", sa.Integer(), nullable=False),
+        sa.Column("valid_rows", sa.Integer(), nullable=False),
+        sa.Column("error_rows", sa.Integer(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    # Create import_job_rows table
+    op.create_table(
+        "import_job_rows",
+        sa.Column("job_id", sa.String(), nullable=False),
+        sa.Column("row_number", sa.Integer(), nullable=False),
+        sa.Column("valid", sa.Boolean(), nullable=False),
+        sa.Column("draft", sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["import_jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("job_id", "row_number"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("import_job_rows")
+    op.drop_table("import_jobs")
@@ -0,0 +1,31 @@
+"""import_job_heartbeat
+
+Revision ID: d9a4c7e2f513
+Revises: c3f8e1a9b6d2
+Create Date: 2026-10-17 14:36:12.504917
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d9a4c7e2f513"
+down_revision: str | None = "c3f8e1a9b6d2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Record which worker holds each import job and when it last touched it
+    op.add_column("import_jobs", sa.Column("worker_id", sa.String(), nullable=True))
+    op.add_column("import_jobs", sa.Column("updated_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("import_jobs") as batch_op:
+        batch_op.drop_column("updated_at")
+        batch_op.drop_column("worker_id")
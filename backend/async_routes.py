@@ -0,0 +1,155 @@
+"""
+Async variants of the hot read and approval routes.
+
+Enabled with DATABASE_ASYNC=true: main.py then includes this router ahead of the sync
+routes, so these handlers serve the same paths on the event loop with an AsyncSession
+instead of holding a threadpool thread per request.
+"""
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth import CurrentUser, require_finance_role_async
+from database import get_async_db
+from etags import not_modified
+from exceptions import CategoryNotFoundError
+from models import (
+    Category,
+    Ministry,
+    Proposal,
+    ProposalApprove,
+    ProposalDecisionBatch,
+    ProposalDecisionBatchResult,
+    ProposalPage,
+    ProposalReject,
+)
+from repositories.categories import AsyncCategoryRepository
+from repositories.ministries import AsyncMinistryRepository
+from responses import fast_json
+from services.approvals import AsyncApprovalService
+from services.dashboard import AsyncDashboardService
+from services.proposals import AsyncProposalService
+from settings import settings
+
+router = APIRouter()
+
+
+@router.get("/categories", response_model=list[Category])
+async def get_categories(
+    request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+):
+    """Get all budget categories"""
+    if cached := not_modified(request, response, "categories"):
+        return cached
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json(await AsyncCategoryRepository.get_all_rows(db), response)
+    return await AsyncCategoryRepository.get_all(db)
+
+
+@router.get("/categories/{category_id}", response_model=Category)
+async def get_category(category_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get a specific category by ID"""
+    category = await AsyncCategoryRepository.get_by_id(db, category_id)
+    if not category:
+        raise CategoryNotFoundError("Category not found")
+    return category
+
+
+@router.get("/ministries", response_model=list[Ministry])
+async def get_ministries(
+    request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+):
+    """Get all active ministries"""
+    if cached := not_modified(request, response, "ministries"):
+        return cached
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json(await AsyncMinistryRepository.get_all_active_rows(db), response)
+    return await AsyncMinistryRepository.get_all_active(db)
+
+
+@router.get("/proposals", response_model=list[Proposal])
+async def list_proposals(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    ministry_id: int | None = None,
+    category_id: int | None = None,
+    status: str | None = None,
+):
+    """List proposals with optional filters."""
+    if cached := not_modified(request, response, "proposals", "ministries"):
+        return cached
+    if settings.FAST_JSON_RESPONSES:
+        rows = await AsyncProposalService.list_proposal_rows(db, ministry_id, category_id, status)
+        return fast_json(rows, response)
+    return await AsyncProposalService.list_proposals(db, ministry_id, category_id, status)
+
+
+@router.get("/proposals/page", response_model=ProposalPage)
+async def list_proposals_page(
+    db: AsyncSession = Depends(get_async_db),
+    limit: int | None = None,
+    cursor: str | None = None,
+    fields: str | None = None,
+    ministry_id: int | None = None,
+    category_id: int | None = None,
+    status: str | None = None,
+):
+    """List proposals one page at a time, newest first."""
+    field_list = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+    return await AsyncProposalService.list_proposals_page(
+        db, limit, cursor, field_list, ministry_id, category_id, status
+    )
+
+
+@router.get("/proposals/{proposal_id}", response_model=Proposal)
+async def get_proposal(proposal_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get a proposal by ID."""
+    return await AsyncProposalService.get_proposal(db, proposal_id)
+
+
+@router.post("/proposals/decisions", response_model=ProposalDecisionBatchResult)
+async def decide_proposals(
+    body: ProposalDecisionBatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(require_finance_role_async),
+):
+    """Approve and/or reject many proposals in one transaction (Finance users only)."""
+    return await AsyncApprovalService.decide_many(db, [item.model_dump() for item in body.items])
+
+
+@router.post("/proposals/{proposal_id}/approve", response_model=Proposal)
+async def approve_proposal(
+    proposal_id: int,
+    body: ProposalApprove,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(require_finance_role_async),
+):
+    """Approve a proposal (Finance users only)."""
+    return await AsyncApprovalService.approve_proposal(
+        db, proposal_id, body.approved_amount, body.decision_notes
+    )
+
+
+@router.post("/proposals/{proposal_id}/reject", response_model=Proposal)
+async def reject_proposal(
+    proposal_id: int,
+    body: ProposalReject,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(require_finance_role_async),
+):
+    """Reject a proposal (Finance users only)."""
+    return await AsyncApprovalService.reject_proposal(db, proposal_id, body.decision_notes)
+
+
+@router.get("/dashboard/summary")
+async def dashboard_summary(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(require_finance_role_async),
+):
+    """Budget and proposal aggregates per category and ministry (Finance users only)."""
+    if cached := not_modified(request, response, "categories", "ministries", "proposals"):
+        return cached
+    return await AsyncDashboardService.get_summary(db)
@@ -1,24 +1,104 @@
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
-from typing import cast
+from typing import Any, cast
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from database import User as DBUser
-from database import get_db
+from database import get_async_db, get_db
+from exceptions import PasswordHashingBusyError
 from models import TokenData
 from settings import settings
 
 # Password hashing context - using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 logger = logging.getLogger(__name__)
 
 # JWT token scheme
 security = HTTPBearer()
+# For streams, which EventSource clients open without an Authorization header
+optional_security = HTTPBearer(auto_error=False)
+
+# bcrypt runs in a small process pool so it neither holds the GIL of the API worker nor
+# lets a login burst queue without bound; callers beyond the limit get a 429
+_hash_executor: ProcessPoolExecutor | None = None
+_hash_executor_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(max(settings.PASSWORD_HASH_MAX_PENDING, 1))
+
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight", "Password hash/verify calls queued or running"
+)
+PASSWORD_HASH_QUEUE_WAIT = Histogram(
+    "password_hash_queue_wait_seconds", "Time a password hash/verify call waited for a worker"
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds", "Time spent computing a password hash/verify"
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total", "Password hash/verify calls rejected because the pool was full"
+)
+
+
+def _bcrypt_task(operation: str, *args: str) -> tuple[Any, float]:
+    """Run one bcrypt operation; executed in a pool worker. Returns (result, start time)."""
+    started = time.time()
+    if operation == "hash":
+        return pwd_context.hash(args[0]), started
+    return pwd_context.verify(args[0], args[1]), started
+
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            _hash_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        return _hash_executor
+
+
+def _run_bcrypt(operation: str, *args: str) -> Any:
+    """Run a bcrypt operation in the hashing pool, rejecting it if the pool is saturated."""
+    global _hash_executor
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return _bcrypt_task(operation, *args)[0]
+
+    if not _hash_slots.acquire(blocking=False):
+        PASSWORD_HASH_REJECTED.inc()
+        raise PasswordHashingBusyError("Too many concurrent authentication requests, retry shortly")
+
+    PASSWORD_HASH_IN_FLIGHT.inc()
+    submitted = time.time()
+    try:
+        try:
+            result, started = _get_hash_executor().submit(_bcrypt_task, operation, *args).result()
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool next time and finish this call inline
+            logger.exception("password hashing pool broke, recreating")
+            with _hash_executor_lock:
+                _hash_executor = None
+            result, started = _bcrypt_task(operation, *args)
+    finally:
+        PASSWORD_HASH_IN_FLIGHT.dec()
+        _hash_slots.release()
+
+    PASSWORD_HASH_QUEUE_WAIT.observe(max(started - submitted, 0.0))
+    PASSWORD_HASH_DURATION.observe(time.time() - started)
+    return result
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -27,22 +107,29 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     if hashed_password.startswith(("$2a$", "$2b$", "$2y$")):
         # Try bcrypt verification
         try:
-            return pwd_context.verify(plain_password, hashed_password)
+            return bool(_run_bcrypt("verify", plain_password, hashed_password))
+        except PasswordHashingBusyError:
+            raise
         except Exception:
             logger.exception("bcrypt verification failed")
             return False
 
     # Fallback to legacy SHA256 for backward compatibility
-    # This allows existing users to login and migrate on next password change
-    import hashlib
-
+    # This allows existing users to login; authenticate_user upgrades them to bcrypt
     legacy_hash = hashlib.sha256(plain_password.encode()).hexdigest()
     return legacy_hash == hashed_password
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    return cast(str, _run_bcrypt("hash", password))
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash is legacy SHA256 or uses a different bcrypt cost than configured."""
+    if not hashed_password.startswith(("$2a$", "$2b$", "$2y$")):
+        return True
+    return bool(pwd_context.needs_update(hashed_password))
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
@@ -67,38 +154,173 @@ def authenticate_user(db: Session, username: str, password: str) -> DBUser | Non
     if not verify_password(password, hashed_password):
         print(f"[AUTH] Login failed: invalid password for user '{username}'")
         return None
+    if password_needs_rehash(hashed_password):
+        # Upgrade the stored hash to the configured scheme and cost while we know the password
+        user.hashed_password = get_password_hash(password)  # type: ignore[assignment]
+        db.commit()
     return user
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)
-) -> DBUser:
-    """Get the current authenticated user from JWT token."""
-    credentials_exception = HTTPException(
+@dataclass(frozen=True)
+class CurrentUser:
+    """Snapshot of the authenticated user, safe to cache across requests and sessions."""
+
+    id: int
+    username: str
+    role: str
+    ministry_id: int | None
+    is_active: bool
+    # Services fall back to current_user.ministry when ministry_id is unset
+    ministry: None = None
+
+    @classmethod
+    def from_db(cls, user: DBUser) -> "CurrentUser":
+        return cls(
+            id=cast(int, user.id),
+            username=cast(str, user.username),
+            role=cast(str, user.role),
+            ministry_id=cast(int | None, user.ministry_id),
+            is_active=bool(user.is_active),
+        )
+
+
+class TokenUserCache:
+    """
+    TTL + LRU cache of bearer token -> CurrentUser.
+
+    An entry lives until the earlier of its TTL and the token's own expiry, so a hit
+    needs neither a JWT decode nor a database query.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[CurrentUser, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> CurrentUser | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return user
+
+    def put(self, token: str, user: CurrentUser, token_expires_at: float) -> None:
+        if self.ttl_seconds <= 0 or self.max_size <= 0:
+            return
+        expires_at = min(time.time() + self.ttl_seconds, token_expires_at)
+        with self._lock:
+            self._entries[token] = (user, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for token in [t for t, (user, _) in self._entries.items() if user.id == user_id]:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = TokenUserCache(settings.AUTH_CACHE_MAX_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(DBUser, "after_update")
+@event.listens_for(DBUser, "after_delete")
+def _invalidate_cached_user(mapper: Any, connection: Any, target: DBUser) -> None:
+    """Drop cached snapshots of a user whenever the user row changes."""
+    user_cache.invalidate_user(cast(int, target.id))
+
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def decode_token(token: str) -> tuple[str, float]:
+    """Return the username and expiry timestamp carried by a bearer token, or raise 401."""
+
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
+            raise credentials_exception()
         token_data = TokenData(username=username)
     except JWTError:
-        raise credentials_exception from None
+        raise credentials_exception() from None
 
-    user: DBUser | None = (
-        db.query(DBUser).filter(DBUser.username == token_data.username).first()
-    )
+    return cast(str, token_data.username), float(payload.get("exp", 0))
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)
+) -> CurrentUser:
+    """Get the current authenticated user from JWT token (cached per token)."""
+    return _user_for_token(db, credentials.credentials)
+
+
+def get_stream_user(
+    access_token: str | None = None,
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_security),
+    db: Session = Depends(get_db),
+) -> CurrentUser:
+    """
+    Get the user of a streaming request from its bearer token or `access_token` query parameter.
+
+    EventSource cannot set headers, so browsers pass the token in the URL instead.
+    """
+    token = credentials.credentials if credentials is not None else access_token
+    if not token:
+        raise credentials_exception()
+    return _user_for_token(db, token)
+
+
+def _user_for_token(db: Session, token: str) -> CurrentUser:
+    cached = user_cache.get(token)
+    if cached is not None:
+        return cached
+
+    username, expires_at = decode_token(token)
+    user: DBUser | None = db.query(DBUser).filter(DBUser.username == username).first()
     if user is None:
-        raise credentials_exception
-    return user
+        raise credentials_exception()
+    current_user = CurrentUser.from_db(user)
+    user_cache.put(token, current_user, expires_at)
+    return current_user
 
 
-def require_finance_role(current_user: DBUser = Depends(get_current_user)) -> DBUser:
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> CurrentUser:
+    """Get the current authenticated user from JWT token using the async session (cached per token)."""
+    token = credentials.credentials
+    cached = user_cache.get(token)
+    if cached is not None:
+        return cached
+
+    username, expires_at = decode_token(token)
+    result = await db.execute(select(DBUser).where(DBUser.username == username))
+    user: DBUser | None = result.scalars().first()
+    if user is None:
+        raise credentials_exception()
+    current_user = CurrentUser.from_db(user)
+    user_cache.put(token, current_user, expires_at)
+    return current_user
+
+
+def require_finance_role(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     """Require finance role."""
     if current_user.role != "finance":
         raise HTTPException(
@@ -108,7 +330,7 @@ def require_finance_role(current_user: DBUser = Depends(get_current_user)) -> DB
     return current_user
 
 
-def require_ministry_role(current_user: DBUser = Depends(get_current_user)) -> DBUser:
+def require_ministry_role(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     """Require ministry role."""
     if current_user.role != "ministry":
         raise HTTPException(
@@ -116,3 +338,10 @@ def require_ministry_role(current_user: DBUser = Depends(get_current_user)) -> D
             detail="Access denied. Required role: ministry",
         )
     return current_user
+
+
+async def require_finance_role_async(
+    current_user: CurrentUser = Depends(get_current_user_async),
+) -> CurrentUser:
+    """Require finance role (async session variant)."""
+    return require_finance_role(current_user)
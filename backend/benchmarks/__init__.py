@@ -0,0 +1,16 @@
+"""
+Benchmarks for the API hot paths.
+
+Micro-benchmarks (pytest-benchmark) run in-process against a seeded database:
+    python -m pytest benchmarks --benchmark-json=bench.json
+
+The load generator starts uvicorn on a seeded database and drives it with
+concurrent users, reporting latency percentiles and throughput per endpoint:
+    python -m benchmarks.loadgen run --proposals 1000000 --output load.json
+    python -m benchmarks.loadgen compare base.json load.json
+
+Both seed their databases with benchmarks.datagen, which can also load a skewed
+dataset into any empty database and write contract files of any size:
+    python -m benchmarks.datagen load --proposals 1000000
+    python -m benchmarks.datagen contracts big.json --rows 500000
+"""
@@ -0,0 +1,106 @@
+import itertools
+import os
+
+import pytest
+from sqlalchemy import select
+
+from benchmarks.seed import MINISTRY_USER, PASSWORD, contract_csv
+from database import Proposal as DBProposal
+
+CONTRACT_ROWS = int(os.getenv("BENCH_CONTRACT_ROWS", "1000"))
+APPROVAL_ROUNDS = 200
+
+
+@pytest.fixture(scope="module")
+def pending_ids(bench_engine):
+    """Pending proposals for the approval benchmark to decide, one per round"""
+    with bench_engine.connect() as connection:
+        ids = connection.scalars(
+            select(DBProposal.id)
+            .where(DBProposal.status == "Pending")
+            .order_by(DBProposal.id)
+            .limit(APPROVAL_ROUNDS * 2)
+        ).all()
+    return iter(ids)
+
+
+class BenchProposals:
+    """Benchmark the proposal list endpoints"""
+
+    def bench_list_proposals(self, benchmark, bench_client):
+        """Benchmark listing every proposal, as the proposals page does"""
+        response = benchmark(bench_client.get, "/proposals")
+        assert response.status_code == 200
+
+    def bench_list_proposals_by_ministry(self, benchmark, bench_client):
+        """Benchmark listing one ministry's proposals"""
+        response = benchmark(bench_client.get, "/proposals", params={"ministry_id": 1})
+        assert response.status_code == 200
+
+    def bench_list_proposals_page(self, benchmark, bench_client):
+        """Benchmark the first page of the cursor-paginated list"""
+        response = benchmark(bench_client.get, "/proposals/page", params={"limit": 50})
+        assert response.status_code == 200
+
+
+class BenchDashboard:
+    """Benchmark the dashboard"""
+
+    def bench_dashboard_summary(self, benchmark, bench_client, finance_headers):
+        """Benchmark the dashboard summary"""
+        response = benchmark(bench_client.get, "/dashboard/summary", headers=finance_headers)
+        assert response.status_code == 200
+
+
+class BenchApprovals:
+    """Benchmark proposal approval"""
+
+    def bench_approve_proposal(self, benchmark, bench_client, finance_headers, pending_ids):
+        """Benchmark approving a pending proposal (a new one each round)"""
+
+        def setup():
+            return (next(pending_ids),), {}
+
+        def approve(proposal_id):
+            return bench_client.post(
+                f"/proposals/{proposal_id}/approve",
+                json={"approved_amount": 1.0},
+                headers=finance_headers,
+            )
+
+        response = benchmark.pedantic(approve, setup=setup, rounds=APPROVAL_ROUNDS)
+        assert response.status_code == 200
+
+
+class BenchAuth:
+    """Benchmark authentication"""
+
+    def bench_login(self, benchmark, bench_client):
+        """Benchmark a password login (dominated by bcrypt by design)"""
+        response = benchmark.pedantic(
+            bench_client.post,
+            args=("/auth/login",),
+            kwargs={"json": {"username": MINISTRY_USER, "password": PASSWORD}},
+            rounds=20,
+        )
+        assert response.status_code == 200
+
+
+class BenchContracts:
+    """Benchmark contract parsing"""
+
+    def bench_parse_contract(self, benchmark, bench_client, bench_sizes, ministry_headers):
+        """Benchmark parsing a CSV contract of BENCH_CONTRACT_ROWS rows"""
+        content = contract_csv(CONTRACT_ROWS, bench_sizes)
+        counter = itertools.count()
+
+        def parse():
+            return bench_client.post(
+                "/contracts/parse",
+                files={"file": (f"contract-{next(counter)}.csv", content, "text/csv")},
+                headers=ministry_headers,
+            )
+
+        response = benchmark.pedantic(parse, rounds=10)
+        assert response.status_code == 200
+        assert len(response.json()["drafts"]) == CONTRACT_ROWS
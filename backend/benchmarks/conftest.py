@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from auth import create_access_token
+from benchmarks.datagen import DatasetSizes
+from benchmarks.seed import FINANCE_USER, MINISTRY_USER, seed_database
+from database import get_db
+from main import app
+
+# Data volumes, e.g. BENCH_PROPOSALS=1000000 for production-sized runs
+BENCH_SIZES = DatasetSizes(
+    ministries=int(os.getenv("BENCH_MINISTRIES", "100")),
+    categories=int(os.getenv("BENCH_CATEGORIES", "500")),
+    proposals=int(os.getenv("BENCH_PROPOSALS", "20000")),
+)
+
+
+@pytest.fixture(scope="session")
+def bench_sizes():
+    """Data volumes of the seeded benchmark database"""
+    return BENCH_SIZES
+
+
+@pytest.fixture(scope="session")
+def bench_engine(bench_sizes):
+    """File database seeded once per benchmark session"""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{directory}/bench.db", connect_args={"check_same_thread": False}
+        )
+        seed_database(engine, bench_sizes)
+        yield engine
+        engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def bench_client(bench_engine):
+    """Test client bound to the benchmark database"""
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=bench_engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="session")
+def finance_headers():
+    return {"Authorization": f"Bearer {create_access_token({'sub': FINANCE_USER})}"}
+
+
+@pytest.fixture(scope="session")
+def ministry_headers():
+    return {"Authorization": f"Bearer {create_access_token({'sub': MINISTRY_USER})}"}
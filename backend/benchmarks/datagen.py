@@ -0,0 +1,435 @@
+"""
+Synthetic datasets for scale testing.
+
+`load` fills an empty database with ministries, categories and proposals whose
+popularity follows a Zipf distribution (a few ministries and categories get most
+of the proposals), with log-normal amounts, creation times spread over --days and
+older proposals more likely to be decided. Rows go in with multi-row INSERTs;
+category budgets, the budget ledger and the dashboard aggregates match the
+proposals. `contracts` writes a CSV or JSON contract file of any size in the
+formats ContractParserService accepts, naming the ministries and categories of a
+dataset loaded with the same sizes and seed.
+
+Usage:
+    python -m benchmarks.datagen load --proposals 1000000 --database-url sqlite:///./scale.db
+    python -m benchmarks.datagen contracts big.csv --rows 500000
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import random
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, TextIO
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from database import Base
+from database import BudgetLedgerEntry as DBBudgetLedgerEntry
+from database import Category as DBCategory
+from database import Ministry as DBMinistry
+from database import Proposal as DBProposal
+from repositories.stats import StatsRepository
+from settings import settings
+
+MIGRATIONS_DIR = Path(__file__).parent.parent / "alembic"
+INSERT_CHUNK_ROWS = 10000
+
+MINISTRY_DOMAINS = (
+    "Education", "Health", "Infrastructure", "Defense", "Finance", "Transportation",
+    "Energy", "Agriculture", "Justice", "Environment", "Housing", "Labour", "Tourism",
+    "Culture", "Science", "Trade", "Foreign Affairs", "Interior", "Water", "Digital Affairs",
+)
+MINISTRY_FORMS = (
+    "Ministry of {}", "{} Agency", "{} Authority", "{} Commission", "{} Directorate", "Office of {}",
+)
+CATEGORY_AREAS = (
+    "Road Maintenance", "School Construction", "Hospital Equipment", "Public Transit",
+    "Water Supply", "Broadband Rollout", "Research Grants", "Housing Subsidies",
+    "Border Security", "Renewable Energy", "Farm Support", "Court Modernization",
+    "Emergency Services", "Waste Management", "Cultural Heritage", "Public Health Campaigns",
+    "Teacher Training", "Bridge Repairs", "Port Upgrades", "IT Systems",
+)
+CATEGORY_KINDS = ("Capital", "Operations", "Grants", "Pilot Programmes", "Regional")
+TITLE_VERBS = ("Upgrade", "Expand", "Maintain", "Procure", "Modernize", "Build", "Renovate", "Pilot")
+REGIONS = ("North", "South", "East", "West", "Central", "Coastal", "Highlands", "Capital District")
+
+# Proposals younger than this are mostly still pending; older ones mostly decided
+RECENT_DAYS = 30
+
+CONTRACT_FIELDS = ("ministry_name", "category", "title", "description", "requested_amount")
+# Other spellings of each field that ContractParserService.extract_fields accepts
+FIELD_ALIASES = {
+    "ministry_name": ("ministry_name", "ministry", "dept"),
+    "category": ("category", "category_name", "dept_category"),
+    "title": ("title", "project", "subject"),
+    "description": ("description", "details"),
+    "requested_amount": ("requested_amount", "amount", "value", "requested"),
+}
+
+
+@dataclass(frozen=True)
+class DatasetSizes:
+    """Number of rows to generate."""
+
+    ministries: int = 100
+    categories: int = 500
+    proposals: int = 20000
+
+
+def ministry_name(index: int) -> str:
+    """Unique name of the index'th (0-based) generated ministry."""
+    domain = MINISTRY_DOMAINS[index % len(MINISTRY_DOMAINS)]
+    form = MINISTRY_FORMS[index // len(MINISTRY_DOMAINS) % len(MINISTRY_FORMS)]
+    series = index // (len(MINISTRY_DOMAINS) * len(MINISTRY_FORMS))
+    return form.format(domain) + (f" {series + 1}" if series else "")
+
+
+def category_name(index: int) -> str:
+    """Unique name of the index'th (0-based) generated category."""
+    area = CATEGORY_AREAS[index % len(CATEGORY_AREAS)]
+    kind = CATEGORY_KINDS[index // len(CATEGORY_AREAS) % len(CATEGORY_KINDS)]
+    series = index // (len(CATEGORY_AREAS) * len(CATEGORY_KINDS))
+    return f"{area} - {kind}" + (f" {series + 1}" if series else "")
+
+
+class ZipfSampler:
+    """
+    Draws IDs 1..n with Zipf popularity (weight 1/rank**exponent).
+
+    Ranks are assigned to IDs in a seeded random order, so the most popular ID is
+    not always 1.
+    """
+
+    def __init__(self, n: int, exponent: float, rng: random.Random):
+        self._ids = list(range(1, n + 1))
+        rng.shuffle(self._ids)
+        self._cum_weights = list(itertools.accumulate(1 / rank**exponent for rank in range(1, n + 1)))
+        self._rng = rng
+
+    def sample(self, k: int) -> list[int]:
+        return self._rng.choices(self._ids, cum_weights=self._cum_weights, k=k)
+
+
+class DatasetGenerator:
+    """Deterministic rows of one dataset; the same sizes and seed give the same data."""
+
+    def __init__(
+        self,
+        sizes: DatasetSizes,
+        seed: int = 0,
+        zipf_exponent: float = 1.1,
+        days: int = 730,
+        now: datetime | None = None,
+    ):
+        self.sizes = sizes
+        self.days = days
+        self.now = now or datetime.now(UTC)
+        self._rng = random.Random(seed)
+        self._ministries = ZipfSampler(sizes.ministries, zipf_exponent, random.Random(seed + 1))
+        self._categories = ZipfSampler(sizes.categories, zipf_exponent, random.Random(seed + 2))
+        # Typical request size varies by category (road works cost more than training)
+        self._category_scale = [0.0] + [
+            self._rng.lognormvariate(0.0, 0.8) for _ in range(sizes.categories)
+        ]
+
+    def ministries(self) -> list[dict[str, Any]]:
+        created_at = self.now - timedelta(days=self.days + 1)
+        return [
+            {
+                "id": i + 1,
+                "name": ministry_name(i),
+                "description": f"Generated ministry {i + 1}",
+                "is_active": True,
+                "created_at": created_at,
+            }
+            for i in range(self.sizes.ministries)
+        ]
+
+    def amount(self, category_id: int) -> float:
+        """A log-normal request amount (median about 120,000) rounded to hundreds."""
+        value = self._rng.lognormvariate(math.log(120000), 1.1) * self._category_scale[category_id]
+        return max(round(value, -2), 100.0)
+
+    def budget(self, category_id: int, approved_total: float) -> float:
+        """An allocation comfortably above what the category has approved."""
+        base = 50 * self.amount(category_id)
+        return round(approved_total * self._rng.uniform(1.2, 2.0) + base, -2)
+
+    def proposals(self) -> Iterator[list[dict[str, Any]]]:
+        """Proposals in ID (and creation time) order, INSERT_CHUNK_ROWS per list."""
+        span = timedelta(days=self.days).total_seconds()
+        start = self.now - timedelta(days=self.days)
+        proposal_id = 0
+        while proposal_id < self.sizes.proposals:
+            count = min(INSERT_CHUNK_ROWS, self.sizes.proposals - proposal_id)
+            ministry_ids = self._ministries.sample(count)
+            category_ids = self._categories.sample(count)
+            rows = []
+            for ministry_id, category_id in zip(ministry_ids, category_ids, strict=True):
+                proposal_id += 1
+                created_at = start + timedelta(
+                    seconds=span * (proposal_id - self._rng.random()) / self.sizes.proposals
+                )
+                rows.append(self._proposal(proposal_id, ministry_id, category_id, created_at))
+            yield rows
+
+    def _proposal(
+        self, proposal_id: int, ministry_id: int, category_id: int, created_at: datetime
+    ) -> dict[str, Any]:
+        rng = self._rng
+        area = CATEGORY_AREAS[(category_id - 1) % len(CATEGORY_AREAS)]
+        region = rng.choice(REGIONS)
+        requested_amount = self.amount(category_id)
+
+        age_days = (self.now - created_at).total_seconds() / 86400
+        pending_chance = 0.85 if age_days < RECENT_DAYS else 0.05
+        status, approved_amount, decided_at = "Pending", None, None
+        if rng.random() >= pending_chance:
+            status = "Approved" if rng.random() < 0.7 else "Rejected"
+            decided_at = min(created_at + timedelta(days=rng.expovariate(1 / 14)), self.now)
+            if status == "Approved":
+                # Often approved in full, otherwise trimmed
+                share = 1.0 if rng.random() < 0.6 else rng.uniform(0.5, 0.95)
+                approved_amount = max(round(requested_amount * share, -2), 100.0)
+
+        return {
+            "id": proposal_id,
+            "ministry_id": ministry_id,
+            "category_id": category_id,
+            "title": f"{rng.choice(TITLE_VERBS)} {area} ({region}) #{proposal_id}",
+            "description": (
+                f"Phase {rng.randint(1, 4)} of the {region} {area} programme."
+                if rng.random() < 0.5
+                else None
+            ),
+            "requested_amount": requested_amount,
+            "status": status,
+            "approved_amount": approved_amount,
+            "decision_notes": None,
+            "decided_at": decided_at,
+            "created_at": created_at,
+        }
+
+    def contract_records(self, rows: int, invalid_rate: float = 0.0) -> Iterator[dict[str, Any]]:
+        """
+        Raw contract records naming this dataset's ministries and categories.
+
+        About invalid_rate of them miss a title, have an unusable amount or name an
+        unknown category, as real uploads do.
+        """
+        rng = random.Random(self._rng.random())
+        while rows > 0:
+            count = min(INSERT_CHUNK_ROWS, rows)
+            rows -= count
+            for ministry_id, category_id in zip(
+                self._ministries.sample(count), self._categories.sample(count), strict=True
+            ):
+                area = CATEGORY_AREAS[(category_id - 1) % len(CATEGORY_AREAS)]
+                record: dict[str, Any] = {
+                    "ministry_name": ministry_name(ministry_id - 1),
+                    "category": category_name(category_id - 1),
+                    "title": f"{rng.choice(TITLE_VERBS)} {area} ({rng.choice(REGIONS)})",
+                    "description": "Contract line generated for scale testing",
+                    "requested_amount": self.amount(category_id),
+                }
+                if rng.random() < invalid_rate:
+                    problem = rng.choice(("title", "requested_amount", "category"))
+                    record[problem] = {"title": "", "requested_amount": "n/a"}.get(
+                        problem, "Unknown Category"
+                    )
+                yield record
+
+
+def _stamp_latest_migration(engine: Engine) -> None:
+    with engine.begin() as connection:
+        MigrationContext.configure(connection).stamp(ScriptDirectory(str(MIGRATIONS_DIR)), "heads")
+
+
+def _advance_sequences(db: Session) -> None:
+    # Rows were loaded with explicit IDs, which PostgreSQL sequences do not see; move
+    # each past the largest ID so the server's own INSERTs do not reuse one
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for model in (DBMinistry, DBCategory, DBProposal, DBBudgetLedgerEntry):
+        table = model.__tablename__
+        db.execute(
+            select(
+                func.setval(
+                    func.pg_get_serial_sequence(table, "id"),
+                    select(func.coalesce(func.max(model.id), 0) + 1).scalar_subquery(),
+                    False,
+                )
+            )
+        )
+
+
+def load_database(engine: Engine, generator: DatasetGenerator) -> dict[str, int]:
+    """
+    Create the schema on an empty database and load the generator's dataset.
+
+    The schema is stamped with the latest migration, so the server finds nothing
+    to upgrade. Every category's budget exceeds what was approved from it, and the
+    ledger holds an allocation and one approval entry per approved proposal. Rows
+    are numbered here, so PostgreSQL ID sequences are advanced past them after.
+
+    Returns the number of rows written per table.
+    """
+    Base.metadata.create_all(bind=engine)
+    _stamp_latest_migration(engine)
+    sizes = generator.sizes
+    with sessionmaker(bind=engine)() as db:
+        if db.scalar(select(func.count()).select_from(DBMinistry)):
+            raise ValueError("The database already has data; load into an empty database")
+
+        db.execute(insert(DBMinistry), generator.ministries())
+
+        # Category budgets depend on what was approved, so approval ledger entries are
+        # written with the proposals, numbered after the allocation entries to follow
+        approved_totals = [0.0] * (sizes.categories + 1)
+        ledger_id = sizes.categories
+        for rows in generator.proposals():
+            db.execute(insert(DBProposal), rows)
+            approvals = []
+            for row in rows:
+                if row["approved_amount"] is None:
+                    continue
+                ledger_id += 1
+                approved_totals[row["category_id"]] += row["approved_amount"]
+                approvals.append(
+                    {
+                        "id": ledger_id,
+                        "category_id": row["category_id"],
+                        "entry_type": "approval",
+                        "allocated_delta": 0.0,
+                        "remaining_delta": -row["approved_amount"],
+                        "proposal_id": row["id"],
+                        "created_at": generator.now,
+                    }
+                )
+            if approvals:
+                db.execute(insert(DBBudgetLedgerEntry), approvals)
+
+        categories: list[dict[str, Any]] = [
+            {
+                "id": i,
+                "name": category_name(i - 1),
+                "allocated_budget": generator.budget(i, approved_totals[i]),
+                "created_at": generator.now - timedelta(days=generator.days + 1),
+            }
+            for i in range(1, sizes.categories + 1)
+        ]
+        for category in categories:
+            category["remaining_budget"] = (
+                category["allocated_budget"] - approved_totals[category["id"]]
+            )
+        db.execute(insert(DBCategory), categories)
+        db.execute(
+            insert(DBBudgetLedgerEntry),
+            [
+                {
+                    "id": category["id"],
+                    "category_id": category["id"],
+                    "entry_type": "allocation",
+                    "allocated_delta": category["allocated_budget"],
+                    "remaining_delta": category["allocated_budget"],
+                    "created_at": generator.now,
+                }
+                for category in categories
+            ],
+        )
+        _advance_sequences(db)
+        db.commit()
+        StatsRepository.rebuild(db)
+    return {
+        "ministries": sizes.ministries,
+        "categories": sizes.categories,
+        "proposals": sizes.proposals,
+        "budget_ledger": ledger_id,
+    }
+
+
+def write_contracts(out: TextIO, records: Iterator[dict[str, Any]], file_type: str, seed: int = 0) -> int:
+    """
+    Write contract records as a CSV or JSON file, one record at a time; returns the count.
+
+    JSON records spell each field in any of the ways the parser accepts.
+    """
+    count = 0
+    if file_type == "csv":
+        writer = csv.DictWriter(out, fieldnames=CONTRACT_FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            count += 1
+        return count
+
+    rng = random.Random(seed)
+    out.write("[")
+    for record in records:
+        aliased = {rng.choice(FIELD_ALIASES[key]): value for key, value in record.items()}
+        out.write(("," if count else "") + "\n" + json.dumps(aliased))
+        count += 1
+    out.write("\n]\n")
+    return count
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Synthetic data for scale testing")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (
+        ("load", "Load a dataset into an empty database"),
+        ("contracts", "Write a contract file naming a dataset's ministries and categories"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--ministries", type=int, default=100)
+        command.add_argument("--categories", type=int, default=500)
+        command.add_argument("--seed", type=int, default=0)
+        command.add_argument("--zipf", type=float, default=1.1, help="Popularity skew exponent")
+
+    load = commands.choices["load"]
+    load.add_argument("--proposals", type=int, default=1000000)
+    load.add_argument("--days", type=int, default=730, help="Proposals span this many days")
+    load.add_argument("--database-url", default=settings.DATABASE_URL)
+
+    contracts = commands.choices["contracts"]
+    contracts.add_argument("path", help="Output .csv or .json file")
+    contracts.add_argument("--rows", type=int, default=10000)
+    contracts.add_argument("--format", choices=("csv", "json"), help="Default: from the file suffix")
+    contracts.add_argument("--invalid-rate", type=float, default=0.02)
+
+    args = parser.parse_args(argv)
+    sizes = DatasetSizes(args.ministries, args.categories, getattr(args, "proposals", 0))
+    if args.command == "load":
+        generator = DatasetGenerator(sizes, args.seed, args.zipf, args.days)
+        engine = create_engine(args.database_url)
+        try:
+            counts = load_database(engine, generator)
+        finally:
+            engine.dispose()
+        print(f"[datagen] Loaded {counts}")
+        return
+
+    file_type = args.format or Path(args.path).suffix.lstrip(".").lower()
+    if file_type not in ("csv", "json"):
+        parser.error("use a .csv or .json path, or pass --format")
+    records = DatasetGenerator(sizes, args.seed, args.zipf).contract_records(
+        args.rows, args.invalid_rate
+    )
+    with open(args.path, "w", newline="", encoding="utf-8") as out:
+        count = write_contracts(out, records, file_type, args.seed)
+    print(f"[datagen] Wrote {count} contract rows to {args.path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
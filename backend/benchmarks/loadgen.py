@@ -0,0 +1,412 @@
+"""
+Multi-user load generator for the API hot paths.
+
+`run` seeds a database (unless --database names one that exists), starts uvicorn on
+it and drives it with --users concurrent clients for --duration seconds, then
+writes per-endpoint latency percentiles and throughput as JSON. Pass --url to load
+an already running server instead; it must hold a seeded database of the given
+sizes. Server settings such as FAST_JSON_RESPONSES or DATABASE_ASYNC are read from
+the environment, which the started server inherits.
+
+`compare` reports the change between two result files and exits non-zero when an
+endpoint's p95 latency or throughput regressed by more than --threshold.
+
+Usage:
+    python -m benchmarks.loadgen run --proposals 1000000 --users 50 --output head.json
+    python -m benchmarks.loadgen compare base.json head.json --threshold 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+from sqlalchemy import create_engine
+
+from benchmarks.datagen import DatasetSizes
+from benchmarks.seed import FINANCE_USER, MINISTRY_USER, PASSWORD, contract_csv, seed_database
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Scenario -> relative weight in the request mix
+DEFAULT_MIX = {
+    "list_proposals": 30,
+    "proposals_page": 25,
+    "dashboard": 20,
+    "approve": 10,
+    "parse_contract": 5,
+    "login": 2,
+}
+
+# Pending proposals fetched up front for the approve scenario
+APPROVAL_POOL_SIZE = 20000
+
+
+@dataclass
+class LoadPlan:
+    """What the virtual users share: credentials, inputs and the approval pool."""
+
+    sizes: DatasetSizes
+    finance_headers: dict[str, str]
+    ministry_headers: dict[str, str]
+    contract: str
+    pending_ids: list[int] = field(default_factory=list)
+
+
+Scenario = Callable[[httpx.AsyncClient, LoadPlan, random.Random], Awaitable[httpx.Response | None]]
+
+
+async def _list_proposals(client, plan, rng):
+    # One ministry's proposals; the unfiltered list grows with the table
+    ministry_id = rng.randint(1, plan.sizes.ministries)
+    return await client.get("/proposals", params={"ministry_id": ministry_id})
+
+
+async def _proposals_page(client, plan, rng):
+    return await client.get("/proposals/page", params={"limit": 50})
+
+
+async def _dashboard(client, plan, rng):
+    return await client.get("/dashboard/summary", headers=plan.finance_headers)
+
+
+async def _approve(client, plan, rng):
+    if not plan.pending_ids:
+        return None
+    proposal_id = plan.pending_ids.pop()
+    return await client.post(
+        f"/proposals/{proposal_id}/approve",
+        json={"approved_amount": 1.0},
+        headers=plan.finance_headers,
+    )
+
+
+async def _parse_contract(client, plan, rng):
+    return await client.post(
+        "/contracts/parse",
+        files={"file": ("contract.csv", plan.contract, "text/csv")},
+        headers=plan.ministry_headers,
+    )
+
+
+async def _login(client, plan, rng):
+    return await client.post("/auth/login", json={"username": MINISTRY_USER, "password": PASSWORD})
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "list_proposals": _list_proposals,
+    "proposals_page": _proposals_page,
+    "dashboard": _dashboard,
+    "approve": _approve,
+    "parse_contract": _parse_contract,
+    "login": _login,
+}
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile (0 < q <= 100) of an ascending list."""
+    return sorted_values[max(math.ceil(q / 100 * len(sorted_values)) - 1, 0)]
+
+
+def summarize(latencies: list[float], errors: int, seconds: float) -> dict[str, Any]:
+    """Request count, error count, throughput and latency percentiles (ms) of one scenario."""
+    values = sorted(latencies)
+    summary: dict[str, Any] = {
+        "requests": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / seconds, 2) if seconds else 0.0,
+    }
+    if values:
+        summary.update(
+            mean_ms=round(sum(values) / len(values) * 1000, 2),
+            p50_ms=round(percentile(values, 50) * 1000, 2),
+            p95_ms=round(percentile(values, 95) * 1000, 2),
+            p99_ms=round(percentile(values, 99) * 1000, 2),
+            max_ms=round(values[-1] * 1000, 2),
+        )
+    return summary
+
+
+async def _login_headers(client: httpx.AsyncClient, username: str) -> dict[str, str]:
+    response = await client.post("/auth/login", json={"username": username, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _pending_ids(client: httpx.AsyncClient, limit: int) -> list[int]:
+    ids: list[int] = []
+    cursor = None
+    while len(ids) < limit:
+        params: dict[str, Any] = {"status": "Pending", "fields": "id", "limit": 500}
+        if cursor:
+            params["cursor"] = cursor
+        page = (await client.get("/proposals/page", params=params)).json()
+        ids += [item["id"] for item in page["items"]]
+        if not (cursor := page["next_cursor"]):
+            break
+    return ids[:limit]
+
+
+async def _virtual_user(
+    client: httpx.AsyncClient,
+    plan: LoadPlan,
+    mix: dict[str, int],
+    rng: random.Random,
+    measure_from: float,
+    deadline: float,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+) -> None:
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            response = await SCENARIOS[name](client, plan, rng)
+            if response is None:
+                # Nothing left to do for this scenario
+                continue
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+        if start >= measure_from:
+            latencies[name].append(time.perf_counter() - start)
+            errors[name] += failed
+
+
+async def generate_load(
+    url: str,
+    sizes: DatasetSizes,
+    mix: dict[str, int],
+    users: int,
+    duration: float,
+    warmup: float,
+    contract_rows: int,
+    seed: int,
+) -> dict[str, Any]:
+    """Drive a seeded server and return the per-scenario and total summaries."""
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120.0) as client:
+        plan = LoadPlan(
+            sizes=sizes,
+            finance_headers=await _login_headers(client, FINANCE_USER),
+            ministry_headers=await _login_headers(client, MINISTRY_USER),
+            contract=contract_csv(contract_rows, sizes, seed),
+        )
+        if mix.get("approve"):
+            plan.pending_ids = await _pending_ids(client, APPROVAL_POOL_SIZE)
+            random.Random(seed).shuffle(plan.pending_ids)
+
+        latencies: dict[str, list[float]] = {name: [] for name in mix}
+        errors = dict.fromkeys(mix, 0)
+        measure_from = time.perf_counter() + warmup
+        deadline = measure_from + duration
+        await asyncio.gather(
+            *(
+                _virtual_user(
+                    client, plan, mix, random.Random(seed + n), measure_from, deadline, latencies, errors
+                )
+                for n in range(users)
+            )
+        )
+
+    return {
+        "total": summarize(
+            [value for values in latencies.values() for value in values],
+            sum(errors.values()),
+            duration,
+        ),
+        "scenarios": {
+            name: summarize(latencies[name], errors[name], duration) for name in sorted(mix)
+        },
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextmanager
+def _serve(database_url: str, port: int, workers: int) -> Iterator[str]:
+    """Run uvicorn on the database until the block exits; yields its base URL."""
+    url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": database_url},
+        # Own process group, so the pool workers the server forks are stopped with it
+        start_new_session=True,
+    )
+    try:
+        for _ in range(300):
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+        else:
+            raise RuntimeError("uvicorn did not become healthy in 30 seconds")
+        yield url
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        finally:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """Parse 'name=weight,...' into a scenario mix."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario: {name.strip()}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Seed and serve (unless --url is given), generate load and return the result document."""
+    sizes = DatasetSizes(args.ministries, args.categories, args.proposals)
+
+    def load(url: str) -> dict[str, Any]:
+        return asyncio.run(
+            generate_load(
+                url, sizes, args.mix, args.users, args.duration, args.warmup,
+                args.contract_rows, args.seed,
+            )
+        )
+
+    if args.url:
+        results = load(args.url)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(args.database or Path(directory) / "loadgen.db").resolve()
+            if not path.exists():
+                print(f"[loadgen] Seeding {path} with {sizes}", file=sys.stderr)
+                engine = create_engine(f"sqlite:///{path}")
+                seed_database(engine, sizes, args.seed)
+                engine.dispose()
+            with _serve(f"sqlite:///{path}", args.port, args.workers) as url:
+                results = load(url)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "url": args.url,
+            "workers": None if args.url else args.workers,
+            "users": args.users,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "contract_rows": args.contract_rows,
+            "seed": args.seed,
+            "sizes": asdict(sizes),
+            "mix": args.mix,
+        },
+        **results,
+    }
+
+
+def compare(base: dict[str, Any], head: dict[str, Any], threshold: float) -> list[str]:
+    """
+    Print the p95 and throughput change of each scenario in both result files.
+
+    Returns the scenarios whose p95 latency rose, or whose throughput fell, by more
+    than `threshold` (a fraction).
+    """
+    regressions = []
+    print(f"{'scenario':<16}{'p95 base':>12}{'p95 head':>12}{'change':>9}{'rps base':>11}{'rps head':>11}{'change':>9}")
+    for name in sorted(set(base["scenarios"]) & set(head["scenarios"])):
+        old, new = base["scenarios"][name], head["scenarios"][name]
+        if "p95_ms" not in old or "p95_ms" not in new:
+            continue
+        latency_change = new["p95_ms"] / old["p95_ms"] - 1 if old["p95_ms"] else 0.0
+        throughput_change = (
+            new["throughput_rps"] / old["throughput_rps"] - 1 if old["throughput_rps"] else 0.0
+        )
+        regressed = latency_change > threshold or throughput_change < -threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<16}{old['p95_ms']:>12.2f}{new['p95_ms']:>12.2f}{latency_change:>+9.1%}"
+            f"{old['throughput_rps']:>11.2f}{new['throughput_rps']:>11.2f}{throughput_change:>+9.1%}"
+            f"{'  REGRESSED' if regressed else ''}"
+        )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load generator for the spending tracker API")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Generate load and write the results as JSON")
+    run_parser.add_argument("--url", help="Load this running server instead of starting one")
+    run_parser.add_argument("--database", help="SQLite file to serve; seeded if it does not exist")
+    run_parser.add_argument("--ministries", type=int, default=100)
+    run_parser.add_argument("--categories", type=int, default=500)
+    run_parser.add_argument("--proposals", type=int, default=100000)
+    run_parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    run_parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    run_parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds first")
+    run_parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    run_parser.add_argument("--port", type=int, default=8765)
+    run_parser.add_argument("--contract-rows", type=int, default=200)
+    run_parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="e.g. dashboard=3,login=1")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", help="Result file (default: stdout)")
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        base, head = (json.loads(Path(path).read_text()) for path in (args.base, args.head))
+        regressions = compare(base, head, args.threshold)
+        return 1 if regressions else 0
+
+    document = json.dumps(run(args), indent=2)
+    if args.output:
+        Path(args.output).write_text(document + "\n")
+    else:
+        print(document)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+Seeding of benchmark databases: a generated dataset plus the users the benchmarks
+log in as.
+"""
+
+import io
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from auth import get_password_hash
+from benchmarks.datagen import DatasetGenerator, DatasetSizes, load_database, write_contracts
+from database import User as DBUser
+
+# Users created by every seed; the ministry user belongs to the first ministry
+FINANCE_USER = "bench-finance"
+MINISTRY_USER = "bench-ministry"
+PASSWORD = "bench-password"
+
+
+def seed_database(engine: Engine, sizes: DatasetSizes, seed: int = 0) -> None:
+    """Load the dataset of `sizes` and `seed` into an empty database and add the benchmark users."""
+    load_database(engine, DatasetGenerator(sizes, seed))
+    hashed_password = get_password_hash(PASSWORD)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(DBUser),
+            [
+                {
+                    "username": FINANCE_USER,
+                    "email": f"{FINANCE_USER}@example.com",
+                    "hashed_password": hashed_password,
+                    "role": "finance",
+                    "ministry_id": None,
+                },
+                {
+                    "username": MINISTRY_USER,
+                    "email": f"{MINISTRY_USER}@example.com",
+                    "hashed_password": hashed_password,
+                    "role": "ministry",
+                    "ministry_id": 1,
+                },
+            ],
+        )
+
+
+def contract_csv(rows: int, sizes: DatasetSizes, seed: int = 0) -> str:
+    """A CSV contract file of `rows` valid proposals naming seeded ministries and categories."""
+    out = io.StringIO()
+    write_contracts(out, DatasetGenerator(sizes, seed).contract_records(rows), "csv")
+    return out.getvalue()
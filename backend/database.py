@@ -1,12 +1,46 @@
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import UTC, datetime
+from typing import Any
 from urllib.parse import urlparse
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, create_engine
+from prometheus_client import Gauge, Histogram
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    create_engine,
+    event,
+    func,
+    select,
+)
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.orm import column_property, relationship, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from settings import settings
 
+logger = logging.getLogger(__name__)
+
 # Database setup
 db_url = settings.DATABASE_URL
 parsed_db = urlparse(db_url)
@@ -27,18 +61,328 @@ else:
         "keepalives_count": 5,
     }
 
-# Add connection pool settings for better reliability
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured connection pool size", ["engine"])
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently checked out", ["engine"])
+DB_POOL_CHECKED_IN = Gauge("db_pool_checked_in", "Idle connections held by the pool", ["engine"])
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond the pool size", ["engine"])
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def pool_options(url: str) -> dict[str, Any]:
+    """Pool keyword arguments for create_engine/create_async_engine from settings."""
+    options: dict[str, Any] = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    # Only a QueuePool can be sized: in-memory SQLite gets a singleton or static pool
+    # and file-backed aiosqlite a NullPool, which reject the sizing arguments
+    parsed = make_url(url)
+    if issubclass(parsed.get_dialect().get_pool_class(parsed), QueuePool):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
+
+def enable_idle_pre_ping(target_engine: Any, idle_seconds: float) -> None:
+    """Ping a pooled connection on checkout only if it sat unused for idle_seconds."""
+
+    @event.listens_for(target_engine, "checkin")
+    def record_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(target_engine, "checkout")
+    def ping_idle(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception as e:
+            # The pool discards this connection and retries with a fresh one
+            raise DisconnectionError() from e
+
+
+def register_pool_metrics(target_engine: Any, engine_label: str) -> None:
+    """Export pool occupancy gauges, read from the pool at scrape time."""
+    pool = target_engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+    DB_POOL_SIZE.labels(engine_label).set_function(pool.size)
+    DB_POOL_CHECKED_OUT.labels(engine_label).set_function(pool.checkedout)
+    DB_POOL_CHECKED_IN.labels(engine_label).set_function(pool.checkedin)
+    DB_POOL_OVERFLOW.labels(engine_label).set_function(lambda: max(pool.overflow(), 0))
+
+
+SQLITE_WRITER_WAIT = Histogram(
+    "sqlite_writer_wait_seconds",
+    "Time spent waiting for the SQLite single-writer lock",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+WRITE_STATEMENT_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER")
+
+
+def enable_sqlite_tuning(target_engine: Any, serialize_writes: bool = True) -> None:
+    """
+    Configure every SQLite connection for concurrent use.
+
+    WAL lets readers proceed while a write is in progress and the busy timeout makes
+    a blocked writer wait instead of failing with "database is locked". With
+    serialize_writes, a connection takes a process-wide writer lock before its first
+    write statement and holds it until the transaction ends, so in-process writers
+    queue up in order instead of contending for SQLite's file lock. Reads never
+    take the lock.
+    """
+    writer_lock = threading.Lock()
+    lock_key = "holds_sqlite_writer_lock"
+
+    @event.listens_for(target_engine, "connect")
+    def set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        # A negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.close()
+
+    if not serialize_writes:
+        return
+
+    def release(info: dict[str, Any]) -> None:
+        if info.pop(lock_key, False):
+            writer_lock.release()
+
+    @event.listens_for(target_engine, "before_cursor_execute")
+    def acquire_for_write(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        if conn.info.get(lock_key) or not statement.lstrip().upper().startswith(
+            WRITE_STATEMENT_PREFIXES
+        ):
+            return
+        start = time.perf_counter()
+        # Past the busy timeout, fall back to SQLite's own locking rather than
+        # failing the request here
+        if writer_lock.acquire(timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000):
+            conn.info[lock_key] = True
+        SQLITE_WRITER_WAIT.observe(time.perf_counter() - start)
+
+    @event.listens_for(target_engine, "commit")
+    def release_on_commit(conn: Any) -> None:
+        release(conn.info)
+
+    @event.listens_for(target_engine, "rollback")
+    def release_on_rollback(conn: Any) -> None:
+        release(conn.info)
+
+    @event.listens_for(target_engine, "checkin")
+    def release_on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+        # Safety net for connections returned without an explicit commit/rollback
+        release(connection_record.info)
+
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed while handling a request",
+    ["method", "handler"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL statements while handling a request",
+    ["method", "handler"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_SLOWEST_QUERY = Histogram(
+    "db_slowest_query_seconds",
+    "Duration of the slowest SQL statement of a request",
+    ["method", "handler"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+QUERY_TIMERS_KEY = "query_started_at"
+
+
+@dataclass
+class QueryStats:
+    """SQL statements executed while handling one request."""
+
+    count: int = 0
+    seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str = ""
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+
+# Statistics of the request being handled; engines with query tracking add to it
+_request_queries: ContextVar[QueryStats | None] = ContextVar("request_queries", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements of tracked engines run in this context (and threads it starts)."""
+    stats = QueryStats()
+    token = _request_queries.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_queries.reset(token)
+
+
+def observe_request_queries(method: str, handler: str, stats: QueryStats) -> None:
+    """Record a finished request's query statistics in the per-route histograms."""
+    DB_QUERIES_PER_REQUEST.labels(method, handler).observe(stats.count)
+    DB_TIME_PER_REQUEST.labels(method, handler).observe(stats.seconds)
+    DB_SLOWEST_QUERY.labels(method, handler).observe(stats.slowest_seconds)
+    if stats.count:
+        logger.debug(
+            "%s %s: %d queries in %.1f ms, slowest %.1f ms: %s",
+            method,
+            handler,
+            stats.count,
+            stats.seconds * 1000,
+            stats.slowest_seconds * 1000,
+            " ".join(stats.slowest_statement.split()),
+        )
+
+
+def redact_parameters(parameters: Any, executemany: bool) -> str:
+    """Describe statement parameters without their values, for logs."""
+    if executemany:
+        return f"{len(parameters)} parameter sets redacted"
+    return f"{len(parameters) if parameters else 0} parameters redacted"
+
+
+def _start_query_timer(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    conn.info.setdefault(QUERY_TIMERS_KEY, []).append(time.perf_counter())
+
+
+def _record_query(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    seconds = time.perf_counter() - conn.info[QUERY_TIMERS_KEY].pop()
+    stats = _request_queries.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+    if settings.SLOW_QUERY_MS and seconds * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %s [%s]",
+            seconds * 1000,
+            " ".join(statement.split()),
+            redact_parameters(parameters, executemany),
+        )
+
+
+def _discard_query_timer(exception_context: Any) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(QUERY_TIMERS_KEY):
+        connection.info[QUERY_TIMERS_KEY].pop()
+
+
+def enable_query_tracking(target_engine: Any) -> None:
+    """
+    Time every statement on the engine, adding it to the current request's QueryStats
+    (see track_queries) and logging it if slower than SLOW_QUERY_MS. Idempotent.
+    """
+    for name, listener in (
+        ("before_cursor_execute", _start_query_timer),
+        ("after_cursor_execute", _record_query),
+        ("handle_error", _discard_query_timer),
+    ):
+        if not event.contains(target_engine, name, listener):
+            event.listen(target_engine, name, listener)
+
+
+engine_options = pool_options(db_url)
+if "pool_size" in engine_options:
+    engine_options["poolclass"] = InstrumentedQueuePool
 engine = create_engine(
     db_url,
     connect_args=connect_args,
-    pool_pre_ping=True,  # Verify connections before using them
-    pool_recycle=3600,   # Recycle connections after 1 hour
-    echo=False,          # Set to True for SQL query logging
+    echo=False,  # Set to True for SQL query logging
+    **engine_options,
 )
+if settings.DB_POOL_PRE_PING == "idle":
+    enable_idle_pre_ping(engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
+if settings.SQLITE_TUNING and db_url.startswith("sqlite"):
+    enable_sqlite_tuning(engine)
+# After the SQLite writer lock, so waiting for the lock is not counted as query time
+if settings.QUERY_METRICS:
+    enable_query_tracking(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def async_database_url(url: str) -> str:
+    """Map a sync database URL to its async driver (aiosqlite / asyncpg)."""
+    scheme, sep, rest = url.partition("://")
+    if scheme.startswith("sqlite"):
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if scheme.startswith(("postgresql", "postgres")):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return url
+
+
+def make_async_engine(url: str) -> AsyncEngine:
+    """Create the AsyncEngine for an async database URL, configured from settings."""
+    sqlite = url.startswith("sqlite")
+    target_engine = create_async_engine(
+        url,
+        # asyncpg takes its connect timeout as "timeout"; aiosqlite needs nothing
+        connect_args={} if sqlite else {"timeout": 10},
+        echo=False,
+        **pool_options(url),
+    )
+    if settings.DB_POOL_PRE_PING == "idle":
+        enable_idle_pre_ping(target_engine.sync_engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
+    if settings.SQLITE_TUNING and sqlite:
+        # A blocking lock would stall the event loop; async writers rely on busy_timeout
+        enable_sqlite_tuning(target_engine.sync_engine, serialize_writes=False)
+    if settings.QUERY_METRICS:
+        enable_query_tracking(target_engine.sync_engine)
+    return target_engine
+
+
+# Async engine, only created when async handlers are enabled
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    async_engine = make_async_engine(settings.ASYNC_DATABASE_URL or async_database_url(db_url))
+    # expire_on_commit=False: attributes cannot be lazily reloaded outside the event loop
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+
 # Ministry model
 class Ministry(Base):
     __tablename__ = "ministries"
@@ -54,6 +398,16 @@ class Ministry(Base):
     proposals = relationship("Proposal", back_populates="ministry")
 
 
+# Sub-ledger rows holding part of a category's remaining budget when BUDGET_SHARDS > 1,
+# so concurrent approvals in one category decrement different rows
+class CategoryBudgetShard(Base):
+    __tablename__ = "category_budget_shards"
+
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    remaining_budget = Column(Float, nullable=False)
+
+
 # Category model
 class Category(Base):
     __tablename__ = "categories"
@@ -61,9 +415,20 @@ class Category(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True, nullable=False)
     allocated_budget = Column(Float, nullable=False)
+    # Budget not handed out to shards (all of it unless budget sharding is on)
     remaining_budget = Column(Float, nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(UTC))
 
+    # Total remaining budget: the category row plus its shards, read in one statement
+    available_budget = column_property(
+        remaining_budget
+        + select(func.coalesce(func.sum(CategoryBudgetShard.remaining_budget), 0.0))
+        .where(CategoryBudgetShard.category_id == id)
+        .correlate_except(CategoryBudgetShard)
+        .scalar_subquery(),
+        deferred=True,
+    )
+
     # Relationships
     proposals = relationship("Proposal", back_populates="category")
 
@@ -109,6 +474,103 @@ class Proposal(Base):
     ministry = relationship("Ministry", back_populates="proposals")
     category = relationship("Category", back_populates="proposals")
 
+    # Indexes for the list filters/sort, duplicate detection and dashboard aggregates
+    __table_args__ = (
+        Index("ix_proposals_created_at_id", "created_at", "id"),
+        Index("ix_proposals_ministry_created_at", "ministry_id", "created_at", "id"),
+        Index("ix_proposals_category_created_at", "category_id", "created_at", "id"),
+        Index("ix_proposals_status_created_at", "status", "created_at", "id"),
+        Index("ix_proposals_duplicate_check", "ministry_id", "title", "requested_amount"),
+        Index("ix_proposals_status_category", "status", "category_id", "approved_amount"),
+    )
+
+
+# Dashboard aggregates, maintained incrementally by the proposal and approval services
+class ProposalStatsMixin:
+    requested_total = Column(Float, default=0.0, nullable=False)
+    approved_total = Column(Float, default=0.0, nullable=False)
+    pending_count = Column(Integer, default=0, nullable=False)
+    approved_count = Column(Integer, default=0, nullable=False)
+    rejected_count = Column(Integer, default=0, nullable=False)
+
+
+class CategoryStats(ProposalStatsMixin, Base):
+    __tablename__ = "category_stats"
+
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+
+
+class MinistryStats(ProposalStatsMixin, Base):
+    __tablename__ = "ministry_stats"
+
+    ministry_id = Column(Integer, ForeignKey("ministries.id"), primary_key=True)
+
+
+# Append-only history of budget movements. category_id is deliberately not a foreign
+# key so the history of a deleted category is kept.
+class BudgetLedgerEntry(Base):
+    __tablename__ = "budget_ledger"
+
+    id = Column(Integer, primary_key=True)
+    category_id = Column(Integer, nullable=False)
+    entry_type = Column(String, nullable=False)  # allocation/approval/reallocation
+    allocated_delta = Column(Float, default=0.0, nullable=False)
+    remaining_delta = Column(Float, default=0.0, nullable=False)
+    proposal_id = Column(Integer, nullable=True)
+    note = Column(String, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False)
+
+    __table_args__ = (Index("ix_budget_ledger_category_id_id", "category_id", "id"),)
+
+
+# Category balances folded up to a ledger entry, so point-in-time balances only
+# replay the entries after the nearest snapshot
+class BudgetSnapshot(Base):
+    __tablename__ = "budget_snapshots"
+
+    id = Column(Integer, primary_key=True)
+    category_id = Column(Integer, nullable=False)
+    ledger_id = Column(Integer, nullable=False)  # last ledger entry included
+    as_of = Column(DateTime, nullable=False)  # created_at of that entry
+    allocated_budget = Column(Float, nullable=False)
+    remaining_budget = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+
+    __table_args__ = (Index("ix_budget_snapshots_category_as_of", "category_id", "as_of"),)
+
+
+# Contract files parsed in the background, and the draft proposals they produced
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(String, primary_key=True)  # uuid4 hex
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    filename = Column(String, nullable=False)
+    file_type = Column(String, nullable=False)  # csv/json
+    # queued/running/completed/failed, then imported once its drafts become proposals
+    status = Column(String, default="queued", nullable=False)
+    file_size = Column(Integer, default=0, nullable=False)
+    bytes_read = Column(Integer, default=0, nullable=False)
+    rows_processed = Column(Integer, default=0, nullable=False)
+    valid_rows = Column(Integer, default=0, nullable=False)
+    error_rows = Column(Integer, default=0, nullable=False)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # "host:pid" of the worker that queued or runs the job, and when it last touched it
+    worker_id = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=lambda: datetime.now(UTC), nullable=True)
+
+
+class ImportJobRow(Base):
+    __tablename__ = "import_job_rows"
+
+    job_id = Column(String, ForeignKey("import_jobs.id", ondelete="CASCADE"), primary_key=True)
+    row_number = Column(Integer, primary_key=True)  # 1-based position in the file
+    valid = Column(Boolean, nullable=False)
+    draft = Column(Text, nullable=False)  # JSON-encoded draft proposal
+
 
 # Create tables
 
@@ -243,3 +705,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database access is disabled (set DATABASE_ASYNC=true)")
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,41 @@
+"""
+Conditional GET support for the polled read endpoints.
+ETags come from the resource version counters, so answering a matching
+If-None-Match with 304 never touches the database.
+"""
+
+from fastapi import Request, Response
+
+from repositories.versions import resource_etag
+from settings import settings
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header value matches the ETag (weak comparison, per RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def not_modified(request: Request, response: Response, *resources: str) -> Response | None:
+    """
+    Tag a response built from these resources and check the client's cached copy.
+
+    Returns a 304 response if the client's If-None-Match already matches; otherwise
+    sets the ETag on `response` and returns None so the endpoint builds the body.
+    The ETag is computed before the data is read, so a concurrent write can only
+    make it older than the body, never newer.
+    """
+    if not settings.ETAGS_ENABLED:
+        return None
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    etag = resource_etag(resources, f"{request.url.path}?{query}")
+    # Clients may cache but must revalidate on every use
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,230 @@
+"""
+Change events behind the /events server-sent event stream.
+Services queue proposal and budget events on their session; they reach the broker
+only once that session commits, so subscribers never see rolled-back changes.
+
+The broker keeps the most recent events in a bounded ring buffer that every
+subscriber reads at its own pace, so a slow client costs no extra memory: it only
+falls behind, and once its position has left the buffer it is sent a "reset" event
+telling it to reload through the list endpoints. Like the ETag version counters,
+events are exact for a single worker process only.
+"""
+
+import asyncio
+import json
+import threading
+import uuid
+from collections import Counter, deque
+from collections.abc import AsyncGenerator, Collection
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from exceptions import EventStreamBusyError
+from settings import settings
+
+EVENT_KINDS = ("proposal", "budget")
+
+_PENDING_KEY = "pending_events"
+# Event IDs restart with the process; the epoch keeps old IDs from resuming at the wrong place
+_epoch = uuid.uuid4().hex[:8]
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """One published change."""
+
+    id: int
+    kind: str
+    data: dict[str, Any]
+
+
+class EventBroker:
+    """In-process fan-out of committed change events to stream subscribers."""
+
+    def __init__(self, buffer_size: int, max_subscribers: int, max_per_user: int):
+        self._events: deque[ChangeEvent] = deque(maxlen=buffer_size)
+        self._last_id = 0
+        self._max_subscribers = max_subscribers
+        self._max_per_user = max_per_user
+        # waker -> (its event loop, subscribing user ID)
+        self._waiters: dict[asyncio.Event, tuple[asyncio.AbstractEventLoop, int]] = {}
+        self._per_user: Counter[int] = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def last_id(self) -> int:
+        """ID of the most recent event (0 before the first one)."""
+        return self._last_id
+
+    def publish(self, events: list[tuple[str, dict[str, Any]]]) -> None:
+        """Append (kind, data) events to the buffer and wake the subscribers. Thread-safe."""
+        if not events:
+            return
+        with self._lock:
+            for kind, data in events:
+                self._last_id += 1
+                self._events.append(ChangeEvent(self._last_id, kind, data))
+            waiters = [(loop, waker) for waker, (loop, _) in self._waiters.items()]
+        for loop, waker in waiters:
+            try:
+                loop.call_soon_threadsafe(waker.set)
+            except RuntimeError:
+                # The subscriber's event loop has shut down
+                pass
+
+    def since(self, last_id: int, limit: int) -> tuple[list[ChangeEvent], bool]:
+        """
+        Get up to `limit` events after `last_id`.
+
+        The flag is True when events after `last_id` have already been dropped from
+        the buffer, i.e. the caller has missed changes.
+        """
+        with self._lock:
+            if last_id >= self._last_id:
+                return [], False
+            oldest = self._events[0].id if self._events else self._last_id + 1
+            if last_id + 1 < oldest:
+                return [], True
+            start = last_id + 1 - oldest
+            return [self._events[i] for i in range(start, min(start + limit, len(self._events)))], False
+
+    def check_capacity(self, user_id: int) -> None:
+        """Raise EventStreamBusyError if user_id could not subscribe now. Takes no slot."""
+        with self._lock:
+            self._check_capacity(user_id)
+
+    def subscribe(self, user_id: int) -> asyncio.Event:
+        """Register a subscriber on the running event loop; returns the Event set on publish."""
+        waker = asyncio.Event()
+        with self._lock:
+            self._check_capacity(user_id)
+            self._waiters[waker] = (asyncio.get_running_loop(), user_id)
+            self._per_user[user_id] += 1
+        return waker
+
+    def unsubscribe(self, waker: asyncio.Event) -> None:
+        """Remove a subscriber registered with subscribe."""
+        with self._lock:
+            waiter = self._waiters.pop(waker, None)
+            if waiter is not None:
+                self._per_user[waiter[1]] -= 1
+                if not self._per_user[waiter[1]]:
+                    del self._per_user[waiter[1]]
+
+    def _check_capacity(self, user_id: int) -> None:
+        if len(self._waiters) >= self._max_subscribers:
+            raise EventStreamBusyError("Too many event stream subscribers")
+        if self._per_user[user_id] >= self._max_per_user:
+            raise EventStreamBusyError("Too many event streams open for this user")
+
+
+broker = EventBroker(
+    settings.EVENT_BUFFER_SIZE,
+    settings.EVENT_STREAM_MAX_CLIENTS,
+    settings.EVENT_STREAM_MAX_CLIENTS_PER_USER,
+)
+
+
+def emit(db: Session, kind: str, data: dict[str, Any]) -> None:
+    """Queue an event to publish when the session's transaction commits."""
+    if kind not in EVENT_KINDS:
+        raise ValueError(f"Unknown event kind: {kind}")
+    db.info.setdefault(_PENDING_KEY, []).append((kind, data))
+
+
+def proposal_event(proposal_id: int, action: str, snapshot: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    """
+    Build a proposal event from a proposal_snapshot of its new state.
+
+    action is one of created, updated, approved, rejected, deleted.
+    """
+    return "proposal", {
+        "id": proposal_id,
+        "action": action,
+        "status": snapshot["status"],
+        "ministry_id": snapshot["ministry_id"],
+        "category_id": snapshot["category_id"],
+        "requested_amount": snapshot["requested_amount"],
+        "approved_amount": snapshot["approved_amount"],
+    }
+
+
+def format_event_id(event_id: int) -> str:
+    """SSE id for a broker event ID."""
+    return f"{_epoch}-{event_id}"
+
+
+def parse_event_id(value: str | None) -> int | None:
+    """Broker event ID from an SSE id, or None if it is malformed or from another process."""
+    epoch, _, event_id = (value or "").partition("-")
+    if epoch != _epoch or not event_id.isdigit():
+        return None
+    return int(event_id)
+
+
+def _frame(kind: str, data: dict[str, Any], event_id: int) -> str:
+    payload = json.dumps(data, separators=(",", ":"), default=str)
+    return f"id: {format_event_id(event_id)}\nevent: {kind}\ndata: {payload}\n\n"
+
+
+def open_event_stream(
+    user_id: int, last_event_id: str | None = None, kinds: Collection[str] = EVENT_KINDS
+) -> AsyncGenerator[str, None]:
+    """
+    Return the stream of SSE frames of the given event kinds for user_id.
+
+    Without last_event_id the stream starts with the next change. With one it
+    resumes after that event, or starts with a "reset" event if the events since
+    are no longer buffered (or the ID is unknown). Raises EventStreamBusyError when
+    EVENT_STREAM_MAX_CLIENTS streams, or EVENT_STREAM_MAX_CLIENTS_PER_USER of the
+    user's, are already open. The subscriber slot is only taken once the stream is
+    iterated and is released when it ends, so a response that is never sent holds none.
+    """
+    broker.check_capacity(user_id)
+    return _stream(user_id, last_event_id, kinds)
+
+
+async def _stream(
+    user_id: int, last_event_id: str | None, kinds: Collection[str]
+) -> AsyncGenerator[str, None]:
+    waker = broker.subscribe(user_id)
+    try:
+        cursor = parse_event_id(last_event_id) if last_event_id else broker.last_id
+        # Ask EventSource clients to reconnect quickly after a dropped connection
+        yield "retry: 1000\n\n"
+        while True:
+            waker.clear()
+            events: list[ChangeEvent] = []
+            if cursor is None or cursor > broker.last_id:
+                missed = True
+            else:
+                events, missed = broker.since(cursor, settings.EVENT_STREAM_BATCH_SIZE)
+            if missed:
+                cursor = broker.last_id
+                yield _frame("reset", {}, cursor)
+                continue
+            if events:
+                for change in events:
+                    if change.kind in kinds:
+                        yield _frame(change.kind, change.data, change.id)
+                cursor = events[-1].id
+                continue
+            try:
+                await asyncio.wait_for(waker.wait(), settings.EVENT_STREAM_HEARTBEAT_SECONDS)
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        broker.unsubscribe(waker)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    broker.publish(session.info.pop(_PENDING_KEY, None) or [])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -28,6 +28,18 @@ class MinistryNotFoundError(DomainError):
     pass
 
 
+class ImportJobNotFoundError(DomainError):
+    """Raised when an import job is not found (or belongs to another user)."""
+
+    pass
+
+
+class ImportJobAlreadyImportedError(DomainError):
+    """Raised when the drafts of an import job were already imported."""
+
+    pass
+
+
 class InsufficientBudgetError(DomainError):
     """Raised when there's insufficient budget in a category."""
 
@@ -62,3 +74,33 @@ class DuplicateMinistryError(DomainError):
     """Raised when trying to create a ministry with duplicate name."""
 
     pass
+
+
+class PasswordHashingBusyError(DomainError):
+    """Raised when the password hashing pool is saturated."""
+
+    pass
+
+
+class ConcurrentUpdateError(DomainError):
+    """Raised when a record keeps changing underneath an optimistic update."""
+
+    pass
+
+
+class EventStreamBusyError(DomainError):
+    """Raised when the event stream already has its maximum number of subscribers."""
+
+    pass
+
+
+class ProfilingDisabledError(DomainError):
+    """Raised when a profile is requested while profiling is disabled."""
+
+    pass
+
+
+class ProfilerBusyError(DomainError):
+    """Raised when a profile is requested while another one is running."""
+
+    pass
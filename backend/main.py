@@ -1,48 +1,80 @@
 import json
 import logging
 import os
-from datetime import timedelta
-from typing import Any, cast
+from datetime import datetime, timedelta
+from typing import Any
 
 import uvicorn
-from fastapi import Depends, FastAPI, File, HTTPException, Request, UploadFile
+from fastapi import Depends, FastAPI, File, Header, HTTPException, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from prometheus_fastapi_instrumentator import Instrumentator
 from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from async_routes import router as async_router
 from auth import (
+    CurrentUser,
     authenticate_user,
     create_access_token,
     get_current_user,
     get_password_hash,
+    get_stream_user,
     require_finance_role,
     require_ministry_role,
 )
 from database import Category as DBCategory
 from database import Ministry as DBMinistry
-from database import Proposal as DBProposal
+from database import (
+    SessionLocal,
+    async_engine,
+    create_tables,
+    engine,
+    get_db,
+    observe_request_queries,
+    register_pool_metrics,
+    track_queries,
+)
 from database import User as DBUser
-from database import create_tables, get_db
+from etags import not_modified
+from events import EVENT_KINDS, open_event_stream
 from exceptions import (
     CategoryNotFoundError,
+    ConcurrentUpdateError,
     DuplicateCategoryError,
     DuplicateMinistryError,
+    EventStreamBusyError,
+    ImportJobAlreadyImportedError,
+    ImportJobNotFoundError,
     InsufficientBudgetError,
     InvalidProposalStatusError,
     MinistryNotFoundError,
+    PasswordHashingBusyError,
+    ProfilerBusyError,
+    ProfilingDisabledError,
     ProposalNotFoundError,
     ValidationError,
 )
 from models import (
+    AllocationProfile,
     Category,
+    CategoryBalance,
     CategoryCreate,
     CategoryUpdate,
+    ContractImport,
+    ContractImportResult,
+    ImportJobResults,
+    ImportJobStatus,
+    LedgerPage,
     Ministry,
     MinistryCreate,
     Proposal,
     ProposalApprove,
     ProposalCreate,
+    ProposalDecisionBatch,
+    ProposalDecisionBatchResult,
+    ProposalPage,
     ProposalReject,
     ProposalUpdate,
     Token,
@@ -50,9 +82,16 @@ from models import (
     UserLogin,
 )
 from models import User as UserModel
+from profiling import profile_allocations, profile_cpu
+from repositories.budgets import BudgetShardRepository
 from repositories.categories import CategoryRepository
+from repositories.ledger import LedgerRepository
 from repositories.ministries import MinistryRepository
+from responses import fast_json
 from services.approvals import ApprovalService
+from services.dashboard import DashboardService
+from services.imports import ImportJobService
+from services.ledger import LedgerService
 from services.parser import ContractParserService
 from services.proposals import ProposalService
 from settings import settings
@@ -74,6 +113,40 @@ def parse_cors_origins(cors_str: str) -> list[str]:
     return [origin.strip() for origin in cors_str.split(",") if origin.strip()]
 
 
+class QueryMetricsMiddleware:
+    """
+    Count the SQL statements and database time of each request.
+
+    The totals go to per-route histograms when the request finishes, and to a
+    Server-Timing header when the response starts (so for streamed responses the
+    header leaves out statements run while streaming).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"',
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                route = scope.get("route")
+                observe_request_queries(scope["method"], getattr(route, "path", "none"), stats)
+
+
 # Read CORS_ORIGINS directly from environment to avoid pydantic-settings JSON parsing issues
 CORS_ORIGINS_STR = os.getenv("CORS_ORIGINS", "http://localhost:3000")
 
@@ -87,9 +160,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+if settings.QUERY_METRICS:
+    app.add_middleware(QueryMetricsMiddleware)
+
+# Async handlers for the hot paths take precedence over the sync routes below
+if settings.DATABASE_ASYNC:
+    app.include_router(async_router)
+
 # Add Prometheus metrics instrumentation
 instrumentator = Instrumentator()
 instrumentator.instrument(app).expose(app)
+register_pool_metrics(engine, "sync")
+if async_engine is not None:
+    register_pool_metrics(async_engine.sync_engine, "async")
 
 
 # Create database tables on startup
@@ -101,6 +185,8 @@ def startup_event():
         print("[startup] Starting database initialization...")
         create_tables()
         print("[startup] Database initialization completed successfully")
+        with SessionLocal() as db:
+            ImportJobService.recover_jobs(db)
     except Exception as e:
         print(f"[startup] ERROR: Database initialization failed: {e}")
         print(f"[startup] Traceback: {traceback.format_exc()}")
@@ -124,6 +210,16 @@ async def ministry_not_found_handler(request: Request, exc: MinistryNotFoundErro
     return JSONResponse(status_code=404, content={"detail": str(exc)})
 
 
+@app.exception_handler(ImportJobNotFoundError)
+async def import_job_not_found_handler(request: Request, exc: ImportJobNotFoundError):
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+
+@app.exception_handler(ImportJobAlreadyImportedError)
+async def import_job_already_imported_handler(request: Request, exc: ImportJobAlreadyImportedError):
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
+
 @app.exception_handler(InsufficientBudgetError)
 async def insufficient_budget_handler(request: Request, exc: InsufficientBudgetError):
     return JSONResponse(status_code=400, content={"detail": str(exc)})
@@ -149,6 +245,31 @@ async def duplicate_ministry_handler(request: Request, exc: DuplicateMinistryErr
     return JSONResponse(status_code=400, content={"detail": str(exc)})
 
 
+@app.exception_handler(ConcurrentUpdateError)
+async def concurrent_update_handler(request: Request, exc: ConcurrentUpdateError):
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
+
+@app.exception_handler(PasswordHashingBusyError)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusyError):
+    return JSONResponse(status_code=429, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+@app.exception_handler(EventStreamBusyError)
+async def event_stream_busy_handler(request: Request, exc: EventStreamBusyError):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "5"})
+
+
+@app.exception_handler(ProfilingDisabledError)
+async def profiling_disabled_handler(request: Request, exc: ProfilingDisabledError):
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+
+@app.exception_handler(ProfilerBusyError)
+async def profiler_busy_handler(request: Request, exc: ProfilerBusyError):
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
+
 # ------------------ Authentication Endpoints ------------------
 
 
@@ -213,27 +334,31 @@ def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
 
 @app.get("/auth/me", response_model=UserModel)
 def get_current_user_info(
-    current_user: DBUser = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """Get current user information."""
-    # Load ministry relationship if user has ministry_id
-    if current_user.ministry_id:
-        from sqlalchemy.orm import joinedload
-
-        user_with_ministry = (
-            db.query(DBUser)
-            .options(joinedload(DBUser.ministry))
-            .filter(DBUser.id == current_user.id)
-            .first()
-        )
-        return user_with_ministry
-    return current_user
+    # current_user is a cached snapshot; load the full row with its ministry in one query
+    from sqlalchemy.orm import joinedload
+
+    user = (
+        db.query(DBUser)
+        .options(joinedload(DBUser.ministry))
+        .filter(DBUser.id == current_user.id)
+        .first()
+    )
+    if user is None:
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+    return user
 
 
 # CRUD endpoints for categories
 @app.get("/categories", response_model=list[Category])
-def get_categories(db: Session = Depends(get_db)):
+def get_categories(request: Request, response: Response, db: Session = Depends(get_db)):
     """Get all budget categories"""
+    if cached := not_modified(request, response, "categories"):
+        return cached
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json(CategoryRepository.get_all_rows(db), response)
     return CategoryRepository.get_all(db)
 
 
@@ -241,7 +366,7 @@ def get_categories(db: Session = Depends(get_db)):
 def create_category(
     category: CategoryCreate,
     db: Session = Depends(get_db),
-    current_user: DBUser = Depends(require_finance_role),
+    current_user: CurrentUser = Depends(require_finance_role),
 ):
     """Create a new budget category (Finance users only)"""
     # Check if category name already exists
@@ -272,7 +397,7 @@ def update_category(
     category_id: int,
     category_update: CategoryUpdate,
     db: Session = Depends(get_db),
-    current_user: DBUser = Depends(require_finance_role),
+    current_user: CurrentUser = Depends(require_finance_role),
 ):
     """Update a category (Finance users only)"""
     db_category = CategoryRepository.get_by_id(db, category_id)
@@ -294,6 +419,9 @@ def update_category(
         update_data["name"] = category_update.name
 
     if category_update.allocated_budget is not None:
+        # Pull any sharded budget back onto the category row before rescaling it
+        BudgetShardRepository.collapse(db, [category_id])
+
         # Update remaining budget proportionally
         old_allocated = float(db_category.allocated_budget or 0.0)
         new_allocated = float(category_update.allocated_budget or 0.0)
@@ -301,15 +429,45 @@ def update_category(
         remaining_budget = float(db_category.remaining_budget or 0.0)
         update_data["remaining_budget"] = remaining_budget * ratio
         update_data["allocated_budget"] = new_allocated
+        LedgerRepository.record(
+            db,
+            category_id,
+            "reallocation",
+            allocated_delta=new_allocated - old_allocated,
+            remaining_delta=update_data["remaining_budget"] - remaining_budget,
+        )
 
     return CategoryRepository.update(db, db_category, update_data)
 
 
+@app.get("/categories/{category_id}/balance", response_model=CategoryBalance)
+def get_category_balance(
+    category_id: int,
+    at: datetime | None = None,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_finance_role),
+):
+    """Get a category's budget as of a point in time, from the budget ledger (Finance users only)"""
+    return LedgerService.get_balance(db, category_id, at)
+
+
+@app.get("/categories/{category_id}/ledger", response_model=LedgerPage)
+def get_category_ledger(
+    category_id: int,
+    after: int | None = None,
+    limit: int | None = None,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_finance_role),
+):
+    """List a category's budget movements, oldest first (Finance users only)"""
+    return LedgerService.list_entries(db, category_id, after, limit)
+
+
 @app.delete("/categories/{category_id}")
 def delete_category(
     category_id: int,
     db: Session = Depends(get_db),
-    current_user: DBUser = Depends(require_finance_role),
+    current_user: CurrentUser = Depends(require_finance_role),
 ):
     """Delete a category (Finance users only)"""
     db_category = CategoryRepository.get_by_id(db, category_id)
@@ -324,8 +482,12 @@ def delete_category(
 
 
 @app.get("/ministries", response_model=list[Ministry])
-def get_ministries(db: Session = Depends(get_db)):
+def get_ministries(request: Request, response: Response, db: Session = Depends(get_db)):
     """Get all active ministries"""
+    if cached := not_modified(request, response, "ministries"):
+        return cached
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json(MinistryRepository.get_all_active_rows(db), response)
     return MinistryRepository.get_all_active(db)
 
 
@@ -333,7 +495,7 @@ def get_ministries(db: Session = Depends(get_db)):
 def create_ministry(
     ministry: MinistryCreate,
     db: Session = Depends(get_db),
-    current_user: DBUser = Depends(require_finance_role),
+    current_user: CurrentUser = Depends(require_finance_role),
 ):
     """Create a new ministry (Finance users only)"""
     # Check if ministry name already exists
@@ -349,7 +511,7 @@ def create_ministry(
 def find_or_create_ministry(
     ministry_name: str,
     db: Session = Depends(get_db),
-    current_user: DBUser = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Find existing ministry or create new one if not found"""
     if not ministry_name or not ministry_name.strip():
@@ -375,6 +537,7 @@ def health_check(db: Session = Depends(get_db)):
     try:
         # Check database connectivity
         from sqlalchemy import text
+
         db.execute(text("SELECT 1"))
         return {
             "status": "healthy",
@@ -393,20 +556,49 @@ def health_check(db: Session = Depends(get_db)):
 
 @app.get("/proposals", response_model=list[Proposal])
 def list_proposals(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     ministry_id: int | None = None,
     category_id: int | None = None,
     status: str | None = None,
 ):
     """List proposals with optional filters."""
+    if cached := not_modified(request, response, "proposals", "ministries"):
+        return cached
+    if settings.FAST_JSON_RESPONSES:
+        rows = ProposalService.list_proposal_rows(db, ministry_id, category_id, status)
+        return fast_json(rows, response)
     return ProposalService.list_proposals(db, ministry_id, category_id, status)
 
 
+@app.get("/proposals/page", response_model=ProposalPage)
+def list_proposals_page(
+    db: Session = Depends(get_db),
+    limit: int | None = None,
+    cursor: str | None = None,
+    fields: str | None = None,
+    ministry_id: int | None = None,
+    category_id: int | None = None,
+    status: str | None = None,
+):
+    """
+    List proposals one page at a time, newest first.
+
+    Pass the returned next_cursor back as `cursor` to continue. `fields` is an optional
+    comma-separated list of columns to return instead of the full row.
+    """
+    field_list = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+    return ProposalService.list_proposals_page(
+        db, limit, cursor, field_list, ministry_id, category_id, status
+    )
+
+
 @app.post("/proposals", response_model=Proposal)
 def create_proposal(
     payload: ProposalCreate,
     db: Session = Depends(get_db),
-    current_user: DBUser = Depends(require_ministry_role),
+    current_user: CurrentUser = Depends(require_ministry_role),
 ):
     """Create a new proposal. Ministry users can only create proposals for their own ministry."""
     return ProposalService.create_proposal(db, payload, current_user)
@@ -423,7 +615,7 @@ def update_proposal(
     proposal_id: int,
     payload: ProposalUpdate,
     db: Session = Depends(get_db),
-    current_user: DBUser = Depends(require_ministry_role),
+    current_user: CurrentUser = Depends(require_ministry_role),
 ):
     """Update a proposal (only if status is Pending). Ministry users can only update proposals from their own ministry."""
     return ProposalService.update_proposal(db, proposal_id, payload, current_user)
@@ -433,7 +625,7 @@ def update_proposal(
 def delete_proposal(
     proposal_id: int,
     db: Session = Depends(get_db),
-    current_user: DBUser = Depends(require_ministry_role),
+    current_user: CurrentUser = Depends(require_ministry_role),
 ):
     """Delete a proposal (only if status is Pending). Ministry users can only delete proposals from their own ministry."""
     ProposalService.delete_proposal(db, proposal_id, current_user)
@@ -443,12 +635,22 @@ def delete_proposal(
 # ------------------ Phase 3: Approval Endpoints ------------------
 
 
+@app.post("/proposals/decisions", response_model=ProposalDecisionBatchResult)
+def decide_proposals(
+    body: ProposalDecisionBatch,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_finance_role),
+):
+    """Approve and/or reject many proposals in one transaction (Finance users only)."""
+    return ApprovalService.decide_many(db, [item.model_dump() for item in body.items])
+
+
 @app.post("/proposals/{proposal_id}/approve", response_model=Proposal)
 def approve_proposal(
     proposal_id: int,
     body: ProposalApprove,
     db: Session = Depends(get_db),
-    current_user: DBUser = Depends(require_finance_role),
+    current_user: CurrentUser = Depends(require_finance_role),
 ):
     """Approve a proposal (Finance users only)."""
     return ApprovalService.approve_proposal(
@@ -461,7 +663,7 @@ def reject_proposal(
     proposal_id: int,
     body: ProposalReject,
     db: Session = Depends(get_db),
-    current_user: DBUser = Depends(require_finance_role),
+    current_user: CurrentUser = Depends(require_finance_role),
 ):
     """Reject a proposal (Finance users only)."""
     return ApprovalService.reject_proposal(db, proposal_id, body.decision_notes)
@@ -474,83 +676,143 @@ def reject_proposal(
 def parse_contract(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: DBUser = Depends(require_ministry_role),
+    current_user: CurrentUser = Depends(require_ministry_role),
 ):
     """Parse a contract file (CSV or JSON) and return normalized draft proposals (Ministry users only)."""
     return ContractParserService.parse_contract(db, file)
 
 
+@app.post("/contracts/parse/stream")
+def parse_contract_stream(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_ministry_role),
+):
+    """Parse a contract file and stream draft proposals back as NDJSON, one per line (Ministry users only)."""
+    return StreamingResponse(
+        ContractParserService.stream_contract(db, file), media_type="application/x-ndjson"
+    )
+
+
+@app.post("/contracts/jobs", response_model=ImportJobStatus, status_code=202)
+def submit_import_job(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_ministry_role),
+):
+    """Queue a contract file for parsing in the background and return its job (Ministry users only)."""
+    return ImportJobService.submit_job(db, file, current_user)
+
+
+@app.get("/contracts/jobs/{job_id}", response_model=ImportJobStatus)
+def get_import_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Get an import job's status, progress and ETA (its owner or Finance users)."""
+    return ImportJobService.describe(ImportJobService.get_job(db, job_id, current_user))
+
+
+@app.get("/contracts/jobs/{job_id}/results", response_model=ImportJobResults)
+def get_import_job_results(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+    after: int | None = None,
+    limit: int | None = None,
+    valid: bool | None = None,
+):
+    """Page through the drafts an import job has produced so far (its owner or Finance users)."""
+    return ImportJobService.list_results(db, job_id, current_user, after, limit, valid)
+
+
+@app.post("/contracts/import", response_model=ContractImportResult)
+def import_contract_drafts(
+    body: ContractImport,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Create proposals in bulk from parsed drafts, or from the valid rows of an import job.
+
+    Drafts are inserted in chunked transactions; drafts that fail validation are
+    reported with their index (or job row_number) and skipped. A job is imported
+    once; importing it again answers 409.
+    """
+    drafts = None if body.drafts is None else [draft.model_dump() for draft in body.drafts]
+    return ImportJobService.import_proposals(db, current_user, drafts, body.job_id)
+
+
 # ------------------ Phase 5: Dashboard Summary ------------------
 
 
 @app.get("/dashboard/summary")
 def dashboard_summary(
-    db: Session = Depends(get_db), current_user: DBUser = Depends(require_finance_role)
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_finance_role),
+):
+    """Budget and proposal aggregates per category and ministry (Finance users only)."""
+    if cached := not_modified(request, response, "categories", "ministries", "proposals"):
+        return cached
+    return DashboardService.get_summary(db)
+
+
+@app.get("/events")
+async def stream_events(
+    last_event_id: str | None = Header(None),
+    after: str | None = None,
+    current_user: CurrentUser = Depends(get_stream_user),
 ):
-    # Per-category aggregates
-    categories = db.query(DBCategory).all()
-    # Sum approved amounts grouped by category_id
-    from sqlalchemy import func
-
-    rows = (
-        db.query(DBProposal.category_id, func.coalesce(func.sum(DBProposal.approved_amount), 0.0))
-        .filter(DBProposal.status == "Approved")
-        .group_by(DBProposal.category_id)
-        .all()
+    """
+    Stream proposal and budget changes as server-sent events (authenticated users).
+
+    Emits "proposal" events (created/updated/approved/rejected/deleted) and, to
+    Finance users only, "budget" events (one per ledger entry). EventSource clients
+    pass their token as ?access_token=. Reconnecting clients resume from the
+    Last-Event-ID header; `after` does the same for clients that cannot set it. A
+    "reset" event means changes were missed and the client should reload its data.
+    """
+    kinds = EVENT_KINDS if current_user.role == "finance" else ("proposal",)
+    return StreamingResponse(
+        open_event_stream(current_user.id, last_event_id or after, kinds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    approved_sums: dict[int, float] = {
-        int(category_id): float(total or 0.0) for category_id, total in rows
-    }
-    category_stats = []
-    for c in categories:
-        category_id = cast(int, c.id)
-        approved_total = float(approved_sums.get(category_id, 0.0) or 0.0)
-        category_stats.append(
-            {
-            "id": category_id,
-            "name": c.name,
-            "allocated_budget": float(c.allocated_budget),
-            "remaining_budget": float(c.remaining_budget),
-            "approved_total": approved_total,
-            }
-        )
 
-    # Per-ministry aggregates (requested vs approved)
-    from sqlalchemy.orm import joinedload
 
-    ministry_proposals = db.query(DBMinistry).options(joinedload(DBMinistry.proposals)).all()
+# ------------------ Profiling ------------------
 
-    ministry_stats = []
-    for ministry in ministry_proposals:
-        proposals = ministry.proposals
-        requested_total = sum(p.requested_amount for p in proposals)
-        approved_total = sum(
-            p.approved_amount for p in proposals if p.status == "Approved" and p.approved_amount
-        )
 
-        ministry_stats.append(
-            {
-            "ministry_id": ministry.id,
-            "ministry_name": ministry.name,
-            "requested_total": float(requested_total),
-            "approved_total": float(approved_total),
-            }
-        )
+@app.get("/debug/profile/cpu", response_class=PlainTextResponse)
+def cpu_profile(
+    seconds: float = 10.0,
+    interval_ms: float = 10.0,
+    current_user: CurrentUser = Depends(require_finance_role),
+):
+    """
+    Sample this worker's thread stacks for `seconds` (Finance users, when PROFILING_ENABLED).
 
-    # Overall KPIs
-    total_allocated = float(sum(c.allocated_budget for c in categories))
-    total_remaining = float(sum(c.remaining_budget for c in categories))
-    total_approved = float(sum(x[1] for x in approved_sums.items()))
-
-    return {
-        "categories": category_stats,
-        "ministries": ministry_stats,
-        "kpis": {
-            "total_allocated": total_allocated,
-            "total_remaining": total_remaining,
-            "total_approved": total_approved,
-        },
-    }
+    Returns collapsed stacks, one "thread;caller;...;callee count" line per stack,
+    for flamegraph.pl or speedscope.
+    """
+    return PlainTextResponse(profile_cpu(seconds, interval_ms))
+
+
+@app.get("/debug/profile/allocations", response_model=AllocationProfile)
+def allocation_profile(
+    seconds: float = 10.0,
+    top: int = 25,
+    current_user: CurrentUser = Depends(require_finance_role),
+):
+    """
+    Trace this worker's allocations for `seconds` (Finance users, when PROFILING_ENABLED).
+
+    Returns the `top` source lines by memory allocated and still held over the interval.
+    """
+    return profile_allocations(seconds, top)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+"""
+Command-line maintenance tasks.
+
+Usage:
+    python manage.py rebuild-stats
+    python manage.py collapse-budget-shards
+    python manage.py snapshot-budgets
+"""
+
+import argparse
+
+from database import SessionLocal
+from repositories.budgets import BudgetShardRepository
+from repositories.stats import StatsRepository
+from services.ledger import LedgerService
+
+
+def rebuild_stats() -> None:
+    """Recompute the dashboard aggregates from the proposals table."""
+    db = SessionLocal()
+    try:
+        StatsRepository.rebuild(db)
+        print("[manage] Dashboard aggregates rebuilt")
+    finally:
+        db.close()
+
+
+def collapse_budget_shards() -> None:
+    """Move all sharded budget back onto the category rows (run after disabling sharding)."""
+    db = SessionLocal()
+    try:
+        BudgetShardRepository.collapse(db)
+        db.commit()
+        print("[manage] Budget shards collapsed into categories")
+    finally:
+        db.close()
+
+
+def snapshot_budgets() -> None:
+    """Snapshot category balances from the budget ledger (run periodically, e.g. from cron)."""
+    db = SessionLocal()
+    try:
+        count = LedgerService.take_snapshots(db)
+        print(f"[manage] Took {count} budget snapshot(s)")
+    finally:
+        db.close()
+
+
+COMMANDS = {
+    "rebuild-stats": rebuild_stats,
+    "collapse-budget-shards": collapse_budget_shards,
+    "snapshot-budgets": snapshot_budgets,
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Government Spending Tracker maintenance tasks")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+    COMMANDS[args.command]()
+
+
+if __name__ == "__main__":
+    main()
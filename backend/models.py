@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import AliasChoices, BaseModel, Field, field_validator
 
 
 # Pydantic models for API
@@ -21,13 +21,44 @@ class CategoryUpdate(BaseModel):
 
 class Category(CategoryBase):
     id: int
-    remaining_budget: float
+    # Read from available_budget when present so sharded budgets report their total
+    remaining_budget: float = Field(
+        validation_alias=AliasChoices("available_budget", "remaining_budget")
+    )
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class LedgerEntry(BaseModel):
+    id: int
+    category_id: int
+    entry_type: str
+    allocated_delta: float
+    remaining_delta: float
+    proposal_id: int | None = None
+    note: str | None = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class LedgerPage(BaseModel):
+    items: list[LedgerEntry]
+    next_after: int | None = None
+
+
+class CategoryBalance(BaseModel):
+    category_id: int
+    allocated_budget: float
+    remaining_budget: float
+    as_of: datetime
+    snapshot_id: int | None = None
+    replayed_entries: int
+
+
 # ------------------ Phase 2: Proposal Schemas ------------------
 
 
@@ -65,6 +96,11 @@ class Proposal(ProposalBase):
         from_attributes = True
 
 
+class ProposalPage(BaseModel):
+    items: list[dict[str, Any]]
+    next_cursor: str | None = None
+
+
 class ProposalApprove(BaseModel):
     approved_amount: float = Field(..., gt=0, description="Approved amount must be positive")
     decision_notes: str | None = Field(None, max_length=1000, description="Decision notes")
@@ -74,6 +110,31 @@ class ProposalReject(BaseModel):
     decision_notes: str | None = Field(None, max_length=1000, description="Decision notes")
 
 
+class ProposalDecision(BaseModel):
+    proposal_id: int
+    decision: Literal["approve", "reject"]
+    approved_amount: float | None = Field(None, gt=0, description="Required when approving")
+    decision_notes: str | None = Field(None, max_length=1000, description="Decision notes")
+
+
+class ProposalDecisionBatch(BaseModel):
+    items: list[ProposalDecision] = Field(..., min_length=1)
+
+
+class ProposalDecisionResult(BaseModel):
+    proposal_id: int
+    ok: bool
+    status: str | None = None
+    approved_amount: float | None = None
+    error: str | None = None
+
+
+class ProposalDecisionBatchResult(BaseModel):
+    results: list[ProposalDecisionResult]
+    applied: int
+    failed: int
+
+
 class ProposalDelete(BaseModel):
     reason: str  # Required reason for deletion
 
@@ -148,3 +209,73 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: str | None = None
+
+
+# ------------------ Phase 4: Contract Import Jobs ------------------
+
+
+class ImportJobStatus(BaseModel):
+    id: str
+    filename: str
+    status: str  # queued/running/completed/failed/imported
+    rows_processed: int
+    valid_rows: int
+    error_rows: int
+    progress: float  # share of the file read, 0.0 to 1.0
+    eta_seconds: float | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+class ImportJobResults(BaseModel):
+    items: list[dict[str, Any]]
+    next_after: int | None = None
+
+
+class ContractDraftImport(BaseModel):
+    ministry_id: int | None = None
+    ministry_name: str | None = None
+    category_id: int | None = None
+    title: str | None = None
+    description: str | None = None
+    requested_amount: float | None = None
+
+
+class ContractImport(BaseModel):
+    # Either the drafts to import or the ID of a completed import job
+    drafts: list[ContractDraftImport] | None = None
+    job_id: str | None = None
+
+
+class ContractImportError(BaseModel):
+    index: int
+    errors: list[str]
+
+
+class ContractImportResult(BaseModel):
+    created: int
+    ids: list[int]
+    failed: int
+    errors: list[ContractImportError]
+
+
+# ------------------ Profiling ------------------
+
+
+class AllocationSite(BaseModel):
+    file: str
+    line: int
+    size_diff: int  # bytes allocated (and still held) over the interval
+    size: int
+    count_diff: int
+    count: int
+
+
+class AllocationProfile(BaseModel):
+    seconds: float
+    traced_bytes: int
+    peak_bytes: int
+    size_diff: int
+    sites: list[AllocationSite]
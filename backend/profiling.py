@@ -0,0 +1,159 @@
+"""
+On-demand CPU and allocation profiling of the running worker (/debug/profile/*).
+
+CPU profiles sample every thread's stack with sys._current_frames() at a fixed
+interval and fold the samples into collapsed stacks, one "root;...;leaf count" line
+per distinct stack, which flamegraph.pl and speedscope read directly. Allocation
+profiles start tracemalloc for the interval (unless it is already tracing) and diff
+a snapshot taken at each end, so the top sites are where memory was allocated and
+kept during the interval.
+
+Nothing is sampled or traced until a profile is requested, and tracing stops with
+it, so a worker that is never profiled pays nothing. One profile runs at a time
+per process.
+"""
+
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import CodeType, FrameType
+from typing import Any
+
+from exceptions import ProfilerBusyError, ProfilingDisabledError, ValidationError
+from settings import settings
+
+_profile_lock = threading.Lock()
+
+
+def _check_enabled(seconds: float) -> None:
+    if not settings.PROFILING_ENABLED:
+        raise ProfilingDisabledError("Profiling is disabled")
+    if not 0 < seconds <= settings.PROFILING_MAX_SECONDS:
+        raise ValidationError(
+            f"seconds must be greater than 0 and at most {settings.PROFILING_MAX_SECONDS:g}"
+        )
+
+
+@contextmanager
+def _exclusive() -> Iterator[None]:
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+    try:
+        yield
+    finally:
+        _profile_lock.release()
+
+
+def _path_prefixes() -> list[str]:
+    # Longest first, so files are named relative to the import root they load from
+    return sorted({path.rstrip("/") + "/" for path in sys.path if path}, key=len, reverse=True)
+
+
+def _short_path(filename: str, prefixes: list[str]) -> str:
+    for prefix in prefixes:
+        if filename.startswith(prefix):
+            return filename[len(prefix) :]
+    return filename
+
+
+def sample_stacks(seconds: float, interval: float) -> Counter[str]:
+    """
+    Sample the stacks of all other threads every `interval` seconds for `seconds`.
+
+    Returns collapsed stack -> number of samples. Each stack starts with the thread
+    name and names functions as "qualname (file:first line)".
+    """
+    own = threading.get_ident()
+    prefixes = _path_prefixes()
+    labels: dict[CodeType, str] = {}
+    names: dict[int, str] = {}
+    stacks: Counter[str] = Counter()
+    deadline = time.monotonic() + seconds
+    while (started := time.monotonic()) < deadline:
+        for ident, top in sys._current_frames().items():
+            if ident == own:
+                continue
+            if ident not in names:
+                names = {
+                    thread.ident: thread.name
+                    for thread in threading.enumerate()
+                    if thread.ident is not None
+                }
+            stack: list[str] = []
+            frame: FrameType | None = top
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    filename = _short_path(code.co_filename, prefixes)
+                    label = labels[code] = f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+                stack.append(label)
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            stacks[";".join(reversed(stack))] += 1
+        time.sleep(max(0.0, min(started + interval, deadline) - time.monotonic()))
+    return stacks
+
+
+def profile_cpu(seconds: float, interval_ms: float) -> str:
+    """Sample the worker's threads for `seconds` and return collapsed stacks, most sampled first."""
+    _check_enabled(seconds)
+    if not 1 <= interval_ms <= 1000:
+        raise ValidationError("interval_ms must be between 1 and 1000")
+    with _exclusive():
+        stacks = sample_stacks(seconds, interval_ms / 1000)
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def profile_allocations(seconds: float, top: int) -> dict[str, Any]:
+    """
+    Trace allocations for `seconds` and return the `top` sites by growth over that time.
+
+    Sites are source lines, with their net change in size and block count. Unless
+    tracemalloc was already running (PYTHONTRACEMALLOC), only memory allocated during
+    the interval is traced, so a site's size is what it allocated and still holds.
+    """
+    _check_enabled(seconds)
+    if not 1 <= top <= 1000:
+        raise ValidationError("top must be between 1 and 1000")
+    with _exclusive():
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(settings.PROFILING_TRACEMALLOC_FRAMES)
+        try:
+            before = tracemalloc.take_snapshot()
+            time.sleep(seconds)
+            after = tracemalloc.take_snapshot()
+            traced, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started:
+                tracemalloc.stop()
+
+    ignored = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ]
+    stats = after.filter_traces(ignored).compare_to(before.filter_traces(ignored), "lineno")
+    prefixes = _path_prefixes()
+    return {
+        "seconds": seconds,
+        "traced_bytes": traced,
+        "peak_bytes": peak,
+        "size_diff": sum(stat.size_diff for stat in stats),
+        "sites": [
+            {
+                "file": _short_path(stat.traceback[0].filename, prefixes),
+                "line": stat.traceback[0].lineno,
+                "size_diff": stat.size_diff,
+                "size": stat.size,
+                "count_diff": stat.count_diff,
+                "count": stat.count,
+            }
+            for stat in stats[:top]
+        ],
+    }
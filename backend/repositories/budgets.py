@@ -0,0 +1,151 @@
+"""
+Repository for sharded category budgets.
+Spreads a category's remaining budget over several sub-ledger rows so concurrent
+approvals in one category update different rows instead of queueing on one.
+"""
+
+import random
+from collections.abc import Iterable
+
+from sqlalchemy import bindparam, delete, insert, update
+from sqlalchemy.orm import Session
+
+from database import Category as DBCategory
+from database import CategoryBudgetShard as DBCategoryBudgetShard
+from repositories.versions import mark_changed
+from settings import settings
+
+
+class BudgetShardRepository:
+    """Repository for category budget shard operations. None of the methods commit."""
+
+    @staticmethod
+    def spend(db: Session, category_id: int, amount: float) -> bool:
+        """
+        Deduct amount from a category's sharded budget.
+
+        The fast path is one conditional UPDATE on a randomly chosen shard. If that
+        shard cannot cover the amount (or the category has no shards yet) the
+        category is rebalanced under lock. Returns False, changing nothing, if the
+        category does not exist or its total remaining budget is below amount.
+        """
+        mark_changed(db, "categories")
+        shards = settings.BUDGET_SHARDS
+        result = db.execute(
+            update(DBCategoryBudgetShard)
+            .where(
+                DBCategoryBudgetShard.category_id == category_id,
+                DBCategoryBudgetShard.shard == random.randrange(shards),  # nosec B311
+                DBCategoryBudgetShard.remaining_budget >= amount,
+            )
+            .values(remaining_budget=DBCategoryBudgetShard.remaining_budget - amount)
+        )
+        if result.rowcount == 1:
+            return True
+        return BudgetShardRepository.rebalance(db, category_id, amount)
+
+    @staticmethod
+    def rebalance(db: Session, category_id: int, amount: float = 0.0) -> bool:
+        """
+        Pool a category's budget, deduct amount and spread the rest evenly over its shards.
+
+        Locks the category row, then its shards, so it is serialized with other
+        rebalances and collapses of the category. Returns False, changing nothing, if
+        the category does not exist or the pooled budget is below amount.
+        """
+        category = (
+            db.query(DBCategory)
+            .filter(DBCategory.id == category_id)
+            .with_for_update()
+            .populate_existing()
+            .first()
+        )
+        if category is None:
+            return False
+        held = BudgetShardRepository._lock_shards(db, [category_id]).get(category_id, 0.0)
+        total = float(category.remaining_budget) + held
+        if amount > total:
+            return False
+
+        values = BudgetShardRepository._split(total - amount, settings.BUDGET_SHARDS)
+        db.execute(
+            delete(DBCategoryBudgetShard).where(DBCategoryBudgetShard.category_id == category_id)
+        )
+        db.execute(
+            insert(DBCategoryBudgetShard),
+            [
+                {"category_id": category_id, "shard": shard, "remaining_budget": value}
+                for shard, value in enumerate(values)
+            ],
+        )
+        db.execute(
+            update(DBCategory).where(DBCategory.id == category_id).values(remaining_budget=0.0)
+        )
+        db.expire(category, ["remaining_budget", "available_budget"])
+        return True
+
+    @staticmethod
+    def collapse(db: Session, category_ids: Iterable[int] | None = None) -> None:
+        """
+        Move the budget held in shards back onto the category rows and drop the shards.
+
+        Applies to the given categories, or to every category when category_ids is
+        None. Category rows are locked before shards, in ascending ID order.
+        """
+        query = db.query(DBCategory.id).order_by(DBCategory.id).with_for_update()
+        if category_ids is not None:
+            query = query.filter(DBCategory.id.in_(sorted(set(category_ids))))
+        ids = [row.id for row in query.all()]
+        if not ids:
+            return
+
+        held = BudgetShardRepository._lock_shards(db, ids)
+        if not held:
+            return
+        mark_changed(db, "categories")
+        categories = DBCategory.__table__
+        db.execute(
+            update(categories)
+            .where(categories.c.id == bindparam("category_id"))
+            .values(remaining_budget=categories.c.remaining_budget + bindparam("held")),
+            [{"category_id": key, "held": value} for key, value in sorted(held.items())],
+        )
+        db.execute(
+            delete(DBCategoryBudgetShard).where(DBCategoryBudgetShard.category_id.in_(list(held)))
+        )
+        # Loaded categories must not keep their pre-collapse remaining budget
+        for category in db.identity_map.values():
+            if isinstance(category, DBCategory) and category.id in held:
+                db.expire(category, ["remaining_budget", "available_budget"])
+
+    @staticmethod
+    def _split(total: float, shards: int) -> list[float]:
+        """
+        Split a non-negative total over shards in whole cents, none below zero.
+
+        The cents that do not divide evenly go one each to the first shards; the
+        sub-cent residue of the total goes to the first shard, which holds at least
+        one cent whenever the residue is negative, so the shards add up to the total.
+        """
+        cents = round(total * 100)
+        share, extra = divmod(cents, shards)
+        values = [(share + (shard < extra)) / 100 for shard in range(shards)]
+        values[0] += total - cents / 100
+        if min(values) < 0:
+            raise ValueError(f"Cannot split {total} over {shards} shards without a negative shard")
+        return values
+
+    @staticmethod
+    def _lock_shards(db: Session, category_ids: list[int]) -> dict[int, float]:
+        """Lock the shards of the given categories and return the budget each holds."""
+        rows = (
+            db.query(DBCategoryBudgetShard.category_id, DBCategoryBudgetShard.remaining_budget)
+            .filter(DBCategoryBudgetShard.category_id.in_(category_ids))
+            .order_by(DBCategoryBudgetShard.category_id, DBCategoryBudgetShard.shard)
+            .with_for_update()
+            .all()
+        )
+        held: dict[int, float] = {}
+        for row in rows:
+            held[row.category_id] = held.get(row.category_id, 0.0) + row.remaining_budget
+        return held
@@ -3,11 +3,43 @@ Repository for category data access.
 Encapsulates database queries related to categories.
 """
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import SQLColumnExpression, func, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
 
 from database import Category as DBCategory
+from database import CategoryBudgetShard as DBCategoryBudgetShard
 from database import Proposal as DBProposal
+from repositories.ledger import LedgerRepository
+from repositories.lookup import existing_ids, resolve_names
+from repositories.stats import StatsRepository
+from repositories.versions import mark_changed
+from responses import json_float
+
+# Columns behind the Category response schema, in its field order
+ROW_COLUMNS: dict[str, SQLColumnExpression[Any]] = {
+    "name": DBCategory.name,
+    "allocated_budget": DBCategory.allocated_budget,
+    "id": DBCategory.id,
+    "remaining_budget": DBCategory.available_budget,
+    "created_at": DBCategory.created_at,
+}
+
+
+def _row_dict(row: Row) -> dict[str, Any]:
+    """Build a response-ready category dict from a ROW_COLUMNS row."""
+    name, allocated_budget, category_id, remaining_budget, created_at = row
+    return {
+        "name": name,
+        "allocated_budget": json_float(allocated_budget),
+        "id": category_id,
+        "remaining_budget": json_float(remaining_budget),
+        "created_at": created_at,
+    }
 
 
 class CategoryRepository:
@@ -16,7 +48,12 @@ class CategoryRepository:
     @staticmethod
     def get_all(db: Session) -> list[DBCategory]:
         """Get all categories."""
-        return db.query(DBCategory).all()
+        return db.query(DBCategory).options(undefer(DBCategory.available_budget)).all()
+
+    @staticmethod
+    def get_all_rows(db: Session) -> list[dict[str, Any]]:
+        """Get all categories like get_all, as response-ready dicts built from column tuples."""
+        return [_row_dict(row) for row in db.execute(select(*ROW_COLUMNS.values()))]
 
     @staticmethod
     def get_by_id(db: Session, category_id: int) -> DBCategory | None:
@@ -28,11 +65,29 @@ class CategoryRepository:
         """Get a category by name (case-insensitive)."""
         return db.query(DBCategory).filter(DBCategory.name.ilike(name)).first()
 
+    @staticmethod
+    def resolve_names(db: Session, names: Iterable[str]) -> dict[str, int]:
+        """Map lowercased names to category IDs (exact match, then partial match)."""
+        return resolve_names(db, DBCategory, names)
+
+    @staticmethod
+    def existing_ids(db: Session, category_ids: Iterable[int]) -> set[int]:
+        """The subset of the given category IDs that exist."""
+        return existing_ids(db, DBCategory, category_ids)
+
     @staticmethod
     def create(db: Session, category_data: dict) -> DBCategory:
         """Create a new category."""
         category = DBCategory(**category_data)
         db.add(category)
+        db.flush()
+        LedgerRepository.record(
+            db,
+            int(category.id),
+            "allocation",
+            allocated_delta=float(category.allocated_budget),
+            remaining_delta=float(category.remaining_budget),
+        )
         db.commit()
         db.refresh(category)
         return category
@@ -49,9 +104,38 @@ class CategoryRepository:
     @staticmethod
     def delete(db: Session, category: DBCategory) -> None:
         """Delete a category."""
+        # Close the category's balance in the ledger; its history is kept
+        LedgerRepository.record(
+            db,
+            int(category.id),
+            "reallocation",
+            allocated_delta=-float(category.allocated_budget),
+            remaining_delta=-float(category.available_budget),
+            note="Category deleted",
+        )
+        StatsRepository.delete_category(db, int(category.id))
+        db.query(DBCategoryBudgetShard).filter(
+            DBCategoryBudgetShard.category_id == category.id
+        ).delete()
         db.delete(category)
         db.commit()
 
+    @staticmethod
+    def spend_budget(db: Session, category_id: int, amount: float) -> bool:
+        """
+        Atomically deduct amount from a category's remaining budget (does not commit).
+
+        Returns False, changing nothing, if the category does not exist or has less
+        than amount remaining.
+        """
+        mark_changed(db, "categories")
+        result = db.execute(
+            update(DBCategory)
+            .where(DBCategory.id == category_id, DBCategory.remaining_budget >= amount)
+            .values(remaining_budget=DBCategory.remaining_budget - amount)
+        )
+        return result.rowcount == 1
+
     @staticmethod
     def get_approved_total(db: Session, category_id: int) -> float:
         """Get total approved amount for a category."""
@@ -61,3 +145,29 @@ class CategoryRepository:
             .scalar()
         )
         return float(result or 0.0)
+
+
+class AsyncCategoryRepository:
+    """Repository for category reads on an AsyncSession."""
+
+    @staticmethod
+    async def get_all(db: AsyncSession) -> list[DBCategory]:
+        """Get all categories."""
+        result = await db.execute(select(DBCategory).options(undefer(DBCategory.available_budget)))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def get_all_rows(db: AsyncSession) -> list[dict[str, Any]]:
+        """Get all categories like get_all, as response-ready dicts built from column tuples."""
+        result = await db.execute(select(*ROW_COLUMNS.values()))
+        return [_row_dict(row) for row in result]
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, category_id: int) -> DBCategory | None:
+        """Get a category by ID."""
+        result = await db.execute(
+            select(DBCategory)
+            .where(DBCategory.id == category_id)
+            .options(undefer(DBCategory.available_budget))
+        )
+        return result.scalars().first()
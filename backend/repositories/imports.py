@@ -0,0 +1,150 @@
+"""
+Repository for background contract import jobs.
+Stores job progress and the draft proposals each job produced.
+"""
+
+import json
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import insert, or_, update
+from sqlalchemy.orm import Session
+
+from database import ImportJob as DBImportJob
+from database import ImportJobRow as DBImportJobRow
+
+
+class ImportJobRepository:
+    """Repository for import job operations."""
+
+    @staticmethod
+    def create(db: Session, job_data: dict[str, Any]) -> DBImportJob:
+        """Create a queued import job."""
+        job = DBImportJob(**job_data)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def get_by_id(db: Session, job_id: str) -> DBImportJob | None:
+        """Get an import job by ID."""
+        return db.query(DBImportJob).filter(DBImportJob.id == job_id).first()
+
+    @staticmethod
+    def get_orphaned(db: Session, worker_id: str, stale_before: datetime) -> list[DBImportJob]:
+        """
+        Get the queued or running jobs no live worker holds.
+
+        Those are the jobs of worker_id itself (an earlier process with the same host
+        and PID) and those whose worker has not touched them since stale_before.
+        """
+        return (
+            db.query(DBImportJob)
+            .filter(
+                DBImportJob.status.in_(("queued", "running")),
+                or_(
+                    DBImportJob.worker_id.is_(None),
+                    DBImportJob.worker_id == worker_id,
+                    DBImportJob.updated_at.is_(None),
+                    DBImportJob.updated_at < stale_before,
+                ),
+            )
+            .all()
+        )
+
+    @staticmethod
+    def mark_started(db: Session, job_id: str, worker_id: str) -> bool:
+        """
+        Claim a queued job for worker_id and mark it running, and commit.
+
+        Returns False, changing nothing, if the job is no longer queued (another
+        worker claimed it first).
+        """
+        now = datetime.now(UTC)
+        result = db.execute(
+            update(DBImportJob)
+            .where(DBImportJob.id == job_id, DBImportJob.status == "queued")
+            .values(status="running", started_at=now, worker_id=worker_id, updated_at=now)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def add_rows(
+        db: Session, job_id: str, first_row: int, drafts: list[dict[str, Any]], bytes_read: int
+    ) -> None:
+        """
+        Store a batch of drafts numbered from first_row and advance the job's counters, and commit.
+
+        One INSERT for the rows and one UPDATE for the counters, so progress is
+        visible to status polls as soon as each batch is stored.
+        """
+        if drafts:
+            db.execute(
+                insert(DBImportJobRow),
+                [
+                    {
+                        "job_id": job_id,
+                        "row_number": first_row + offset,
+                        "valid": draft["valid"],
+                        "draft": json.dumps(draft),
+                    }
+                    for offset, draft in enumerate(drafts)
+                ],
+            )
+        valid = sum(1 for draft in drafts if draft["valid"])
+        db.execute(
+            update(DBImportJob)
+            .where(DBImportJob.id == job_id)
+            .values(
+                rows_processed=DBImportJob.rows_processed + len(drafts),
+                valid_rows=DBImportJob.valid_rows + valid,
+                error_rows=DBImportJob.error_rows + len(drafts) - valid,
+                bytes_read=bytes_read,
+                updated_at=datetime.now(UTC),
+            )
+        )
+        db.commit()
+
+    @staticmethod
+    def mark_finished(db: Session, job_id: str, error: str | None = None) -> None:
+        """Mark a job completed (or failed with the given error), and commit."""
+        now = datetime.now(UTC)
+        values: dict[str, Any] = {"finished_at": now, "updated_at": now}
+        if error is None:
+            values.update(status="completed", bytes_read=DBImportJob.file_size)
+        else:
+            values.update(status="failed", error=error)
+        db.execute(update(DBImportJob).where(DBImportJob.id == job_id).values(**values))
+        db.commit()
+
+    @staticmethod
+    def claim_import(db: Session, job_id: str) -> bool:
+        """
+        Mark a completed job imported (does not commit).
+
+        Returns False, changing nothing, if the job is not completed, for instance
+        because another request imported it first.
+        """
+        result = db.execute(
+            update(DBImportJob)
+            .where(DBImportJob.id == job_id, DBImportJob.status == "completed")
+            .values(status="imported", updated_at=datetime.now(UTC))
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def get_rows(
+        db: Session, job_id: str, after: int | None, limit: int, valid: bool | None = None
+    ) -> list[tuple[int, dict[str, Any]]]:
+        """Get (row_number, draft) pairs of a job in file order, starting after a row number."""
+        query = db.query(DBImportJobRow.row_number, DBImportJobRow.draft).filter(
+            DBImportJobRow.job_id == job_id
+        )
+        if after is not None:
+            query = query.filter(DBImportJobRow.row_number > after)
+        if valid is not None:
+            query = query.filter(DBImportJobRow.valid == valid)
+        rows = query.order_by(DBImportJobRow.row_number).limit(limit).all()
+        return [(row.row_number, json.loads(row.draft)) for row in rows]
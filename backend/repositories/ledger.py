@@ -0,0 +1,209 @@
+"""
+Repository for the budget ledger.
+Every budget movement is appended as a ledger entry; snapshots fold the ledger up
+to an entry so point-in-time balances only replay the entries after them.
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from database import BudgetLedgerEntry as DBBudgetLedgerEntry
+from database import BudgetSnapshot as DBBudgetSnapshot
+from events import emit
+
+ENTRY_TYPES = ("allocation", "approval", "reallocation")
+
+
+class LedgerRepository:
+    """Repository for budget ledger operations."""
+
+    @staticmethod
+    def record(
+        db: Session,
+        category_id: int,
+        entry_type: str,
+        allocated_delta: float = 0.0,
+        remaining_delta: float = 0.0,
+        proposal_id: int | None = None,
+        note: str | None = None,
+    ) -> None:
+        """Append one ledger entry (does not commit)."""
+        LedgerRepository.record_many(
+            db,
+            [
+                {
+                    "category_id": category_id,
+                    "entry_type": entry_type,
+                    "allocated_delta": allocated_delta,
+                    "remaining_delta": remaining_delta,
+                    "proposal_id": proposal_id,
+                    "note": note,
+                }
+            ],
+        )
+
+    @staticmethod
+    def record_many(db: Session, entries: list[dict[str, Any]]) -> None:
+        """
+        Append ledger entries with one INSERT (does not commit).
+
+        Each entry is also queued as a "budget" event for the /events stream.
+
+        Each entry has category_id and entry_type, and optionally allocated_delta,
+        remaining_delta, proposal_id and note.
+        """
+        if not entries:
+            return
+        created_at = datetime.now(UTC)
+        rows = []
+        for entry in entries:
+            if entry["entry_type"] not in ENTRY_TYPES:
+                raise ValueError(f"Unknown ledger entry type: {entry['entry_type']}")
+            rows.append(
+                {
+                    "allocated_delta": 0.0,
+                    "remaining_delta": 0.0,
+                    "proposal_id": None,
+                    "note": None,
+                    "created_at": created_at,
+                    **entry,
+                }
+            )
+        db.execute(insert(DBBudgetLedgerEntry), rows)
+        for row in rows:
+            emit(
+                db,
+                "budget",
+                {
+                    "category_id": row["category_id"],
+                    "entry_type": row["entry_type"],
+                    "allocated_delta": row["allocated_delta"],
+                    "remaining_delta": row["remaining_delta"],
+                    "proposal_id": row["proposal_id"],
+                },
+            )
+
+    @staticmethod
+    def get_entries(
+        db: Session, category_id: int, after_id: int | None, limit: int
+    ) -> list[DBBudgetLedgerEntry]:
+        """Get a category's ledger entries in order, starting after the given entry ID."""
+        query = db.query(DBBudgetLedgerEntry).filter(DBBudgetLedgerEntry.category_id == category_id)
+        if after_id is not None:
+            query = query.filter(DBBudgetLedgerEntry.id > after_id)
+        return query.order_by(DBBudgetLedgerEntry.id).limit(limit).all()
+
+    @staticmethod
+    def balance_as_of(db: Session, category_id: int, at: datetime) -> dict[str, Any] | None:
+        """
+        Compute a category's balance at a point in time.
+
+        Starts from the latest snapshot taken no later than `at` and adds the entries
+        after it that were made by then. Returns None if the category had no ledger
+        entries by then.
+        """
+        snapshot = (
+            db.query(DBBudgetSnapshot)
+            .filter(DBBudgetSnapshot.category_id == category_id, DBBudgetSnapshot.as_of <= at)
+            .order_by(DBBudgetSnapshot.as_of.desc(), DBBudgetSnapshot.ledger_id.desc())
+            .first()
+        )
+        allocated, remaining, count, last_at = (
+            db.query(
+                func.coalesce(func.sum(DBBudgetLedgerEntry.allocated_delta), 0.0),
+                func.coalesce(func.sum(DBBudgetLedgerEntry.remaining_delta), 0.0),
+                func.count(DBBudgetLedgerEntry.id),
+                func.max(DBBudgetLedgerEntry.created_at),
+            )
+            .filter(
+                DBBudgetLedgerEntry.category_id == category_id,
+                DBBudgetLedgerEntry.id > (snapshot.ledger_id if snapshot else 0),
+                DBBudgetLedgerEntry.created_at <= at,
+            )
+            .one()
+        )
+        if snapshot is None and count == 0:
+            return None
+
+        if snapshot is not None:
+            allocated += snapshot.allocated_budget
+            remaining += snapshot.remaining_budget
+        return {
+            "category_id": category_id,
+            "allocated_budget": float(allocated),
+            "remaining_budget": float(remaining),
+            "as_of": at,
+            "snapshot_id": snapshot.id if snapshot else None,
+            "replayed_entries": count,
+        }
+
+    @staticmethod
+    def take_snapshots(db: Session, cutoff: datetime) -> int:
+        """
+        Snapshot every category with ledger entries since its last snapshot, and commit.
+
+        Each snapshot covers a prefix of the ledger by ID: all entries up to the last
+        one created before `cutoff`. Keeping cutoff a little in the past leaves room
+        for transactions that took an entry ID but have not committed yet. Returns the
+        number of snapshots taken.
+        """
+        last_id = (
+            db.query(func.max(DBBudgetLedgerEntry.id))
+            .filter(DBBudgetLedgerEntry.created_at <= cutoff)
+            .scalar()
+        )
+        if last_id is None:
+            return 0
+
+        latest_ids = (
+            db.query(
+                DBBudgetSnapshot.category_id,
+                func.max(DBBudgetSnapshot.ledger_id).label("ledger_id"),
+            )
+            .group_by(DBBudgetSnapshot.category_id)
+            .subquery()
+        )
+        previous = {
+            snapshot.category_id: snapshot
+            for snapshot in db.query(DBBudgetSnapshot).join(
+                latest_ids,
+                (DBBudgetSnapshot.category_id == latest_ids.c.category_id)
+                & (DBBudgetSnapshot.ledger_id == latest_ids.c.ledger_id),
+            )
+        }
+        tails = (
+            db.query(
+                DBBudgetLedgerEntry.category_id,
+                func.sum(DBBudgetLedgerEntry.allocated_delta),
+                func.sum(DBBudgetLedgerEntry.remaining_delta),
+                func.max(DBBudgetLedgerEntry.created_at),
+            )
+            .outerjoin(latest_ids, latest_ids.c.category_id == DBBudgetLedgerEntry.category_id)
+            .filter(
+                DBBudgetLedgerEntry.id > func.coalesce(latest_ids.c.ledger_id, 0),
+                DBBudgetLedgerEntry.id <= last_id,
+            )
+            .group_by(DBBudgetLedgerEntry.category_id)
+            .all()
+        )
+
+        snapshots = []
+        for category_id, allocated, remaining, tail_as_of in tails:
+            base = previous.get(category_id)
+            snapshots.append(
+                {
+                    "category_id": category_id,
+                    "ledger_id": last_id,
+                    "as_of": max(base.as_of, tail_as_of) if base else tail_as_of,
+                    "allocated_budget": (base.allocated_budget if base else 0.0) + allocated,
+                    "remaining_budget": (base.remaining_budget if base else 0.0) + remaining,
+                    "created_at": datetime.now(UTC),
+                }
+            )
+        if snapshots:
+            db.execute(insert(DBBudgetSnapshot), snapshots)
+        db.commit()
+        return len(snapshots)
@@ -0,0 +1,76 @@
+"""
+Set-based name lookups shared by the category and ministry repositories.
+Resolves many names with a few queries instead of one or two per name.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+# Maximum number of names bound into a single IN/OR query
+LOOKUP_CHUNK_SIZE = 500
+
+
+def _chunks(values: list[str]) -> Iterator[list[str]]:
+    for start in range(0, len(values), LOOKUP_CHUNK_SIZE):
+        yield values[start : start + LOOKUP_CHUNK_SIZE]
+
+
+def match_names(db: Session, model: Any, names: Iterable[str]) -> dict[str, int]:
+    """Map lowercased names to row IDs of `model` by case-insensitive exact match only."""
+    resolved: dict[str, int] = {}
+    # One IN query per chunk; the lowest ID wins when names differ only in case
+    for chunk in _chunks(sorted({name.lower() for name in names if name})):
+        rows = (
+            db.query(model.id, model.name)
+            .filter(func.lower(model.name).in_(chunk))
+            .order_by(model.id)
+            .all()
+        )
+        for row_id, row_name in rows:
+            resolved.setdefault(row_name.lower(), row_id)
+    return resolved
+
+
+def existing_ids(db: Session, model: Any, ids: Iterable[int]) -> set[int]:
+    """The subset of the given IDs that exist in `model`'s table."""
+    found: set[int] = set()
+    wanted = sorted(set(ids))
+    for start in range(0, len(wanted), LOOKUP_CHUNK_SIZE):
+        chunk = wanted[start : start + LOOKUP_CHUNK_SIZE]
+        found.update(row_id for (row_id,) in db.query(model.id).filter(model.id.in_(chunk)))
+    return found
+
+
+def resolve_names(db: Session, model: Any, names: Iterable[str]) -> dict[str, int]:
+    """
+    Map names to row IDs of `model`: case-insensitive exact match first, then the
+    first row (lowest ID) whose name contains the given name. Names that match
+    nothing are left out of the result.
+    """
+    wanted = {name.lower() for name in names if name}
+    if not wanted:
+        return {}
+
+    resolved = match_names(db, model, wanted)
+
+    # Partial matches: fetch every candidate containing any missing name, match in memory
+    missing = sorted(wanted - resolved.keys())
+    candidates: list[tuple[int, str]] = []
+    for chunk in _chunks(missing):
+        rows = (
+            db.query(model.id, model.name)
+            .filter(or_(*(model.name.ilike(f"%{name}%") for name in chunk)))
+            .all()
+        )
+        candidates.extend((row_id, row_name.lower()) for row_id, row_name in rows)
+    candidates.sort()
+    for name in missing:
+        for row_id, row_name in candidates:
+            if name in row_name:
+                resolved[name] = row_id
+                break
+
+    return resolved
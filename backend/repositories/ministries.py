@@ -3,9 +3,24 @@ Repository for ministry data access.
 Encapsulates database queries related to ministries.
 """
 
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import Column, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
 from database import Ministry as DBMinistry
+from repositories.lookup import existing_ids, match_names, resolve_names
+
+# Columns behind the Ministry response schema, in its field order
+ROW_COLUMNS: dict[str, Column[Any]] = {
+    "name": DBMinistry.name,
+    "description": DBMinistry.description,
+    "id": DBMinistry.id,
+    "is_active": DBMinistry.is_active,
+    "created_at": DBMinistry.created_at,
+}
 
 
 class MinistryRepository:
@@ -16,6 +31,12 @@ class MinistryRepository:
         """Get all active ministries."""
         return db.query(DBMinistry).filter(DBMinistry.is_active).all()
 
+    @staticmethod
+    def get_all_active_rows(db: Session) -> list[dict[str, Any]]:
+        """Get all active ministries like get_all_active, as response-ready dicts."""
+        rows = db.execute(select(*ROW_COLUMNS.values()).where(DBMinistry.is_active))
+        return [dict(zip(ROW_COLUMNS, row, strict=True)) for row in rows]
+
     @staticmethod
     def get_by_id(db: Session, ministry_id: int) -> DBMinistry | None:
         """Get a ministry by ID."""
@@ -49,6 +70,31 @@ class MinistryRepository:
         db.refresh(ministry)
         return ministry
 
+    @staticmethod
+    def resolve_names(db: Session, names: Iterable[str]) -> dict[str, int]:
+        """Map lowercased names to ministry IDs (exact match, then partial match)."""
+        return resolve_names(db, DBMinistry, names)
+
+    @staticmethod
+    def match_names(db: Session, names: Iterable[str]) -> dict[str, int]:
+        """Map lowercased names to ministry IDs by exact (case-insensitive) match, like find_or_create."""
+        return match_names(db, DBMinistry, names)
+
+    @staticmethod
+    def existing_ids(db: Session, ministry_ids: Iterable[int]) -> set[int]:
+        """The subset of the given ministry IDs that exist."""
+        return existing_ids(db, DBMinistry, ministry_ids)
+
+    @staticmethod
+    def create_many(db: Session, names: list[str]) -> dict[str, int]:
+        """Create ministries for the given (new) names in one transaction; returns lowercased name -> ID."""
+        ministries = [
+            DBMinistry(name=name.strip(), description=f"Ministry of {name.strip()}") for name in names
+        ]
+        db.add_all(ministries)
+        db.commit()
+        return {ministry.name.lower(): int(ministry.id) for ministry in ministries}
+
     @staticmethod
     def get_with_proposals(db: Session) -> list[DBMinistry]:
         """Get all ministries with their proposals loaded."""
@@ -58,3 +104,19 @@ class MinistryRepository:
             .filter(DBMinistry.is_active)
             .all()
         )
+
+
+class AsyncMinistryRepository:
+    """Repository for ministry reads on an AsyncSession."""
+
+    @staticmethod
+    async def get_all_active(db: AsyncSession) -> list[DBMinistry]:
+        """Get all active ministries."""
+        result = await db.execute(select(DBMinistry).where(DBMinistry.is_active))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def get_all_active_rows(db: AsyncSession) -> list[dict[str, Any]]:
+        """Get all active ministries like get_all_active, as response-ready dicts."""
+        result = await db.execute(select(*ROW_COLUMNS.values()).where(DBMinistry.is_active))
+        return [dict(zip(ROW_COLUMNS, row, strict=True)) for row in result]
@@ -3,10 +3,35 @@ Repository for proposal data access.
 Encapsulates database queries related to proposals.
 """
 
-from sqlalchemy.orm import Session, joinedload
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Column, and_, bindparam, func, insert, or_, tuple_, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query, Session, joinedload
 
 from database import Category as DBCategory
+from database import Ministry as DBMinistry
 from database import Proposal as DBProposal
+from repositories.lookup import LOOKUP_CHUNK_SIZE
+from repositories.versions import mark_changed
+from responses import json_float
+
+# Columns that can be projected by get_page, keyed by their field name in the response
+PROJECTABLE_COLUMNS: dict[str, Column[Any]] = {
+    "id": DBProposal.id,
+    "ministry_id": DBProposal.ministry_id,
+    "category_id": DBProposal.category_id,
+    "title": DBProposal.title,
+    "description": DBProposal.description,
+    "requested_amount": DBProposal.requested_amount,
+    "status": DBProposal.status,
+    "approved_amount": DBProposal.approved_amount,
+    "decision_notes": DBProposal.decision_notes,
+    "decided_at": DBProposal.decided_at,
+    "created_at": DBProposal.created_at,
+    "ministry_name": DBMinistry.name,
+}
 
 
 class ProposalRepository:
@@ -31,15 +56,123 @@ class ProposalRepository:
     ) -> list[DBProposal]:
         """Get all proposals with optional filters."""
         query = db.query(DBProposal).options(joinedload(DBProposal.ministry))
+        query = ProposalRepository._filter(query, ministry_id, category_id, status)
+        return query.order_by(DBProposal.created_at.desc()).all()
+
+    @staticmethod
+    def get_all_rows(
+        db: Session,
+        ministry_id: int | None = None,
+        category_id: int | None = None,
+        status: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get all proposals like get_all, as response-ready dicts built from column tuples.
+
+        Keys follow the Proposal response schema, with the ministry nested under
+        'ministry', so the rows can be encoded without building models.
+        """
+        query = db.query(
+            DBProposal.category_id,
+            DBProposal.title,
+            DBProposal.description,
+            DBProposal.requested_amount,
+            DBProposal.id,
+            DBProposal.status,
+            DBProposal.approved_amount,
+            DBProposal.decision_notes,
+            DBProposal.decided_at,
+            DBProposal.created_at,
+            DBMinistry.name,
+            DBMinistry.description,
+            DBMinistry.id,
+            DBMinistry.is_active,
+            DBMinistry.created_at,
+        ).outerjoin(DBMinistry, DBMinistry.id == DBProposal.ministry_id)
+        query = ProposalRepository._filter(query, ministry_id, category_id, status)
+
+        rows = []
+        for row in query.order_by(DBProposal.created_at.desc()).all():
+            ministry = None
+            if row[12] is not None:
+                ministry = {
+                    "name": row[10],
+                    "description": row[11],
+                    "id": row[12],
+                    "is_active": row[13],
+                    "created_at": row[14],
+                }
+            rows.append(
+                {
+                    "category_id": row[0],
+                    "title": row[1],
+                    "description": row[2],
+                    "requested_amount": json_float(row[3]),
+                    "id": row[4],
+                    "status": row[5],
+                    "approved_amount": json_float(row[6]),
+                    "decision_notes": row[7],
+                    "decided_at": row[8],
+                    "created_at": row[9],
+                    "ministry": ministry,
+                }
+            )
+        return rows
+
+    @staticmethod
+    def get_page(
+        db: Session,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+        fields: list[str] | None = None,
+        ministry_id: int | None = None,
+        category_id: int | None = None,
+        status: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get one page of proposals ordered by (created_at, id) descending.
+
+        Uses keyset pagination: `after` is the (created_at, id) of the last row of the
+        previous page, so the cost of a page does not depend on how deep it is.
+        Only the requested columns are selected; no ORM entities are built.
+        """
+        names = list(fields or PROJECTABLE_COLUMNS)
+        # The cursor columns are always needed to build the next continuation token
+        for key in ("created_at", "id"):
+            if key not in names:
+                names.append(key)
+
+        query = db.query(*(PROJECTABLE_COLUMNS[name].label(name) for name in names))
+        if "ministry_name" in names:
+            query = query.outerjoin(DBMinistry, DBMinistry.id == DBProposal.ministry_id)
+        query = ProposalRepository._filter(query, ministry_id, category_id, status)
+
+        if after is not None:
+            after_created_at, after_id = after
+            query = query.filter(
+                or_(
+                    DBProposal.created_at < after_created_at,
+                    and_(DBProposal.created_at == after_created_at, DBProposal.id < after_id),
+                )
+            )
+
+        rows = (
+            query.order_by(DBProposal.created_at.desc(), DBProposal.id.desc()).limit(limit).all()
+        )
+        return [dict(row._mapping) for row in rows]
 
+    @staticmethod
+    def _filter(
+        query: Query, ministry_id: int | None, category_id: int | None, status: str | None
+    ) -> Query:
+        """Apply the optional listing filters to a proposal query."""
         if ministry_id:
             query = query.filter(DBProposal.ministry_id == ministry_id)
         if category_id:
             query = query.filter(DBProposal.category_id == category_id)
         if status:
             query = query.filter(DBProposal.status == status)
-
-        return query.order_by(DBProposal.created_at.desc()).all()
+        return query
 
     @staticmethod
     def create(db: Session, proposal_data: dict) -> DBProposal:
@@ -50,6 +183,24 @@ class ProposalRepository:
         db.refresh(proposal)
         return proposal
 
+    @staticmethod
+    def create_many(db: Session, rows: list[dict[str, Any]]) -> list[int]:
+        """
+        Insert many proposals with one multi-row INSERT and return their IDs in row order.
+
+        Where the dialect can, RETURNING is asked for in parameter order (PostgreSQL
+        matches rows to parameters with a sentinel). SQLite can only honour that by
+        inserting one row per statement, so there the IDs are sorted instead, as its
+        multi-row INSERT assigns ascending IDs in VALUES order. Does not commit.
+        """
+        if not rows:
+            return []
+        mark_changed(db, "proposals")
+        stmt = insert(DBProposal)
+        if db.get_bind().dialect.name == "sqlite":
+            return sorted(db.scalars(stmt.returning(DBProposal.id), rows))
+        return list(db.scalars(stmt.returning(DBProposal.id, sort_by_parameter_order=True), rows))
+
     @staticmethod
     def update(db: Session, proposal: DBProposal, update_data: dict) -> DBProposal:
         """Update an existing proposal."""
@@ -80,6 +231,41 @@ class ProposalRepository:
             .first()
         )
 
+    @staticmethod
+    def find_duplicates(
+        db: Session, keys: set[tuple[int, str, float]]
+    ) -> set[tuple[int, str, float]]:
+        """Return which (ministry_id, title, requested_amount) keys already exist as proposals."""
+        found: set[tuple[int, str, float]] = set()
+        ordered = list(keys)
+        for start in range(0, len(ordered), LOOKUP_CHUNK_SIZE):
+            chunk = ordered[start : start + LOOKUP_CHUNK_SIZE]
+            rows = (
+                db.query(DBProposal.ministry_id, DBProposal.title, DBProposal.requested_amount)
+                .filter(
+                    tuple_(
+                        DBProposal.ministry_id, DBProposal.title, DBProposal.requested_amount
+                    ).in_(chunk)
+                )
+                .distinct()
+                .all()
+            )
+            found.update((row[0], row[1], row[2]) for row in rows)
+        return found
+
+    @staticmethod
+    def get_approved_totals_by_category(db: Session) -> dict[int, float]:
+        """Get the total approved amount per category, keyed by category ID."""
+        rows = (
+            db.query(
+                DBProposal.category_id, func.coalesce(func.sum(DBProposal.approved_amount), 0.0)
+            )
+            .filter(DBProposal.status == "Approved")
+            .group_by(DBProposal.category_id)
+            .all()
+        )
+        return {int(category_id): float(total or 0.0) for category_id, total in rows}
+
     @staticmethod
     def get_category_with_lock(db: Session, category_id: int) -> DBCategory | None:
         """Get a category with row lock for atomic updates."""
@@ -89,3 +275,124 @@ class ProposalRepository:
             .with_for_update(nowait=False)
             .first()
         )
+
+    @staticmethod
+    def decide_if_unchanged(db: Session, proposal: DBProposal, values: dict[str, Any]) -> bool:
+        """
+        Compare-and-set a decision onto a pending proposal (does not commit).
+
+        The UPDATE only matches while the proposal is still Pending with the category
+        and requested amount it was validated against. Returns whether it matched.
+        """
+        mark_changed(db, "proposals")
+        result = db.execute(
+            update(DBProposal)
+            .where(
+                DBProposal.id == proposal.id,
+                DBProposal.status == "Pending",
+                DBProposal.category_id == proposal.category_id,
+                DBProposal.requested_amount == proposal.requested_amount,
+            )
+            .values(values)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def get_decision_rows(
+        db: Session, proposal_ids: list[int], lock: bool = False
+    ) -> dict[int, Row[Any]]:
+        """
+        Get the fields a decision needs for many proposals, keyed by ID.
+
+        Rows are plain column tuples (not ORM objects), read in ID order and optionally
+        locked FOR UPDATE.
+        """
+        ids = sorted(set(proposal_ids))
+        rows: dict[int, Row[Any]] = {}
+        for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+            query = (
+                db.query(
+                    DBProposal.id,
+                    DBProposal.ministry_id,
+                    DBProposal.category_id,
+                    DBProposal.status,
+                    DBProposal.requested_amount,
+                    DBProposal.approved_amount,
+                )
+                .filter(DBProposal.id.in_(ids[start : start + LOOKUP_CHUNK_SIZE]))
+                .order_by(DBProposal.id)
+            )
+            if lock:
+                query = query.with_for_update()
+            rows.update((row.id, row) for row in query.all())
+        return rows
+
+    @staticmethod
+    def get_category_budgets_with_lock(db: Session, category_ids: set[int]) -> dict[int, float]:
+        """
+        Lock many categories and return their remaining budgets.
+
+        Rows are locked in ascending ID order so concurrent batches touching the same
+        categories always acquire them in the same order and cannot deadlock.
+        """
+        ids = sorted(category_ids)
+        budgets: dict[int, float] = {}
+        for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+            rows = (
+                db.query(DBCategory.id, DBCategory.remaining_budget)
+                .filter(DBCategory.id.in_(ids[start : start + LOOKUP_CHUNK_SIZE]))
+                .order_by(DBCategory.id)
+                .with_for_update()
+                .all()
+            )
+            budgets.update((row.id, row.remaining_budget) for row in rows)
+        return budgets
+
+    @staticmethod
+    def apply_decisions(
+        db: Session, decisions: list[dict[str, Any]], spent_by_category: dict[int, float]
+    ) -> None:
+        """
+        Write many decisions with one executemany UPDATE per table (does not commit).
+
+        Each decision dict has proposal_id, status, approved_amount, decision_notes and
+        decided_at; spent_by_category maps category IDs to the amount to deduct.
+        """
+        mark_changed(db, "proposals", "categories")
+        proposals = DBProposal.__table__
+        if decisions:
+            db.execute(
+                update(proposals)
+                .where(proposals.c.id == bindparam("proposal_id"))
+                .where(proposals.c.status == "Pending")
+                .values(
+                    status=bindparam("new_status"),
+                    approved_amount=bindparam("new_approved_amount"),
+                    decision_notes=bindparam("new_decision_notes"),
+                    decided_at=bindparam("new_decided_at"),
+                ),
+                [
+                    {
+                        "proposal_id": decision["proposal_id"],
+                        "new_status": decision["status"],
+                        "new_approved_amount": decision["approved_amount"],
+                        "new_decision_notes": decision["decision_notes"],
+                        "new_decided_at": decision["decided_at"],
+                    }
+                    for decision in decisions
+                ],
+            )
+
+        categories = DBCategory.__table__
+        spent = [
+            {"category_id": category_id, "spent": amount}
+            for category_id, amount in sorted(spent_by_category.items())
+            if amount
+        ]
+        if spent:
+            db.execute(
+                update(categories)
+                .where(categories.c.id == bindparam("category_id"))
+                .values(remaining_budget=categories.c.remaining_budget - bindparam("spent")),
+                spent,
+            )
@@ -0,0 +1,172 @@
+"""
+Repository for dashboard aggregate data access.
+Keeps per-category and per-ministry proposal totals up to date so the
+dashboard never has to scan the proposals table.
+"""
+
+from typing import Any
+
+from sqlalchemy import case, func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, undefer
+
+from database import Category as DBCategory
+from database import CategoryStats as DBCategoryStats
+from database import Ministry as DBMinistry
+from database import MinistryStats as DBMinistryStats
+from database import Proposal as DBProposal
+from repositories.versions import mark_changed
+
+# Status -> aggregate column counting proposals in that status
+STATUS_COUNT_COLUMNS = {
+    "Pending": "pending_count",
+    "Approved": "approved_count",
+    "Rejected": "rejected_count",
+}
+
+STATS_COLUMNS = ("requested_total", "approved_total", "pending_count", "approved_count", "rejected_count")
+
+
+def proposal_snapshot(proposal: Any) -> dict[str, Any]:
+    """Capture the fields of a proposal that contribute to the aggregates."""
+    return {
+        "ministry_id": proposal.ministry_id,
+        "category_id": proposal.category_id,
+        "status": proposal.status,
+        "requested_amount": proposal.requested_amount,
+        "approved_amount": proposal.approved_amount,
+    }
+
+
+def _upsert(db: Session, model: Any) -> postgresql.Insert | sqlite.Insert:
+    # Both dialects spell INSERT ... ON CONFLICT the same way, from their own insert()
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+class StatsRepository:
+    """Repository for dashboard aggregate operations."""
+
+    @staticmethod
+    def record_change(
+        db: Session, before: dict[str, Any] | None, after: dict[str, Any] | None
+    ) -> None:
+        """
+        Apply the aggregate delta of a proposal going from `before` to `after`.
+
+        Both arguments are proposal snapshots (see proposal_snapshot); None means the
+        proposal does not exist on that side (create/delete). Does not commit, so the
+        change lands in the same transaction as the proposal write.
+        """
+        StatsRepository.record_changes(db, [(before, after)])
+
+    @staticmethod
+    def record_changes(
+        db: Session, changes: list[tuple[dict[str, Any] | None, dict[str, Any] | None]]
+    ) -> None:
+        """
+        Apply the combined delta of many (before, after) changes, one upsert per row touched.
+
+        Each row is written with INSERT ... ON CONFLICT DO UPDATE, so two transactions
+        creating the first aggregates of a category or ministry both succeed.
+        """
+        mark_changed(db, "proposals")
+        deltas: dict[tuple[Any, int], dict[str, float]] = {}
+
+        for before, after in changes:
+            for snapshot, sign in ((before, -1), (after, 1)):
+                if snapshot is None:
+                    continue
+                contribution = {
+                    "requested_total": float(snapshot["requested_amount"] or 0.0),
+                    STATUS_COUNT_COLUMNS[snapshot["status"]]: 1,
+                }
+                if snapshot["status"] == "Approved":
+                    contribution["approved_total"] = float(snapshot["approved_amount"] or 0.0)
+                for model, key in (
+                    (DBCategoryStats, snapshot["category_id"]),
+                    (DBMinistryStats, snapshot["ministry_id"]),
+                ):
+                    row = deltas.setdefault((model, key), {})
+                    for column, value in contribution.items():
+                        row[column] = row.get(column, 0) + sign * value
+
+        for (model, key), row in deltas.items():
+            row = {column: value for column, value in row.items() if value}
+            if not row:
+                continue
+            key_column = (
+                model.category_id if model is DBCategoryStats else model.ministry_id
+            )
+            values: dict[str, Any] = dict.fromkeys(STATS_COLUMNS, 0)
+            values.update(row)
+            values[key_column.key] = key
+            db.execute(
+                _upsert(db, model)
+                .values(values)
+                .on_conflict_do_update(
+                    index_elements=[key_column],
+                    set_={column: getattr(model, column) + value for column, value in row.items()},
+                )
+            )
+
+    @staticmethod
+    def delete_category(db: Session, category_id: int) -> None:
+        """Drop the aggregates of a category (does not commit)."""
+        db.query(DBCategoryStats).filter(DBCategoryStats.category_id == category_id).delete()
+
+    @staticmethod
+    def get_category_summary(db: Session) -> list[tuple[DBCategory, DBCategoryStats | None]]:
+        """Get every category together with its aggregates."""
+        rows = (
+            db.query(DBCategory, DBCategoryStats)
+            .outerjoin(DBCategoryStats, DBCategoryStats.category_id == DBCategory.id)
+            .options(undefer(DBCategory.available_budget))
+            .all()
+        )
+        return [row._tuple() for row in rows]
+
+    @staticmethod
+    def get_ministry_summary(db: Session) -> list[tuple[DBMinistry, DBMinistryStats | None]]:
+        """Get every ministry together with its aggregates."""
+        rows = (
+            db.query(DBMinistry, DBMinistryStats)
+            .outerjoin(DBMinistryStats, DBMinistryStats.ministry_id == DBMinistry.id)
+            .all()
+        )
+        return [row._tuple() for row in rows]
+
+    @staticmethod
+    def rebuild(db: Session) -> None:
+        """Recompute all aggregates from the proposals table and commit."""
+        columns = [
+            func.coalesce(func.sum(DBProposal.requested_amount), 0.0),
+            func.coalesce(
+                func.sum(
+                    case((DBProposal.status == "Approved", DBProposal.approved_amount), else_=0.0)
+                ),
+                0.0,
+            ),
+            *(
+                func.coalesce(func.sum(case((DBProposal.status == status, 1), else_=0)), 0)
+                for status in STATUS_COUNT_COLUMNS
+            ),
+        ]
+
+        mark_changed(db, "proposals")
+        db.query(DBCategoryStats).delete()
+        db.query(DBMinistryStats).delete()
+
+        for model, group_column, key in (
+            (DBCategoryStats, DBProposal.category_id, "category_id"),
+            (DBMinistryStats, DBProposal.ministry_id, "ministry_id"),
+        ):
+            rows = db.query(group_column, *columns).group_by(group_column).all()
+            if rows:
+                db.execute(
+                    insert(model),
+                    [{key: row[0], **dict(zip(STATS_COLUMNS, row[1:], strict=True))} for row in rows],
+                )
+
+        db.commit()
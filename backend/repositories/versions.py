@@ -0,0 +1,92 @@
+"""
+Per-resource version counters backing ETags on the list endpoints.
+Writes mark the resources they change on their session; the counters are bumped
+only once that session commits, so an ETag never describes uncommitted data.
+
+Counters live in process memory: they are exact for a single worker process and
+restart from zero (with a new process token) when the process restarts. Other
+processes' writes are not seen, which is why ETAGS_ENABLED is off by default.
+"""
+
+import hashlib
+import threading
+import uuid
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from database import Category as DBCategory
+from database import CategoryBudgetShard as DBCategoryBudgetShard
+from database import CategoryStats as DBCategoryStats
+from database import Ministry as DBMinistry
+from database import MinistryStats as DBMinistryStats
+from database import Proposal as DBProposal
+
+RESOURCES = ("categories", "ministries", "proposals")
+
+# ORM classes whose flushed changes alter a resource
+MODEL_RESOURCES: dict[type, str] = {
+    DBCategory: "categories",
+    DBCategoryBudgetShard: "categories",
+    DBMinistry: "ministries",
+    DBProposal: "proposals",
+    DBCategoryStats: "proposals",
+    DBMinistryStats: "proposals",
+}
+
+_PENDING_KEY = "changed_resources"
+_versions = dict.fromkeys(RESOURCES, 0)
+_lock = threading.Lock()
+# Tells ETags from before and after a restart apart, as the counters start over
+_process_token = uuid.uuid4().hex
+
+
+def mark_changed(db: Session, *resources: str) -> None:
+    """
+    Record that the session's transaction changes these resources.
+
+    ORM changes are picked up at flush time; repositories call this for the
+    Core UPDATE/INSERT/DELETE statements they issue.
+    """
+    db.info.setdefault(_PENDING_KEY, set()).update(resources)
+
+
+def get_versions(resources: Iterable[str]) -> tuple[int, ...]:
+    """Current version of each resource."""
+    with _lock:
+        return tuple(_versions[resource] for resource in resources)
+
+
+def resource_etag(resources: Iterable[str], scope: str) -> str:
+    """Strong ETag for a representation built from these resources (scope: path and query)."""
+    resources = tuple(resources)
+    versions = get_versions(resources)
+    key = f"{_process_token}|{scope}|{','.join(resources)}|{versions}"
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+
+@event.listens_for(Session, "before_flush")
+def _mark_flushed_changes(session: Session, flush_context: Any, instances: Any) -> None:
+    changed = {
+        MODEL_RESOURCES[type(obj)]
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if type(obj) in MODEL_RESOURCES
+    }
+    if changed:
+        mark_changed(session, *changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed(session: Session) -> None:
+    changed = session.info.pop(_PENDING_KEY, None)
+    if changed:
+        with _lock:
+            for resource in changed:
+                _versions[resource] += 1
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,42 @@
+"""
+Fast JSON responses for the large list endpoints.
+With FAST_JSON_RESPONSES on, those endpoints build plain dicts straight from the
+selected columns and encode them with orjson, skipping per-row Pydantic validation
+and jsonable_encoder. The bytes match what the response_model path produces.
+"""
+
+import json
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson instead of json.dumps."""
+
+    def render(self, content: Any) -> bytes:
+        # Pydantic writes UTC datetimes with a "Z" suffix rather than "+00:00"
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def json_float(value: Any) -> Any:
+    """
+    Convert a numeric column value the way a `float` response field serializes it.
+
+    Integers become floats (1000 -> 1000.0). Values json.dumps writes in exponent form
+    are pre-encoded by it, as orjson spells some of them differently (1e-05 vs 0.00001).
+    """
+    if value is None:
+        return None
+    value = float(value)
+    if value and not 1e-4 <= abs(value) < 1e16:
+        # Also rejects NaN and infinity, as the response_model path does
+        return orjson.Fragment(json.dumps(value, allow_nan=False))
+    return value
+
+
+def fast_json(content: Any, response: Response) -> FastJSONResponse:
+    """Wrap content in a FastJSONResponse that keeps the headers set on the endpoint's response."""
+    return FastJSONResponse(content, headers=dict(response.headers))
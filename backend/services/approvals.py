@@ -4,38 +4,48 @@ Handles the approval workflow, budget checks, and atomic updates.
 """
 
 from datetime import UTC, datetime
+from typing import Any
 
+from prometheus_client import Counter
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from database import Proposal as DBProposal
+from events import emit, proposal_event
 from exceptions import (
     CategoryNotFoundError,
+    ConcurrentUpdateError,
+    DomainError,
     InsufficientBudgetError,
     InvalidProposalStatusError,
     ProposalNotFoundError,
     ValidationError,
 )
+from models import Proposal as ProposalModel
+from repositories.budgets import BudgetShardRepository
+from repositories.categories import CategoryRepository
+from repositories.ledger import LedgerRepository
 from repositories.proposals import ProposalRepository
+from repositories.stats import StatsRepository, proposal_snapshot
+from settings import settings
+
+APPROVAL_RETRIES = Counter(
+    "approval_retries_total", "Optimistic approval attempts retried after a conflict"
+)
+APPROVAL_CONFLICTS = Counter(
+    "approval_conflicts_total",
+    "Optimistic approval attempts that lost a race, by what they lost on",
+    ["reason"],
+)
 
 
 class ApprovalService:
     """Service for handling proposal approvals and rejections."""
 
     @staticmethod
-    def approve_proposal(
-        db: Session, proposal_id: int, approved_amount: float, decision_notes: str | None = None
-    ) -> DBProposal:
-        """
-        Approve a proposal with the given approved amount.
-
-        Validates:
-        - Proposal exists and is in Pending status
-        - Approved amount is valid (> 0, <= requested_amount)
-        - Category has sufficient remaining budget
-
-        Atomically updates category remaining budget and proposal status.
-        """
-        # Get proposal
+    def _validate_approval(db: Session, proposal_id: int, approved_amount: float) -> DBProposal:
+        """Load a proposal and check it can be approved for approved_amount."""
         proposal = ProposalRepository.get_by_id(db, proposal_id)
         if not proposal:
             raise ProposalNotFoundError("Proposal not found")
@@ -50,6 +60,31 @@ class ApprovalService:
         if approved_amount > proposal.requested_amount:
             raise ValidationError("approved_amount exceeds requested amount")
 
+        return proposal
+
+    @staticmethod
+    def approve_proposal(
+        db: Session, proposal_id: int, approved_amount: float, decision_notes: str | None = None
+    ) -> DBProposal:
+        """
+        Approve a proposal with the given approved amount.
+
+        Validates:
+        - Proposal exists and is in Pending status
+        - Approved amount is valid (> 0, <= requested_amount)
+        - Category has sufficient remaining budget
+
+        Atomically updates category remaining budget and proposal status. With
+        APPROVAL_STRATEGY="optimistic" or sharded budgets this goes through
+        approve_proposal_optimistic.
+        """
+        if settings.APPROVAL_STRATEGY == "optimistic" or settings.BUDGET_SHARDS > 1:
+            return ApprovalService.approve_proposal_optimistic(
+                db, proposal_id, approved_amount, decision_notes
+            )
+
+        proposal = ApprovalService._validate_approval(db, proposal_id, approved_amount)
+
         # Get category with lock for atomic update
         category = ProposalRepository.get_category_with_lock(db, proposal.category_id)
         if not category:
@@ -60,17 +95,98 @@ class ApprovalService:
             raise InsufficientBudgetError("Insufficient remaining budget")
 
         # Atomically apply decision
+        before = proposal_snapshot(proposal)
         category.remaining_budget = category.remaining_budget - approved_amount
         proposal.status = "Approved"
         proposal.approved_amount = approved_amount
         proposal.decision_notes = decision_notes
         proposal.decided_at = datetime.now(UTC)
+        StatsRepository.record_change(db, before, proposal_snapshot(proposal))
+        emit(db, *proposal_event(proposal.id, "approved", proposal_snapshot(proposal)))
+        LedgerRepository.record(
+            db, category.id, "approval", remaining_delta=-approved_amount, proposal_id=proposal.id
+        )
 
         db.commit()
         db.refresh(proposal)
 
         return proposal
 
+    @staticmethod
+    def approve_proposal_optimistic(
+        db: Session, proposal_id: int, approved_amount: float, decision_notes: str | None = None
+    ) -> DBProposal:
+        """
+        Approve a proposal without holding a category row lock.
+
+        The proposal leaves Pending through a compare-and-set on the fields that were
+        validated, and the budget is deducted by one conditional UPDATE that only
+        matches while enough remains, so concurrent approvals in a category cost a
+        round trip each instead of queueing on a lock. An attempt that loses a race
+        on the proposal, or hits a transient database error, is retried up to
+        APPROVAL_MAX_RETRIES times. With BUDGET_SHARDS > 1 the budget is deducted from
+        one of the category's shards instead of the category row.
+        """
+        spend_budget = (
+            BudgetShardRepository.spend
+            if settings.BUDGET_SHARDS > 1
+            else CategoryRepository.spend_budget
+        )
+        for attempt in range(settings.APPROVAL_MAX_RETRIES + 1):
+            if attempt:
+                APPROVAL_RETRIES.inc()
+            try:
+                proposal = ApprovalService._validate_approval(db, proposal_id, approved_amount)
+                category_id = proposal.category_id
+                before = proposal_snapshot(proposal)
+
+                decided = ProposalRepository.decide_if_unchanged(
+                    db,
+                    proposal,
+                    {
+                        "status": "Approved",
+                        "approved_amount": approved_amount,
+                        "decision_notes": decision_notes,
+                        "decided_at": datetime.now(UTC),
+                    },
+                )
+                if not decided:
+                    # Decided or edited since it was read; the next attempt re-validates
+                    APPROVAL_CONFLICTS.labels("proposal").inc()
+                    db.rollback()
+                    continue
+
+                if not spend_budget(db, category_id, approved_amount):
+                    db.rollback()
+                    if CategoryRepository.get_by_id(db, category_id) is None:
+                        raise CategoryNotFoundError("Category does not exist")
+                    APPROVAL_CONFLICTS.labels("budget").inc()
+                    raise InsufficientBudgetError("Insufficient remaining budget")
+
+                after = {**before, "status": "Approved", "approved_amount": approved_amount}
+                StatsRepository.record_change(db, before, after)
+                emit(db, *proposal_event(proposal_id, "approved", after))
+                LedgerRepository.record(
+                    db,
+                    category_id,
+                    "approval",
+                    remaining_delta=-approved_amount,
+                    proposal_id=proposal_id,
+                )
+                db.commit()
+            except OperationalError:
+                # Lock timeouts, deadlocks and serialization failures are worth retrying
+                db.rollback()
+                APPROVAL_CONFLICTS.labels("database").inc()
+                if attempt == settings.APPROVAL_MAX_RETRIES:
+                    raise
+                continue
+
+            db.refresh(proposal)
+            return proposal
+
+        raise ConcurrentUpdateError("Proposal kept changing during approval, please retry")
+
     @staticmethod
     def reject_proposal(
         db: Session, proposal_id: int, decision_notes: str | None = None
@@ -91,12 +207,164 @@ class ApprovalService:
             raise InvalidProposalStatusError("Only pending proposals can be rejected")
 
         # Apply rejection
+        before = proposal_snapshot(proposal)
         proposal.status = "Rejected"
         proposal.approved_amount = None
         proposal.decision_notes = decision_notes
         proposal.decided_at = datetime.now(UTC)
+        StatsRepository.record_change(db, before, proposal_snapshot(proposal))
+        emit(db, *proposal_event(proposal.id, "rejected", proposal_snapshot(proposal)))
 
         db.commit()
         db.refresh(proposal)
 
         return proposal
+
+    @staticmethod
+    def decide_many(db: Session, decisions: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Apply many approve/reject decisions in one transaction.
+
+        Each decision is validated like approve_proposal/reject_proposal. Items that
+        fail are reported with their error and skipped; the rest are written with bulk
+        UPDATEs and committed together. Affected categories are locked once, in
+        ascending ID order, and budgets are checked in memory in request order.
+
+        Returns:
+            Dictionary with per-item 'results' and the 'applied'/'failed' counts.
+        """
+        if len(decisions) > settings.BULK_DECISION_MAX_ITEMS:
+            raise ValidationError(
+                f"At most {settings.BULK_DECISION_MAX_ITEMS} decisions are allowed per request"
+            )
+
+        # Find the categories involved and lock them, then re-read the proposals under
+        # lock so decisions committed in the meantime are seen
+        proposal_ids = [decision["proposal_id"] for decision in decisions]
+        unlocked = ProposalRepository.get_decision_rows(db, proposal_ids)
+        locked_categories = {row.category_id for row in unlocked.values()}
+        if settings.BUDGET_SHARDS > 1:
+            # Pool shard balances on the category rows; approvals re-spread them later
+            BudgetShardRepository.collapse(db, locked_categories)
+        remaining = ProposalRepository.get_category_budgets_with_lock(db, locked_categories)
+        proposals = ProposalRepository.get_decision_rows(db, proposal_ids, lock=True)
+
+        decided_at = datetime.now(UTC)
+        seen: set[int] = set()
+        spent: dict[int, float] = {}
+        updates: list[dict[str, Any]] = []
+        changes: list[tuple[dict[str, Any] | None, dict[str, Any] | None]] = []
+        results: list[dict[str, Any]] = []
+
+        for decision in decisions:
+            proposal_id = decision["proposal_id"]
+            approve = decision["decision"] == "approve"
+            approved_amount = decision.get("approved_amount") if approve else None
+            try:
+                if proposal_id in seen:
+                    raise ValidationError("Proposal appears more than once in the batch")
+                proposal = proposals.get(proposal_id)
+                if proposal is None:
+                    raise ProposalNotFoundError("Proposal not found")
+                if proposal.status != "Pending":
+                    action = "approved" if approve else "rejected"
+                    raise InvalidProposalStatusError(f"Only pending proposals can be {action}")
+                if approve:
+                    if approved_amount is None or approved_amount <= 0:
+                        raise ValidationError("approved_amount must be > 0")
+                    if approved_amount > proposal.requested_amount:
+                        raise ValidationError("approved_amount exceeds requested amount")
+                    if proposal.category_id not in locked_categories:
+                        raise ValidationError("Proposal changed while the batch ran, retry it")
+                    if proposal.category_id not in remaining:
+                        raise CategoryNotFoundError("Category does not exist")
+                    if approved_amount > remaining[proposal.category_id]:
+                        raise InsufficientBudgetError("Insufficient remaining budget")
+            except DomainError as e:
+                results.append({"proposal_id": proposal_id, "ok": False, "error": str(e)})
+                continue
+
+            seen.add(proposal_id)
+            status = "Approved" if approve else "Rejected"
+            if approve:
+                remaining[proposal.category_id] -= approved_amount
+                spent[proposal.category_id] = spent.get(proposal.category_id, 0.0) + approved_amount
+            updates.append(
+                {
+                    "proposal_id": proposal_id,
+                    "status": status,
+                    "approved_amount": approved_amount,
+                    "decision_notes": decision.get("decision_notes"),
+                    "decided_at": decided_at,
+                }
+            )
+            before = proposal_snapshot(proposal)
+            after = {**before, "status": status, "approved_amount": approved_amount}
+            changes.append((before, after))
+            emit(db, *proposal_event(proposal_id, "approved" if approve else "rejected", after))
+            results.append(
+                {
+                    "proposal_id": proposal_id,
+                    "ok": True,
+                    "status": status,
+                    "approved_amount": approved_amount,
+                }
+            )
+
+        if updates:
+            ProposalRepository.apply_decisions(db, updates, spent)
+            StatsRepository.record_changes(db, changes)
+            LedgerRepository.record_many(
+                db,
+                [
+                    {
+                        "category_id": proposals[update["proposal_id"]].category_id,
+                        "entry_type": "approval",
+                        "remaining_delta": -update["approved_amount"],
+                        "proposal_id": update["proposal_id"],
+                    }
+                    for update in updates
+                    if update["status"] == "Approved"
+                ],
+            )
+            db.commit()
+
+        return {"results": results, "applied": len(updates), "failed": len(results) - len(updates)}
+
+
+class AsyncApprovalService:
+    """Async counterpart of ApprovalService, running it through AsyncSession.run_sync."""
+
+    @staticmethod
+    async def approve_proposal(
+        db: AsyncSession,
+        proposal_id: int,
+        approved_amount: float,
+        decision_notes: str | None = None,
+    ) -> ProposalModel:
+        """Approve a proposal with the given approved amount."""
+
+        def run(session: Session) -> ProposalModel:
+            proposal = ApprovalService.approve_proposal(
+                session, proposal_id, approved_amount, decision_notes
+            )
+            return ProposalModel.model_validate(proposal)
+
+        return await db.run_sync(run)
+
+    @staticmethod
+    async def reject_proposal(
+        db: AsyncSession, proposal_id: int, decision_notes: str | None = None
+    ) -> ProposalModel:
+        """Reject a proposal."""
+
+        def run(session: Session) -> ProposalModel:
+            proposal = ApprovalService.reject_proposal(session, proposal_id, decision_notes)
+            return ProposalModel.model_validate(proposal)
+
+        return await db.run_sync(run)
+
+    @staticmethod
+    async def decide_many(db: AsyncSession, decisions: list[dict[str, Any]]) -> dict[str, Any]:
+        """Apply many approve/reject decisions in one transaction."""
+        return await db.run_sync(ApprovalService.decide_many, decisions)
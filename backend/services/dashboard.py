@@ -0,0 +1,78 @@
+"""
+Service for dashboard summary business logic.
+Builds the finance dashboard from the maintained aggregate tables.
+"""
+
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from repositories.stats import STATS_COLUMNS, StatsRepository
+
+
+def stats_values(stats: Any) -> dict[str, Any]:
+    """Aggregate columns of a stats row (all zero if the row does not exist yet)."""
+    return {
+        column: (float if column.endswith("_total") else int)(getattr(stats, column, 0) or 0)
+        for column in STATS_COLUMNS
+    }
+
+
+class DashboardService:
+    """Service for the finance dashboard."""
+
+    @staticmethod
+    def get_summary(db: Session) -> dict[str, Any]:
+        """
+        Build the dashboard summary: per-category and per-ministry aggregates plus KPIs.
+
+        Reads one row per category and per ministry, independent of the number of proposals.
+        """
+        # Per-category aggregates, read from the incrementally maintained stats table
+        category_stats = []
+        for c, stats in StatsRepository.get_category_summary(db):
+            category_stats.append(
+                {
+                    "id": c.id,
+                    "name": c.name,
+                    "allocated_budget": float(c.allocated_budget),
+                    "remaining_budget": float(c.available_budget),
+                    **stats_values(stats),
+                }
+            )
+
+        # Per-ministry aggregates (requested vs approved)
+        ministry_stats = []
+        for ministry, stats in StatsRepository.get_ministry_summary(db):
+            ministry_stats.append(
+                {
+                    "ministry_id": ministry.id,
+                    "ministry_name": ministry.name,
+                    **stats_values(stats),
+                }
+            )
+
+        # Overall KPIs
+        total_allocated = float(sum(c["allocated_budget"] for c in category_stats))
+        total_remaining = float(sum(c["remaining_budget"] for c in category_stats))
+        total_approved = float(sum(c["approved_total"] for c in category_stats))
+
+        return {
+            "categories": category_stats,
+            "ministries": ministry_stats,
+            "kpis": {
+                "total_allocated": total_allocated,
+                "total_remaining": total_remaining,
+                "total_approved": total_approved,
+            },
+        }
+
+
+class AsyncDashboardService:
+    """Async counterpart of DashboardService, running it through AsyncSession.run_sync."""
+
+    @staticmethod
+    async def get_summary(db: AsyncSession) -> dict[str, Any]:
+        """Build the dashboard summary."""
+        return await db.run_sync(DashboardService.get_summary)
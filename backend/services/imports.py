@@ -0,0 +1,269 @@
+"""
+Service for background contract import jobs.
+Uploads are saved to disk and parsed by a local worker pool, so the request returns
+a job ID at once instead of holding a worker (and the proxy) for the whole parse.
+"""
+
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+
+from database import ImportJob as DBImportJob
+from database import SessionLocal
+from exceptions import ImportJobAlreadyImportedError, ImportJobNotFoundError, ValidationError
+from repositories.imports import ImportJobRepository
+from services.parser import ContractParserService
+from services.proposals import ProposalService
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Jobs queue in-process; their state lives in the database so it survives the worker
+_job_executor: ThreadPoolExecutor | None = None
+_job_executor_lock = threading.Lock()
+
+
+def _get_job_executor() -> ThreadPoolExecutor:
+    global _job_executor
+    with _job_executor_lock:
+        if _job_executor is None:
+            _job_executor = ThreadPoolExecutor(
+                max_workers=max(settings.CONTRACT_JOB_WORKERS, 1), thread_name_prefix="import-job"
+            )
+        return _job_executor
+
+
+def _job_dir() -> str:
+    path = settings.CONTRACT_JOB_DIR or os.path.join(tempfile.gettempdir(), "contract-jobs")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _job_path(job: DBImportJob) -> str:
+    return os.path.join(_job_dir(), f"{job.id}.{job.file_type}")
+
+
+def _worker_id() -> str:
+    # Read per call, as workers may be forked after this module is imported
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _run_job(job_id: str, path: str, file_type: str) -> None:
+    """Parse a saved upload into the job's rows; runs on a job worker thread."""
+    db = SessionLocal()
+    if not ImportJobRepository.mark_started(db, job_id, _worker_id()):
+        db.close()
+        return
+    try:
+        with open(path, "rb") as stream:
+            next_row = 1
+            batch: list[dict[str, Any]] = []
+            try:
+                records = ContractParserService.iter_records(stream, file_type)
+                for draft in ContractParserService.iter_drafts(db, records):
+                    batch.append(draft)
+                    if len(batch) >= settings.CONTRACT_BATCH_SIZE:
+                        ImportJobRepository.add_rows(db, job_id, next_row, batch, stream.tell())
+                        next_row += len(batch)
+                        batch = []
+            except Exception as e:
+                # Keep the rows read before the error, as the streaming parse does
+                db.rollback()
+                ImportJobRepository.add_rows(db, job_id, next_row, batch, stream.tell())
+                ImportJobRepository.mark_finished(db, job_id, f"Failed to parse file: {str(e)}")
+                return
+            ImportJobRepository.add_rows(db, job_id, next_row, batch, stream.tell())
+        ImportJobRepository.mark_finished(db, job_id)
+    except Exception:
+        logger.exception("contract import job %s failed", job_id)
+        db.rollback()
+        ImportJobRepository.mark_finished(db, job_id, "Import failed unexpectedly")
+    finally:
+        db.close()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+class ImportJobService:
+    """Service for submitting and inspecting contract import jobs."""
+
+    @staticmethod
+    def submit_job(db: Session, file: UploadFile, current_user) -> dict[str, Any]:
+        """Save an uploaded contract file and queue it for parsing; returns the job status."""
+        file_type = ContractParserService.check_file_type(file.filename or "")
+        job_id = uuid.uuid4().hex
+        path = os.path.join(_job_dir(), f"{job_id}.{file_type}")
+        with open(path, "wb") as saved:
+            shutil.copyfileobj(file.file, saved)
+
+        job = ImportJobRepository.create(
+            db,
+            {
+                "id": job_id,
+                "owner_id": current_user.id,
+                "filename": file.filename,
+                "file_type": file_type,
+                "file_size": os.path.getsize(path),
+                "worker_id": _worker_id(),
+            },
+        )
+        _get_job_executor().submit(_run_job, job.id, path, file_type)
+        return ImportJobService.describe(job)
+
+    @staticmethod
+    def get_job(db: Session, job_id: str, current_user) -> DBImportJob:
+        """Get a job its owner (or a finance user) may see."""
+        job = ImportJobRepository.get_by_id(db, job_id)
+        if job is None or (current_user.role != "finance" and job.owner_id != current_user.id):
+            raise ImportJobNotFoundError("Import job not found")
+        return job
+
+    @staticmethod
+    def describe(job: DBImportJob) -> dict[str, Any]:
+        """
+        Status of a job, with progress and ETA.
+
+        Progress is the share of the file read so far; the ETA assumes the rest of the
+        file is read at the average rate so far.
+        """
+        progress = job.bytes_read / job.file_size if job.file_size else 0.0
+        if job.status in ("completed", "imported"):
+            progress = 1.0
+
+        eta_seconds = None
+        if job.status == "running" and job.bytes_read and job.started_at is not None:
+            started_at = job.started_at
+            if started_at.tzinfo is None:
+                started_at = started_at.replace(tzinfo=UTC)
+            elapsed = (datetime.now(UTC) - started_at).total_seconds()
+            eta_seconds = round(elapsed * (job.file_size - job.bytes_read) / job.bytes_read, 1)
+
+        return {
+            "id": job.id,
+            "filename": job.filename,
+            "status": job.status,
+            "rows_processed": job.rows_processed,
+            "valid_rows": job.valid_rows,
+            "error_rows": job.error_rows,
+            "progress": round(min(progress, 1.0), 4),
+            "eta_seconds": eta_seconds,
+            "error": job.error,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
+
+    @staticmethod
+    def list_results(
+        db: Session,
+        job_id: str,
+        current_user,
+        after: int | None = None,
+        limit: int | None = None,
+        valid: bool | None = None,
+    ) -> dict[str, Any]:
+        """
+        List the drafts a job has produced so far, in file order, one page at a time.
+
+        Each item is a draft with its 1-based 'row_number'; pass the last one as `after`
+        for the next page ('next_after' is None when there are no more rows yet).
+        `valid` limits the page to valid or to invalid drafts.
+        """
+        if limit is None:
+            limit = settings.CONTRACT_JOB_PAGE_SIZE
+        if limit <= 0 or limit > settings.CONTRACT_JOB_MAX_PAGE_SIZE:
+            raise ValidationError(
+                f"limit must be between 1 and {settings.CONTRACT_JOB_MAX_PAGE_SIZE}"
+            )
+
+        ImportJobService.get_job(db, job_id, current_user)
+        # Fetch one extra row to find out whether another page exists
+        rows = ImportJobRepository.get_rows(db, job_id, after, limit + 1, valid)
+        next_after = rows[limit - 1][0] if len(rows) > limit else None
+        return {
+            "items": [{"row_number": number, **draft} for number, draft in rows[:limit]],
+            "next_after": next_after,
+        }
+
+    @staticmethod
+    def import_proposals(
+        db: Session,
+        current_user,
+        drafts: list[dict[str, Any]] | None = None,
+        job_id: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Create proposals from the given drafts, or from the valid drafts of a completed job.
+
+        Errors are reported by the draft's index in `drafts`, or by row_number for a job.
+        A job is imported once: it is claimed in the transaction of the first chunk,
+        so a concurrent import of the same job waits for that and then finds it taken.
+        """
+        if (drafts is None) == (job_id is None):
+            raise ValidationError("Provide either drafts or job_id")
+        if drafts is not None:
+            if len(drafts) > settings.CONTRACT_IMPORT_MAX_ITEMS:
+                raise ValidationError(
+                    f"At most {settings.CONTRACT_IMPORT_MAX_ITEMS} drafts are allowed per request"
+                )
+            return ProposalService.import_drafts(db, enumerate(drafts), current_user)
+
+        job = ImportJobService.get_job(db, job_id, current_user)
+        if job.status not in ("completed", "imported"):
+            raise ValidationError("Only completed import jobs can be imported")
+        if not ImportJobRepository.claim_import(db, job.id):
+            db.rollback()
+            raise ImportJobAlreadyImportedError("Import job was already imported")
+        result = ProposalService.import_drafts(
+            db, ImportJobService._iter_valid_rows(db, job.id), current_user
+        )
+        # The claim is committed with the first chunk, or here if no draft was valid
+        db.commit()
+        return result
+
+    @staticmethod
+    def _iter_valid_rows(db: Session, job_id: str) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Yield (row_number, draft) for a job's valid drafts, one page at a time."""
+        after = None
+        while True:
+            rows = ImportJobRepository.get_rows(
+                db, job_id, after, settings.CONTRACT_IMPORT_CHUNK_SIZE, valid=True
+            )
+            yield from rows
+            if len(rows) < settings.CONTRACT_IMPORT_CHUNK_SIZE:
+                return
+            after = rows[-1][0]
+
+    @staticmethod
+    def recover_jobs(db: Session) -> None:
+        """
+        Deal with jobs left unfinished by a worker that stopped.
+
+        Jobs are touched by their worker as it parses them, so only jobs of this
+        worker's earlier life (same host and PID) or untouched for
+        CONTRACT_JOB_STALE_SECONDS are recovered; other live workers' jobs are left
+        alone. Running jobs are marked failed, as their partial rows cannot be resumed
+        safely; queued jobs whose file is still on disk are queued again.
+        """
+        stale_before = datetime.now(UTC) - timedelta(seconds=settings.CONTRACT_JOB_STALE_SECONDS)
+        for job in ImportJobRepository.get_orphaned(db, _worker_id(), stale_before):
+            path = _job_path(job)
+            if job.status == "queued" and os.path.exists(path):
+                _get_job_executor().submit(_run_job, job.id, path, job.file_type)
+                continue
+            ImportJobRepository.mark_finished(db, job.id, "Interrupted by a server restart")
+            if os.path.exists(path):
+                os.unlink(path)
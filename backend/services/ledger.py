@@ -0,0 +1,62 @@
+"""
+Service for budget ledger business logic.
+Serves the budget audit trail and point-in-time category balances.
+"""
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from exceptions import CategoryNotFoundError, ValidationError
+from repositories.ledger import LedgerRepository
+from settings import settings
+
+
+class LedgerService:
+    """Service for budget ledger queries and snapshots."""
+
+    @staticmethod
+    def get_balance(db: Session, category_id: int, at: datetime | None = None) -> dict[str, Any]:
+        """
+        Get a category's allocated and remaining budget as of `at` (default: now).
+
+        Naive datetimes are taken as UTC.
+        """
+        if at is None:
+            at = datetime.now(UTC)
+        elif at.tzinfo is None:
+            at = at.replace(tzinfo=UTC)
+        else:
+            at = at.astimezone(UTC)
+
+        balance = LedgerRepository.balance_as_of(db, category_id, at)
+        if balance is None:
+            raise CategoryNotFoundError("Category has no budget history at that time")
+        return balance
+
+    @staticmethod
+    def list_entries(
+        db: Session, category_id: int, after: int | None = None, limit: int | None = None
+    ) -> dict[str, Any]:
+        """
+        List a category's ledger entries oldest first, one page at a time.
+
+        Returns the entries under 'items' and 'next_after', the entry ID to pass as
+        `after` for the next page (None when there are no more entries).
+        """
+        if limit is None:
+            limit = settings.LEDGER_PAGE_SIZE
+        if limit <= 0 or limit > settings.LEDGER_MAX_PAGE_SIZE:
+            raise ValidationError(f"limit must be between 1 and {settings.LEDGER_MAX_PAGE_SIZE}")
+
+        # Fetch one extra entry to find out whether another page exists
+        entries = LedgerRepository.get_entries(db, category_id, after, limit + 1)
+        next_after = entries[limit - 1].id if len(entries) > limit else None
+        return {"items": entries[:limit], "next_after": next_after}
+
+    @staticmethod
+    def take_snapshots(db: Session) -> int:
+        """Snapshot all categories up to BUDGET_SNAPSHOT_LAG_SECONDS ago; returns the count."""
+        cutoff = datetime.now(UTC) - timedelta(seconds=settings.BUDGET_SNAPSHOT_LAG_SECONDS)
+        return LedgerRepository.take_snapshots(db, cutoff)
@@ -3,154 +3,409 @@ Service for contract parsing business logic.
 Handles CSV/JSON file parsing, normalization, and validation.
 """
 
+import codecs
 import csv
 import io
 import json
-from typing import Any
+import logging
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, BinaryIO
 
 from fastapi import HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
-from database import Category as DBCategory
-from database import Ministry as DBMinistry
 from repositories.categories import CategoryRepository
 from repositories.ministries import MinistryRepository
 from repositories.proposals import ProposalRepository
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Large uploads are normalized in a process pool, as field extraction is pure CPU work
+_parse_executor: ProcessPoolExecutor | None = None
+_parse_executor_lock = threading.Lock()
+
+
+def iter_csv_records(stream: BinaryIO) -> Iterator[dict[str, Any]]:
+    """Yield CSV rows as dicts, decoding the byte stream as it is read."""
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    try:
+        yield from csv.DictReader(text)
+    finally:
+        # Hand the underlying stream back to its owner instead of closing it
+        text.detach()
+
+
+def iter_json_records(stream: BinaryIO, chunk_size: int) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    The stream is read chunk_size bytes at a time and only the unparsed tail of the
+    input is kept in memory. A top-level value that is not an array is yielded as a
+    single record.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> None:
+        nonlocal buffer, pos, eof
+        chunk = stream.read(chunk_size)
+        buffer = buffer[pos:] + utf8.decode(chunk, final=not chunk)
+        pos = 0
+        eof = not chunk
+
+    def peek() -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer) or eof:
+                return buffer[pos] if pos < len(buffer) else ""
+            fill()
+
+    def decode() -> Any:
+        """Decode the value at pos, reading more input until it is complete."""
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            # A value ending exactly at the buffer edge (e.g. a number) may continue
+            if end == len(buffer) and not eof:
+                fill()
+                continue
+            pos = end
+            return value
+
+    if peek() != "[":
+        value = decode()
+        if peek():
+            raise ValueError("Extra data after JSON value")
+        yield value
+        return
+
+    pos += 1
+    if peek() == "]":
+        pos += 1
+    else:
+        while True:
+            yield decode()
+            separator = peek()
+            pos += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                raise ValueError("Expected ',' or ']' in JSON array")
+    if peek():
+        raise ValueError("Extra data after JSON array")
+
+
+def _extract_chunk(records: list[Any]) -> tuple[list[dict[str, Any]], Exception | None]:
+    """
+    Run extract_fields over a chunk of records; executed in a pool worker.
+
+    Stops at the first record that fails and returns the fields extracted before it
+    together with the error, so the caller can fail at the same row as inline parsing.
+    """
+    extracted = []
+    try:
+        for record in records:
+            extracted.append(ContractParserService.extract_fields(record))
+    except Exception as e:
+        return extracted, e
+    return extracted, None
+
+
+def _get_parse_executor() -> ProcessPoolExecutor:
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            _parse_executor = ProcessPoolExecutor(max_workers=settings.CONTRACT_PARSE_WORKERS)
+        return _parse_executor
+
+
+def _iter_chunk(chunk: list[Any], future: Future | None) -> Iterator[dict[str, Any]]:
+    """Yield the fields of a chunk from its pool task (or inline without one), then raise its error."""
+    global _parse_executor
+    if future is None:
+        extracted, error = _extract_chunk(chunk)
+    else:
+        try:
+            extracted, error = future.result()
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool next time and finish this chunk inline
+            logger.exception("contract parsing pool broke, recreating")
+            with _parse_executor_lock:
+                _parse_executor = None
+            extracted, error = _extract_chunk(chunk)
+    yield from extracted
+    if error is not None:
+        raise error
 
 
 class ContractParserService:
     """Service for parsing contract files (CSV/JSON)."""
 
     @staticmethod
-    def parse_contract(db: Session, file: UploadFile) -> dict[str, list[dict[str, Any]]]:
+    def check_file_type(filename: str) -> str:
+        """Return 'json' or 'csv' for a supported contract file name."""
+        lowered = filename.lower()
+        if lowered.endswith(".json"):
+            return "json"
+        if lowered.endswith(".csv"):
+            return "csv"
+        raise HTTPException(status_code=400, detail="Unsupported file type. Use .json or .csv")
+
+    @staticmethod
+    def iter_records(stream: BinaryIO, file_type: str) -> Iterator[dict[str, Any]]:
+        """Yield raw records from a contract file without loading it into memory."""
+        if file_type == "json":
+            return iter_json_records(stream, settings.CONTRACT_CHUNK_SIZE)
+        return iter_csv_records(stream)
+
+    @staticmethod
+    def extract_fields(record: dict[str, Any]) -> dict[str, Any]:
+        """Normalize field names and the amount of a raw record (no database access)."""
+        # Normalize field names (support multiple variations)
+        ministry_name = record.get("ministry") or record.get("dept") or record.get("ministry_name")
+        category_name = (
+            record.get("category") or record.get("category_name") or record.get("dept_category")
+        )
+        title = record.get("title") or record.get("project") or record.get("subject")
+        description = record.get("description") or record.get("details")
+
+        # Normalize amount (try multiple field names)
+        amount = record.get("requested_amount")
+        if amount in (None, ""):
+            amount = record.get("amount") or record.get("value") or record.get("requested")
+
+        # Parse amount to float
+        try:
+            requested_amount = float(amount) if amount not in (None, "") else None
+        except (ValueError, TypeError):
+            requested_amount = None
+
+        return {
+            "ministry_name": ministry_name,
+            "category_name": category_name,
+            "title": title,
+            "description": description,
+            "requested_amount": requested_amount,
+        }
+
+    @staticmethod
+    def iter_fields(records: Iterable[Any]) -> Iterator[dict[str, Any]]:
         """
-        Parse a contract file (CSV or JSON) and return normalized draft proposals.
+        Yield extract_fields of each raw record, in order.
 
-        Returns:
-            Dictionary with 'drafts' key containing list of normalized proposal records
-            with validation errors flagged.
+        With CONTRACT_PARSE_WORKERS > 0, records are cut into chunks of
+        CONTRACT_PARSE_CHUNK_ROWS that are normalized in the parse process pool while
+        the file is still being read. At most two chunks per worker are in flight, so
+        memory stays bounded, and results are yielded in submission order. A file
+        that fits in one chunk is normalized inline.
         """
-        filename = file.filename or ""
-        content = file.file.read()
-        drafts = []
+        if settings.CONTRACT_PARSE_WORKERS <= 0:
+            for record in records:
+                yield ContractParserService.extract_fields(record)
+            return
 
-        # Mapping functions
-        def map_category_id(category_name: str | None) -> int | None:
-            """Map category name to ID (case-insensitive, partial match)."""
-            if not category_name:
-                return None
+        window = settings.CONTRACT_PARSE_WORKERS * 2
+        pending: deque[tuple[list[Any], Future | None]] = deque()
+        chunk: list[Any] = []
+        iterator = iter(records)
+        while True:
+            try:
+                record = next(iterator)
+            except StopIteration:
+                break
+            except Exception:
+                # Emit the rows read before a parse error, then report it
+                pending.append((chunk, None))
+                while pending:
+                    yield from _iter_chunk(*pending.popleft())
+                raise
+            chunk.append(record)
+            if len(chunk) >= settings.CONTRACT_PARSE_CHUNK_ROWS:
+                pending.append((chunk, _get_parse_executor().submit(_extract_chunk, chunk)))
+                chunk = []
+                if len(pending) >= window:
+                    yield from _iter_chunk(*pending.popleft())
+        pending.append((chunk, None))
+        while pending:
+            yield from _iter_chunk(*pending.popleft())
 
-            # Try exact match first
-            category = CategoryRepository.get_by_name(db, category_name)
-            if category:
-                return category.id
+    @staticmethod
+    def resolve_drafts(db: Session, batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Turn a batch of extracted records into draft proposals.
 
-            # Try partial match
-            category = (
-                db.query(DBCategory).filter(DBCategory.name.ilike(f"%{category_name}%")).first()
-            )
-            return category.id if category else None
+        Category and ministry names are resolved for the whole batch at once (exact
+        match, then partial match; unknown ministries are created) and duplicates are
+        checked with a single bulk query, so a batch costs a few queries instead of
+        several per row.
+        """
 
-        def map_ministry_id(ministry_name: str | None) -> int | None:
-            """Map ministry name to ID (case-insensitive, creates if not found)."""
-            if not ministry_name:
-                return None
+        def lookup_key(name: Any) -> str | None:
+            return str(name).strip().lower() if name else None
 
-            # Try exact match first
-            ministry = MinistryRepository.get_by_name(db, ministry_name)
-            if ministry:
-                return ministry.id
+        category_ids = CategoryRepository.resolve_names(
+            db, {key for f in batch if (key := lookup_key(f["category_name"]))}
+        )
 
-            # Try partial match
-            ministry = (
-                db.query(DBMinistry).filter(DBMinistry.name.ilike(f"%{ministry_name}%")).first()
-            )
-            if ministry:
-                return ministry.id
-
-            # Create new ministry if not found
-            ministry = MinistryRepository.find_or_create(db, ministry_name)
-            return ministry.id
-
-        def normalize_record(record: dict[str, Any]) -> dict[str, Any]:
-            """Normalize a record from contract file into proposal draft format."""
-            # Normalize field names (support multiple variations)
-            ministry_name = (
-                record.get("ministry") or record.get("dept") or record.get("ministry_name")
-            )
-            category_name = (
-                record.get("category") or record.get("category_name") or record.get("dept_category")
-            )
-            title = record.get("title") or record.get("project") or record.get("subject")
-            description = record.get("description") or record.get("details")
+        ministry_keys = list(
+            dict.fromkeys(key for f in batch if (key := lookup_key(f["ministry_name"])))
+        )
+        ministry_ids = MinistryRepository.resolve_names(db, ministry_keys)
 
-            # Normalize amount (try multiple field names)
-            amount = record.get("requested_amount")
-            if amount in (None, ""):
-                amount = record.get("amount") or record.get("value") or record.get("requested")
+        # Create unknown ministries; a later name contained in one created earlier in
+        # the batch reuses it, as the row-by-row partial match used to
+        new_names: list[str] = []
+        for key in ministry_keys:
+            if key in ministry_ids:
+                continue
+            if not any(key in name for name in new_names):
+                new_names.append(key)
+        if new_names:
+            originals = {
+                lookup_key(f["ministry_name"]): str(f["ministry_name"]).strip()
+                for f in reversed(batch)
+                if f["ministry_name"]
+            }
+            created = MinistryRepository.create_many(db, [originals[name] for name in new_names])
+            for key in ministry_keys:
+                if key not in ministry_ids:
+                    match = next(name for name in new_names if key in name)
+                    ministry_ids[key] = created[match]
 
-            # Parse amount to float
-            try:
-                requested_amount = float(amount) if amount not in (None, "") else None
-            except (ValueError, TypeError):
-                requested_amount = None
+        resolved = [
+            (
+                fields,
+                category_ids.get(lookup_key(fields["category_name"]) or ""),
+                ministry_ids.get(lookup_key(fields["ministry_name"]) or ""),
+            )
+            for fields in batch
+        ]
 
-            # Map to IDs
-            category_id = map_category_id(category_name)
-            ministry_id = map_ministry_id(ministry_name)
+        # Check for duplicates in one query
+        duplicate_keys = {
+            (ministry_id, fields["title"], fields["requested_amount"])
+            for fields, _, ministry_id in resolved
+            if ministry_id and fields["title"] and fields["requested_amount"] is not None
+        }
+        duplicates = (
+            ProposalRepository.find_duplicates(db, duplicate_keys) if duplicate_keys else set()
+        )
+
+        drafts = []
+        for fields, category_id, ministry_id in resolved:
+            requested_amount = fields["requested_amount"]
 
             # Validate and collect errors
             errors = []
-            if not ministry_name:
+            if not fields["ministry_name"]:
                 errors.append("missing ministry")
-            if not title:
+            if not fields["title"]:
                 errors.append("missing title")
             if requested_amount is None or requested_amount <= 0:
                 errors.append("invalid amount")
             if category_id is None:
                 errors.append("unknown category")
+            if (ministry_id, fields["title"], requested_amount) in duplicates:
+                errors.append("possible duplicate")
 
-            # Check for duplicates
-            if ministry_id and title and requested_amount is not None:
-                duplicate = ProposalRepository.check_duplicate(
-                    db, ministry_id, title, requested_amount
-                )
-                if duplicate:
-                    errors.append("possible duplicate")
-
-            return {
-                "ministry_name": ministry_name,
-                "ministry_id": ministry_id,
-                "category_id": category_id,
-                "category_name": category_name,
-                "title": title,
-                "description": description,
-                "requested_amount": requested_amount,
-                "errors": errors,
-                "valid": len(errors) == 0,
-            }
+            drafts.append(
+                {
+                    "ministry_name": fields["ministry_name"],
+                    "ministry_id": ministry_id,
+                    "category_id": category_id,
+                    "category_name": fields["category_name"],
+                    "title": fields["title"],
+                    "description": fields["description"],
+                    "requested_amount": requested_amount,
+                    "errors": errors,
+                    "valid": len(errors) == 0,
+                }
+            )
+        return drafts
 
-        # Parse file based on extension
+    @staticmethod
+    def iter_drafts(db: Session, records: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """Yield draft proposals for raw records, resolving them CONTRACT_BATCH_SIZE at a time."""
+        batch: list[dict[str, Any]] = []
         try:
-            if filename.lower().endswith(".json"):
-                data = json.loads(content.decode("utf-8"))
-                records = data if isinstance(data, list) else [data]
-                for record in records:
-                    drafts.append(normalize_record(record))
-            elif filename.lower().endswith(".csv"):
-                text = content.decode("utf-8")
-                reader = csv.DictReader(io.StringIO(text))
-                for record in reader:
-                    drafts.append(normalize_record(record))
-            else:
-                raise HTTPException(
-                    status_code=400, detail="Unsupported file type. Use .json or .csv"
-                )
+            for fields in ContractParserService.iter_fields(records):
+                batch.append(fields)
+                if len(batch) >= settings.CONTRACT_BATCH_SIZE:
+                    yield from ContractParserService.resolve_drafts(db, batch)
+                    batch = []
+        except Exception:
+            # Emit the rows read before a parse error, then report it
+            if batch:
+                yield from ContractParserService.resolve_drafts(db, batch)
+            raise
+        if batch:
+            yield from ContractParserService.resolve_drafts(db, batch)
+
+    @staticmethod
+    def parse_contract(db: Session, file: UploadFile) -> dict[str, list[dict[str, Any]]]:
+        """
+        Parse a contract file (CSV or JSON) and return normalized draft proposals.
+
+        Returns:
+            Dictionary with 'drafts' key containing list of normalized proposal records
+            with validation errors flagged.
+        """
+        file_type = ContractParserService.check_file_type(file.filename or "")
+
+        try:
+            records = ContractParserService.iter_records(file.file, file_type)
+            drafts = list(ContractParserService.iter_drafts(db, records))
         except HTTPException:
             raise
         except Exception as e:
-            raise HTTPException(
-                status_code=400, detail=f"Failed to parse file: {str(e)}"
-            ) from e
+            raise HTTPException(status_code=400, detail=f"Failed to parse file: {str(e)}") from e
 
         return {"drafts": drafts}
+
+    @staticmethod
+    def stream_contract(db: Session, file: UploadFile) -> Iterator[str]:
+        """
+        Parse a contract file and yield one NDJSON line per draft proposal.
+
+        The file is read in chunks and drafts are emitted as they are produced, so
+        memory use does not grow with the file size. Unsupported file types raise
+        before anything is streamed; a parse error part-way through is reported as a
+        final {"error": ...} line since the response status has already been sent.
+        """
+        file_type = ContractParserService.check_file_type(file.filename or "")
+
+        # FastAPI closes uploaded files and yield-dependencies as soon as the endpoint
+        # returns, before a streaming body is sent, so take ownership of both here.
+        stream = file.file
+        file.file = io.BytesIO()
+
+        def generate() -> Iterator[str]:
+            try:
+                records = ContractParserService.iter_records(stream, file_type)
+                for draft in ContractParserService.iter_drafts(db, records):
+                    yield json.dumps(draft) + "\n"
+            except Exception as e:
+                yield json.dumps({"error": f"Failed to parse file: {str(e)}"}) + "\n"
+            finally:
+                stream.close()
+                db.close()
+
+        return generate()
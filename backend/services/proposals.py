@@ -3,9 +3,18 @@ Service for proposal business logic.
 Handles proposal creation, updates, validation, and queries.
 """
 
+import base64
+import binascii
+import json
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from database import Proposal as DBProposal
+from events import broker, emit, proposal_event
 from exceptions import (
     CategoryNotFoundError,
     InvalidProposalStatusError,
@@ -13,10 +22,13 @@ from exceptions import (
     ProposalNotFoundError,
     ValidationError,
 )
+from models import Proposal as ProposalModel
 from models import ProposalCreate, ProposalUpdate
 from repositories.categories import CategoryRepository
 from repositories.ministries import MinistryRepository
-from repositories.proposals import ProposalRepository
+from repositories.proposals import PROJECTABLE_COLUMNS, ProposalRepository
+from repositories.stats import StatsRepository, proposal_snapshot
+from settings import settings
 
 
 class ProposalService:
@@ -32,6 +44,77 @@ class ProposalService:
         """List proposals with optional filters."""
         return ProposalRepository.get_all(db, ministry_id, category_id, status)
 
+    @staticmethod
+    def list_proposal_rows(
+        db: Session,
+        ministry_id: int | None = None,
+        category_id: int | None = None,
+        status: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """List proposals like list_proposals, as response-ready dicts (no ORM entities)."""
+        return ProposalRepository.get_all_rows(db, ministry_id, category_id, status)
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, proposal_id: int) -> str:
+        """Encode the (created_at, id) of a row into an opaque continuation token."""
+        raw = json.dumps([created_at.isoformat(), proposal_id]).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, int]:
+        """Decode a continuation token produced by encode_cursor."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, proposal_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), int(proposal_id)
+        except (binascii.Error, ValueError, TypeError) as e:
+            raise ValidationError("Invalid cursor") from e
+
+    @staticmethod
+    def list_proposals_page(
+        db: Session,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+        ministry_id: int | None = None,
+        category_id: int | None = None,
+        status: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        List one page of proposals, newest first.
+
+        Returns the projected rows under 'items' and an opaque 'next_cursor' that
+        continues after the last row (None when there are no more rows).
+        """
+        if limit is None:
+            limit = settings.PROPOSALS_PAGE_SIZE
+        if limit <= 0 or limit > settings.PROPOSALS_MAX_PAGE_SIZE:
+            raise ValidationError(
+                f"limit must be between 1 and {settings.PROPOSALS_MAX_PAGE_SIZE}"
+            )
+
+        if fields:
+            unknown = [name for name in fields if name not in PROJECTABLE_COLUMNS]
+            if unknown:
+                raise ValidationError(f"Unknown fields: {', '.join(unknown)}")
+
+        after = ProposalService.decode_cursor(cursor) if cursor else None
+
+        # Fetch one extra row to find out whether another page exists
+        rows = ProposalRepository.get_page(
+            db, limit + 1, after, fields, ministry_id, category_id, status
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = ProposalService.encode_cursor(last["created_at"], last["id"])
+
+        if fields:
+            rows = [{name: row[name] for name in fields} for row in rows]
+
+        return {"items": rows, "next_cursor": next_cursor}
+
     @staticmethod
     def get_proposal(db: Session, proposal_id: int) -> DBProposal:
         """Get a proposal by ID."""
@@ -114,7 +197,132 @@ class ProposalService:
             "status": "Pending",
         }
 
-        return ProposalRepository.create(db, proposal_data)
+        snapshot = {**proposal_data, "approved_amount": None}
+        StatsRepository.record_change(db, None, snapshot)
+        proposal = ProposalRepository.create(db, proposal_data)
+        # create commits, and the ID is only known after the INSERT, so publish directly
+        broker.publish([proposal_event(proposal.id, "created", snapshot)])
+        return proposal
+
+    @staticmethod
+    def import_drafts(
+        db: Session, drafts: Iterable[tuple[int, dict[str, Any]]], current_user
+    ) -> dict[str, Any]:
+        """
+        Create proposals from many (index, draft) pairs, CONTRACT_IMPORT_CHUNK_SIZE per transaction.
+
+        Drafts are checked with the rules of create_proposal using a few set-based
+        lookups per chunk, and each chunk's valid drafts are inserted with one
+        multi-row INSERT and committed. Drafts that fail a check are reported under
+        'errors' with their index and skipped. A database error stops the import;
+        chunks committed before it stay committed.
+
+        Returns:
+            Dictionary with the 'created' count and new 'ids' in draft order, and the
+            'failed' count with per-draft 'errors'.
+        """
+        ids: list[int] = []
+        errors: list[dict[str, Any]] = []
+        chunk: list[tuple[int, dict[str, Any]]] = []
+        for item in drafts:
+            chunk.append(item)
+            if len(chunk) >= settings.CONTRACT_IMPORT_CHUNK_SIZE:
+                ProposalService._import_chunk(db, chunk, current_user, ids, errors)
+                chunk = []
+        if chunk:
+            ProposalService._import_chunk(db, chunk, current_user, ids, errors)
+        return {"created": len(ids), "ids": ids, "failed": len(errors), "errors": errors}
+
+    @staticmethod
+    def _import_chunk(
+        db: Session,
+        chunk: list[tuple[int, dict[str, Any]]],
+        current_user,
+        ids: list[int],
+        errors: list[dict[str, Any]],
+    ) -> None:
+        """Validate and insert one chunk of drafts in its own transaction."""
+        category_ids = CategoryRepository.existing_ids(
+            db, {draft["category_id"] for _, draft in chunk if draft.get("category_id")}
+        )
+
+        # Ministry users always file under their own ministry; finance users name any
+        # ministry, and ministries named for the first time are created
+        own_ministry_id = current_user.ministry_id if current_user.role == "ministry" else None
+        ministry_ids: set[int] = set()
+        ministry_names: dict[str, int] = {}
+        if current_user.role == "ministry":
+            if own_ministry_id:
+                ministry_ids = MinistryRepository.existing_ids(db, [own_ministry_id])
+        else:
+            ministry_ids = MinistryRepository.existing_ids(
+                db, {draft["ministry_id"] for _, draft in chunk if draft.get("ministry_id")}
+            )
+            names = {
+                name.strip().lower(): name.strip()
+                for _, draft in chunk
+                if not draft.get("ministry_id") and (name := draft.get("ministry_name") or "").strip()
+            }
+            ministry_names = MinistryRepository.match_names(db, names)
+            new_names = [original for key, original in names.items() if key not in ministry_names]
+            if new_names:
+                ministry_names.update(MinistryRepository.create_many(db, new_names))
+
+        rows: list[dict[str, Any]] = []
+        for index, draft in chunk:
+            problems = []
+            ministry_id = draft.get("ministry_id")
+            if current_user.role == "ministry":
+                if not own_ministry_id:
+                    problems.append("You must be assigned to a ministry to create proposals")
+                elif ministry_id and ministry_id != own_ministry_id:
+                    problems.append("You can only create proposals for your own ministry")
+                elif own_ministry_id not in ministry_ids:
+                    problems.append("Your assigned ministry does not exist")
+                ministry_id = own_ministry_id
+            elif ministry_id:
+                if ministry_id not in ministry_ids:
+                    problems.append("Ministry does not exist")
+            elif (draft.get("ministry_name") or "").strip():
+                ministry_id = ministry_names[draft["ministry_name"].strip().lower()]
+            else:
+                problems.append("Either ministry_id or ministry_name is required")
+
+            title = draft.get("title")
+            description = draft.get("description")
+            requested_amount = draft.get("requested_amount")
+            if draft.get("category_id") not in category_ids:
+                problems.append("Category does not exist")
+            if not title or len(title) > 200:
+                problems.append("Title must be 1 to 200 characters")
+            if description and len(description) > 1000:
+                problems.append("Description must be at most 1000 characters")
+            if requested_amount is None or requested_amount <= 0:
+                problems.append("Requested amount must be greater than 0")
+
+            if problems:
+                errors.append({"index": index, "errors": problems})
+                continue
+            rows.append(
+                {
+                    "ministry_id": ministry_id,
+                    "category_id": draft["category_id"],
+                    "title": title,
+                    "description": description,
+                    "requested_amount": requested_amount,
+                    "status": "Pending",
+                }
+            )
+
+        if not rows:
+            return
+        created = ProposalRepository.create_many(db, rows)
+        snapshots = [{**row, "approved_amount": None} for row in rows]
+        StatsRepository.record_changes(db, [(None, snapshot) for snapshot in snapshots])
+        for proposal_id, snapshot in zip(created, snapshots, strict=True):
+            emit(db, *proposal_event(proposal_id, "created", snapshot))
+        db.commit()
+        ids.extend(created)
 
     @staticmethod
     def update_proposal(db: Session, proposal_id: int, payload: ProposalUpdate, current_user) -> DBProposal:
@@ -175,6 +383,10 @@ class ProposalService:
         if payload.status is not None and payload.status != "Pending":
             raise ValidationError("Status changes are not allowed")
 
+        before = proposal_snapshot(proposal)
+        after = {**before, **update_data}
+        StatsRepository.record_change(db, before, after)
+        emit(db, *proposal_event(proposal.id, "updated", after))
         return ProposalRepository.update(db, proposal, update_data)
 
     @staticmethod
@@ -200,4 +412,74 @@ class ProposalService:
             if user_ministry_id != proposal_ministry_id:
                 raise ValidationError("You can only delete proposals from your own ministry")
 
+        before = proposal_snapshot(proposal)
+        StatsRepository.record_change(db, before, None)
+        emit(db, *proposal_event(proposal.id, "deleted", before))
         ProposalRepository.delete(db, proposal)
+
+
+class AsyncProposalService:
+    """
+    Async counterpart of ProposalService for handlers using an AsyncSession.
+
+    Each method runs the sync service through AsyncSession.run_sync, so the query logic
+    is shared. Results are converted to response models inside run_sync because
+    relationships cannot be lazily loaded outside it.
+    """
+
+    @staticmethod
+    async def list_proposals(
+        db: AsyncSession,
+        ministry_id: int | None = None,
+        category_id: int | None = None,
+        status: str | None = None,
+    ) -> list[ProposalModel]:
+        """List proposals with optional filters."""
+
+        def run(session: Session) -> list[ProposalModel]:
+            rows = ProposalService.list_proposals(session, ministry_id, category_id, status)
+            return [ProposalModel.model_validate(row) for row in rows]
+
+        return await db.run_sync(run)
+
+    @staticmethod
+    async def list_proposal_rows(
+        db: AsyncSession,
+        ministry_id: int | None = None,
+        category_id: int | None = None,
+        status: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """List proposals as response-ready dicts."""
+        return await db.run_sync(
+            ProposalService.list_proposal_rows, ministry_id, category_id, status
+        )
+
+    @staticmethod
+    async def list_proposals_page(
+        db: AsyncSession,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+        ministry_id: int | None = None,
+        category_id: int | None = None,
+        status: str | None = None,
+    ) -> dict[str, Any]:
+        """List one page of proposals, newest first."""
+        return await db.run_sync(
+            ProposalService.list_proposals_page,
+            limit,
+            cursor,
+            fields,
+            ministry_id,
+            category_id,
+            status,
+        )
+
+    @staticmethod
+    async def get_proposal(db: AsyncSession, proposal_id: int) -> ProposalModel:
+        """Get a proposal by ID."""
+
+        def run(session: Session) -> ProposalModel:
+            return ProposalModel.model_validate(ProposalService.get_proposal(session, proposal_id))
+
+        return await db.run_sync(run)
@@ -22,9 +22,117 @@ class Settings(BaseSettings):
     )
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Authenticated users are cached per token for this long (0 disables the cache)
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    # bcrypt cost factor; existing hashes are upgraded on the next successful login
+    BCRYPT_ROUNDS: int = 12
+    # Worker processes for bcrypt (0 hashes on the calling thread)
+    PASSWORD_HASH_WORKERS: int = 2
+    # Hash/verify calls allowed to queue or run at once before answering 429
+    PASSWORD_HASH_MAX_PENDING: int = 32
 
     # Database
     DATABASE_URL: str = "sqlite:///./government_spending.db"
+    # Connection pool sizing (ignored for in-memory SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 3600
+    # Connection liveness check on checkout: "always" (a round trip per checkout),
+    # "idle" (only after DB_POOL_PRE_PING_IDLE_SECONDS unused) or "never"
+    DB_POOL_PRE_PING: str = "always"
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30.0
+    # Serve the hot read/approval routes from async handlers on an AsyncEngine
+    # (aiosqlite for SQLite, asyncpg for PostgreSQL)
+    DATABASE_ASYNC: bool = False
+    # Optional explicit async URL; derived from DATABASE_URL when empty
+    ASYNC_DATABASE_URL: str = ""
+    # SQLite production mode: WAL journaling and tuned pragmas on every connection,
+    # with writes serialized through a single in-process writer lock
+    SQLITE_TUNING: bool = False
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+
+    # Count each request's SQL statements and database time into per-route histograms
+    # and a Server-Timing response header
+    QUERY_METRICS: bool = True
+    # Statements slower than this are logged, with their parameters redacted (0 disables)
+    SLOW_QUERY_MS: float = 500.0
+
+    # On-demand CPU and allocation profiling of a worker (/debug/profile/*, Finance
+    # users only). Off by default: the routes answer 404 and nothing is sampled or traced
+    PROFILING_ENABLED: bool = False
+    PROFILING_MAX_SECONDS: float = 60.0
+    # Frames tracemalloc records per allocation while an allocation profile runs
+    PROFILING_TRACEMALLOC_FRAMES: int = 1
+
+    # Answer If-None-Match on the polled list endpoints from in-process version counters.
+    # Off by default: with several worker processes, one that did not see a write would
+    # answer 304 for changed data. Enable only when the server runs one worker process
+    ETAGS_ENABLED: bool = False
+
+    # Serve the large list endpoints from column tuples encoded with orjson, skipping
+    # per-row response model validation (same JSON bytes as the default path)
+    FAST_JSON_RESPONSES: bool = False
+
+    # Server-sent event stream of proposal and budget changes (/events). The broker
+    # keeps the last EVENT_BUFFER_SIZE events for clients resuming with Last-Event-ID;
+    # clients that fall further behind are told to reload. Streams are capped in total
+    # and per user
+    EVENT_BUFFER_SIZE: int = 1000
+    EVENT_STREAM_MAX_CLIENTS: int = 200
+    EVENT_STREAM_MAX_CLIENTS_PER_USER: int = 3
+    EVENT_STREAM_BATCH_SIZE: int = 100
+    EVENT_STREAM_HEARTBEAT_SECONDS: float = 15.0
+
+    # Proposal listing pagination
+    PROPOSALS_PAGE_SIZE: int = 50
+    PROPOSALS_MAX_PAGE_SIZE: int = 500
+
+    # Single approvals: "lock" holds the category row lock (SELECT ... FOR UPDATE) while
+    # validating; "optimistic" uses conditional UPDATEs and retries on conflict
+    APPROVAL_STRATEGY: str = "lock"
+    APPROVAL_MAX_RETRIES: int = 3
+
+    # Split each category's remaining budget over this many sub-ledger rows that
+    # approvals decrement independently (0 or 1 disables sharding); implies the
+    # optimistic approval path
+    BUDGET_SHARDS: int = 0
+
+    # Budget ledger: audit page size and how far behind "now" snapshots stop, leaving
+    # room for transactions that have not committed their ledger entries yet
+    LEDGER_PAGE_SIZE: int = 100
+    LEDGER_MAX_PAGE_SIZE: int = 1000
+    BUDGET_SNAPSHOT_LAG_SECONDS: int = 60
+
+    # Maximum number of decisions accepted by one bulk approve/reject request
+    BULK_DECISION_MAX_ITEMS: int = 5000
+
+    # Contract uploads are read in chunks of this many bytes when streaming
+    CONTRACT_CHUNK_SIZE: int = 64 * 1024
+    # Number of parsed rows whose names and duplicates are resolved together
+    CONTRACT_BATCH_SIZE: int = 1000
+    # Worker processes that normalize rows of large uploads (0 normalizes inline)
+    CONTRACT_PARSE_WORKERS: int = 0
+    # Rows handed to a parse worker at a time
+    CONTRACT_PARSE_CHUNK_ROWS: int = 5000
+
+    # Background contract import jobs: worker threads, where uploads wait to be parsed
+    # (empty uses a directory under the system temp dir) and result page sizes
+    CONTRACT_JOB_WORKERS: int = 2
+    CONTRACT_JOB_DIR: str = ""
+    CONTRACT_JOB_PAGE_SIZE: int = 500
+    CONTRACT_JOB_MAX_PAGE_SIZE: int = 5000
+    # Unfinished jobs whose worker has not touched them for this long are taken to be
+    # orphaned and recovered by the next worker to start. Must exceed the time to parse
+    # one CONTRACT_BATCH_SIZE batch, as running jobs are touched once per batch
+    CONTRACT_JOB_STALE_SECONDS: float = 300.0
+    # Drafts imported as proposals per INSERT and transaction, and per request
+    CONTRACT_IMPORT_CHUNK_SIZE: int = 1000
+    CONTRACT_IMPORT_MAX_ITEMS: int = 50000
 
     # Note: CORS_ORIGINS is NOT defined here to avoid pydantic-settings JSON parsing
     # It will be read directly from os.getenv() in main.py
@@ -1,6 +1,8 @@
 import os
 import sys
 import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
@@ -14,7 +16,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from auth import get_password_hash
-from database import Base, get_db
+from database import Base, QueryStats, enable_query_tracking, get_db, observe_request_queries
 from main import app
 
 # Create test database using a secure temporary file
@@ -23,6 +25,8 @@ TEST_DB_FILE = tmp_db.name
 tmp_db.close()
 TEST_ENGINE = create_engine(f"sqlite:///{TEST_DB_FILE}", connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=TEST_ENGINE)
+# Track statements like the app engine does, so requests report their queries
+enable_query_tracking(TEST_ENGINE)
 
 
 @pytest.fixture(scope="session")
@@ -61,6 +65,52 @@ def client(test_db):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def etags_enabled(monkeypatch):
+    """Turn ETags on for one test"""
+    from settings import settings
+
+    monkeypatch.setattr(settings, "ETAGS_ENABLED", True)
+
+
+@pytest.fixture(scope="function")
+def query_budget(monkeypatch):
+    """
+    Context manager failing the test when a request inside it runs more than max_queries statements.
+
+    Reads the QueryStats that QueryMetricsMiddleware reports for each request (the
+    count in its Server-Timing header and per-route histogram, plus statements run
+    while streaming), from a cold user cache. Wrap a single request:
+
+        with query_budget(3):
+            client.get("/proposals")
+    """
+    import main
+
+    @contextmanager
+    def budget(max_queries: int) -> Iterator[list[tuple[str, str, QueryStats]]]:
+        from auth import user_cache
+
+        requests: list[tuple[str, str, QueryStats]] = []
+        user_cache.clear()
+
+        def observe(method: str, handler: str, stats: QueryStats) -> None:
+            requests.append((method, handler, stats))
+            observe_request_queries(method, handler, stats)
+
+        with monkeypatch.context() as patch:
+            patch.setattr(main, "observe_request_queries", observe)
+            yield requests
+        assert requests, "No request was made inside the query budget"
+        for method, handler, stats in requests:
+            assert stats.count <= max_queries, (
+                f"{method} {handler} ran {stats.count} queries over a budget of {max_queries}; "
+                f"slowest: {stats.slowest_statement}"
+            )
+
+    return budget
+
+
 @pytest.fixture(scope="function")
 def sample_ministry(test_db):
     """Create a sample ministry for testing"""
@@ -156,3 +206,13 @@ def sample_proposal(test_db, sample_ministry, sample_category):
     test_db.commit()
     test_db.refresh(proposal)
     return proposal
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    """Tokens are deterministic per user and second, so never share cached users between tests"""
+    from auth import user_cache
+
+    user_cache.clear()
+    yield
+    user_cache.clear()
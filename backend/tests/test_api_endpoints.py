@@ -213,6 +213,122 @@ class TestCategoryEndpoints:
         assert len(data) >= 1
         assert any(c["name"] == "Test Category" for c in data)
 
+    def test_get_categories_includes_budget_shards(self, client, test_db, sample_category):
+        """Test the remaining budget reported includes budget held in shards"""
+        from database import CategoryBudgetShard as DBCategoryBudgetShard
+
+        sample_category.remaining_budget = 400000.0
+        test_db.add_all(
+            DBCategoryBudgetShard(category_id=sample_category.id, shard=shard, remaining_budget=150000.0)
+            for shard in range(4)
+        )
+        test_db.commit()
+
+        category = next(c for c in client.get("/categories").json() if c["id"] == sample_category.id)
+        assert category["remaining_budget"] == 1000000.0
+        assert client.get(f"/categories/{sample_category.id}").json()["remaining_budget"] == 1000000.0
+
+    def test_budget_ledger_and_point_in_time_balance(
+        self, client, test_db, auth_headers, finance_headers, sample_ministry, monkeypatch
+    ):
+        """Test budget movements are recorded and balances are answered as of any entry"""
+        from services.ledger import LedgerService
+        from settings import settings
+
+        category = client.post(
+            "/categories", json={"name": "Ledger", "allocated_budget": 1000.0}, headers=finance_headers
+        ).json()
+        proposal = client.post(
+            "/proposals",
+            json={"category_id": category["id"], "title": "Spend", "requested_amount": 300.0},
+            headers=auth_headers,
+        ).json()
+        client.post(f"/proposals/{proposal['id']}/approve", json={"approved_amount": 200.0}, headers=finance_headers)
+        client.put(f"/categories/{category['id']}", json={"allocated_budget": 2000.0}, headers=finance_headers)
+
+        page = client.get(
+            f"/categories/{category['id']}/ledger", params={"limit": 2}, headers=finance_headers
+        ).json()
+        rest = client.get(
+            f"/categories/{category['id']}/ledger",
+            params={"after": page["next_after"]},
+            headers=finance_headers,
+        ).json()
+        entries = page["items"] + rest["items"]
+        assert [(e["entry_type"], e["allocated_delta"], e["remaining_delta"]) for e in entries] == [
+            ("allocation", 1000.0, 1000.0),
+            ("approval", 0.0, -200.0),
+            ("reallocation", 1000.0, 800.0),
+        ]
+        assert entries[1]["proposal_id"] == proposal["id"]
+        assert rest["next_after"] is None
+
+        def balance(at=None):
+            params = {"at": at} if at else {}
+            response = client.get(
+                f"/categories/{category['id']}/balance", params=params, headers=finance_headers
+            )
+            assert response.status_code == 200
+            return response.json()
+
+        current = balance()
+        assert (current["allocated_budget"], current["remaining_budget"]) == (2000.0, 1600.0)
+        assert current["remaining_budget"] == client.get(f"/categories/{category['id']}").json()["remaining_budget"]
+        after_approval = balance(entries[1]["created_at"])
+        assert (after_approval["allocated_budget"], after_approval["remaining_budget"]) == (1000.0, 800.0)
+
+        # After a snapshot the same answers come from the snapshot, not the full history
+        monkeypatch.setattr(settings, "BUDGET_SNAPSHOT_LAG_SECONDS", 0)
+        assert LedgerService.take_snapshots(test_db) >= 1
+        snapshotted = balance()
+        assert snapshotted["snapshot_id"] is not None
+        assert snapshotted["replayed_entries"] == 0
+        assert snapshotted["remaining_budget"] == 1600.0
+        assert balance(entries[1]["created_at"])["remaining_budget"] == 800.0
+
+        response = client.get(
+            f"/categories/{category['id']}/balance",
+            params={"at": "2000-01-01T00:00:00"},
+            headers=finance_headers,
+        )
+        assert response.status_code == 404
+
+    def test_etags_off_by_default(self, client, sample_category):
+        """Test list responses carry no ETag unless ETAGS_ENABLED is set"""
+        response = client.get("/categories")
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+
+    def test_conditional_get_categories(
+        self, client, test_db, finance_headers, sample_category, etags_enabled
+    ):
+        """Test If-None-Match is answered with 304 without queries until categories change"""
+        from sqlalchemy import event
+
+        first = client.get("/categories")
+        etag = first.headers["ETag"]
+        assert etag.startswith('"')
+
+        statements = []
+        engine = test_db.get_bind().engine
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            cached = client.get("/categories", headers={"If-None-Match": etag})
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert cached.status_code == 304
+        assert cached.headers["ETag"] == etag
+        assert statements == []
+
+        client.put(
+            f"/categories/{sample_category.id}", json={"name": "Renamed"}, headers=finance_headers
+        )
+        changed = client.get("/categories", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert any(c["name"] == "Renamed" for c in changed.json())
+
     def test_create_category_finance_user(self, client, finance_headers):
         """Test creating category as finance user"""
         response = client.post(
@@ -272,6 +388,88 @@ class TestProposalEndpoints:
         assert len(data) >= 1
         assert any(p["title"] == "Test Proposal" for p in data)
 
+    def test_query_metrics_per_route(self, client, sample_proposal):
+        """Test requests report their statements in Server-Timing and per-route histograms"""
+        import re
+
+        from prometheus_client import REGISTRY
+
+        labels = {"method": "GET", "handler": "/proposals/{proposal_id}"}
+        before = REGISTRY.get_sample_value("db_queries_per_request_count", labels) or 0
+
+        response = client.get(f"/proposals/{sample_proposal.id}")
+        timing = re.fullmatch(r'db;dur=[\d.]+;desc="(\d+) queries"', response.headers["server-timing"])
+        assert timing and int(timing.group(1)) >= 1
+
+        assert REGISTRY.get_sample_value("db_queries_per_request_count", labels) == before + 1
+        total = REGISTRY.get_sample_value("db_queries_per_request_sum", labels)
+        assert total is not None and total >= int(timing.group(1))
+
+    def test_fast_json_responses_match_default(
+        self,
+        client,
+        test_db,
+        sample_ministry,
+        sample_category,
+        sample_proposal,
+        monkeypatch,
+        etags_enabled,
+    ):
+        """Test the fast list responses are byte-for-byte the response_model output"""
+        from datetime import UTC, datetime, timedelta
+
+        from database import Ministry as DBMinistry
+        from database import Proposal as DBProposal
+        from settings import settings
+
+        inactive = DBMinistry(name="Ministère — «Archive»", description=None, is_active=False)
+        test_db.add(inactive)
+        test_db.flush()
+        base = datetime(2026, 3, 1, 9, 30, tzinfo=UTC)
+        test_db.add_all(
+            [
+                DBProposal(
+                    ministry_id=inactive.id,
+                    category_id=sample_category.id,
+                    title="Réseau ₹   \"quoted\" <tag>",
+                    description=None,
+                    requested_amount=0.00001,
+                    status="Rejected",
+                    decision_notes="No",
+                    decided_at=base + timedelta(microseconds=120),
+                    created_at=base,
+                ),
+                DBProposal(
+                    ministry_id=sample_ministry.id,
+                    category_id=sample_category.id,
+                    title="Large",
+                    requested_amount=1e16,
+                    status="Approved",
+                    approved_amount=250,
+                    decided_at=base + timedelta(days=1),
+                    created_at=base - timedelta(days=1, microseconds=1),
+                ),
+            ]
+        )
+        test_db.commit()
+
+        def fetch(fast: bool) -> dict[str, tuple[bytes, str | None]]:
+            monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast)
+            bodies = {}
+            for path in (
+                "/proposals",
+                f"/proposals?status=Rejected&ministry_id={inactive.id}",
+                "/categories",
+                "/ministries",
+            ):
+                response = client.get(path)
+                assert response.status_code == 200
+                assert response.headers["content-type"] == "application/json"
+                bodies[path] = (response.content, response.headers.get("ETag"))
+            return bodies
+
+        assert fetch(True) == fetch(False)
+
     def test_get_proposals_with_filters(self, client, sample_proposal, sample_category):
         """Test getting proposals with filters"""
         response = client.get(
@@ -284,6 +482,67 @@ class TestProposalEndpoints:
         assert all(p["category_id"] == sample_category.id for p in data)
         assert all(p["status"] == "Pending" for p in data)
 
+    def test_get_proposals_page_walks_all_rows(
+        self, client, test_db, sample_ministry, sample_category
+    ):
+        """Test keyset pagination returns every row exactly once, newest first"""
+        from datetime import datetime, timedelta
+
+        from database import Proposal as DBProposal
+
+        base = datetime(2025, 1, 1)
+        for i in range(5):
+            test_db.add(
+                DBProposal(
+                    ministry_id=sample_ministry.id,
+                    category_id=sample_category.id,
+                    title=f"Paged Proposal {i}",
+                    requested_amount=1000.0 + i,
+                    status="Pending",
+                    # Two rows share a timestamp so the id tiebreaker is exercised
+                    created_at=base + timedelta(days=min(i, 3)),
+                )
+            )
+        test_db.commit()
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            params = {"limit": 2, "category_id": sample_category.id}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/proposals/page", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data["items"]) <= 2
+            seen.extend(item["title"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == [
+            "Paged Proposal 4",
+            "Paged Proposal 3",
+            "Paged Proposal 2",
+            "Paged Proposal 1",
+            "Paged Proposal 0",
+        ]
+
+    def test_get_proposals_page_projection(self, client, sample_proposal):
+        """Test requesting only some columns of each proposal"""
+        response = client.get("/proposals/page", params={"fields": "title,ministry_name"})
+
+        assert response.status_code == 200
+        item = response.json()["items"][0]
+        assert set(item) == {"title", "ministry_name"}
+        assert item["ministry_name"] == "Test Ministry"
+
+    def test_get_proposals_page_invalid_params(self, client):
+        """Test unknown fields, bad cursors and oversized pages are rejected"""
+        assert client.get("/proposals/page", params={"fields": "password"}).status_code == 400
+        assert client.get("/proposals/page", params={"cursor": "not-a-cursor"}).status_code == 400
+        assert client.get("/proposals/page", params={"limit": 100000}).status_code == 400
+
     def test_create_proposal_with_ministry_name(self, client, auth_headers, sample_category):
         """Test creating proposal with ministry name"""
         response = client.post(
@@ -520,6 +779,130 @@ class TestApprovalEndpoints:
         assert data["decision_notes"] == "Approved with reduced amount"
         assert data["decided_at"] is not None
 
+    def test_event_stream_resumes_after_approval(
+        self, client, finance_headers, finance_user, sample_proposal
+    ):
+        """Test approvals are streamed as proposal and budget events from a resume point"""
+        import asyncio
+        import json
+
+        from events import broker, format_event_id, open_event_stream
+
+        resume_from = format_event_id(broker.last_id)
+        client.post(
+            f"/proposals/{sample_proposal.id}/approve",
+            json={"approved_amount": 400000.0},
+            headers=finance_headers,
+        )
+
+        async def read(last_event_id: str, count: int, *kinds: str) -> list[str]:
+            stream = open_event_stream(
+                finance_user.id, last_event_id, kinds or ("proposal", "budget")
+            )
+            try:
+                return [await anext(stream) for _ in range(count)]
+            finally:
+                await stream.aclose()
+
+        retry, proposal_frame, budget_frame = asyncio.run(read(resume_from, 3))
+        assert retry.startswith("retry:")
+
+        def parse(frame: str) -> dict[str, str]:
+            return dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+
+        proposal, budget = parse(proposal_frame), parse(budget_frame)
+        assert proposal["event"] == "proposal"
+        assert json.loads(proposal["data"])["id"] == sample_proposal.id
+        assert json.loads(proposal["data"])["action"] == "approved"
+        assert budget["event"] == "budget"
+        assert json.loads(budget["data"])["remaining_delta"] == -400000.0
+        assert budget["id"] == format_event_id(broker.last_id)
+
+        # Streams of proposal events only skip the budget event
+        async def read_proposals_then_heartbeat() -> list[str]:
+            stream = open_event_stream(finance_user.id, resume_from, ("proposal",))
+            try:
+                frames = [await anext(stream) for _ in range(2)]
+                frames.append(await asyncio.wait_for(anext(stream), 0.2))
+            except TimeoutError:
+                return frames
+            finally:
+                await stream.aclose()
+            return frames
+
+        _, only = asyncio.run(read_proposals_then_heartbeat())
+        assert parse(only)["event"] == "proposal"
+
+        # IDs from another process (or long gone from the buffer) start with a reset
+        _, reset = asyncio.run(read("unknown-1", 2))
+        assert parse(reset)["event"] == "reset"
+
+    def test_event_broker_bounds(self, client, finance_headers, finance_user, monkeypatch):
+        """Test slow subscribers are told they missed events and subscribers are capped"""
+        import asyncio
+
+        from events import EventBroker, broker, open_event_stream
+        from exceptions import EventStreamBusyError
+
+        small = EventBroker(buffer_size=2, max_subscribers=2, max_per_user=1)
+        small.publish([("budget", {"n": n}) for n in range(3)])
+        assert small.since(0, 10) == ([], True)
+        assert [e.data["n"] for e in small.since(1, 10)[0]] == [1, 2]
+        assert [e.data["n"] for e in small.since(1, 1)[0]] == [1]
+
+        async def subscribe_past_caps():
+            first = small.subscribe(1)
+            with pytest.raises(EventStreamBusyError, match="this user"):
+                small.subscribe(1)
+            small.subscribe(2)
+            with pytest.raises(EventStreamBusyError, match="subscribers"):
+                small.subscribe(3)
+            small.unsubscribe(first)
+            small.subscribe(1)
+
+        asyncio.run(subscribe_past_caps())
+
+        # A stream takes its slot only while it is iterated
+        async def open_without_reading():
+            stream = open_event_stream(finance_user.id)
+            assert len(broker._waiters) == 0
+            assert await anext(stream) == "retry: 1000\n\n"
+            assert len(broker._waiters) == 1
+            await stream.aclose()
+            assert len(broker._waiters) == 0
+
+        asyncio.run(open_without_reading())
+
+        monkeypatch.setattr(broker, "_max_subscribers", 0)
+        assert client.get("/events", headers=finance_headers).status_code == 503
+
+    def test_event_stream_requires_authentication(
+        self, client, finance_user, sample_user, monkeypatch
+    ):
+        """Test the event stream rejects anonymous clients and accepts a token in the URL"""
+        import main
+        from auth import create_access_token
+
+        opened = []
+
+        async def one_frame(user_id, last_event_id, kinds):
+            opened.append((user_id, tuple(kinds)))
+            yield "retry: 1000\n\n"
+
+        monkeypatch.setattr(main, "open_event_stream", one_frame)
+        assert client.get("/events").status_code == 401
+        assert client.get("/events", params={"access_token": "bogus"}).status_code == 401
+
+        for user in (finance_user, sample_user):
+            token = create_access_token({"sub": user.username})
+            response = client.get("/events", params={"access_token": token})
+            assert response.status_code == 200
+        # Budget events are for Finance users only
+        assert opened == [
+            (finance_user.id, ("proposal", "budget")),
+            (sample_user.id, ("proposal",)),
+        ]
+
     def test_reject_proposal(self, client, finance_headers, sample_proposal):
         """Test rejecting a proposal"""
         response = client.post(
@@ -558,6 +941,86 @@ class TestApprovalEndpoints:
         assert response.status_code == 400
         assert "exceeds requested amount" in response.json()["detail"]
 
+    def test_bulk_decisions(
+        self, client, test_db, finance_headers, sample_ministry, sample_category, sample_proposal
+    ):
+        """Test a batch applies valid decisions, reports failures and checks budgets in order"""
+        from database import Proposal as DBProposal
+        from repositories.stats import StatsRepository
+
+        extra = []
+        for title in ("Second", "Third", "Fourth"):
+            proposal = DBProposal(
+                ministry_id=sample_ministry.id,
+                category_id=sample_category.id,
+                title=title,
+                requested_amount=400000.0,
+                status="Pending",
+            )
+            test_db.add(proposal)
+            extra.append(proposal)
+        test_db.commit()
+        # Rows added directly bypass the services, so seed the aggregates
+        StatsRepository.rebuild(test_db)
+
+        response = client.post(
+            "/proposals/decisions",
+            json={
+                "items": [
+                    {"proposal_id": sample_proposal.id, "decision": "approve", "approved_amount": 500000.0},
+                    {"proposal_id": extra[0].id, "decision": "approve", "approved_amount": 400000.0},
+                    # Only 100000 left in the category after the two approvals above
+                    {"proposal_id": extra[1].id, "decision": "approve", "approved_amount": 200000.0},
+                    {"proposal_id": extra[2].id, "decision": "reject", "decision_notes": "No"},
+                    {"proposal_id": extra[2].id, "decision": "reject"},
+                    {"proposal_id": 999999, "decision": "reject"},
+                    {"proposal_id": extra[1].id, "decision": "approve"},
+                ]
+            },
+            headers=finance_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["applied"], data["failed"]) == (3, 4)
+        results = data["results"]
+        assert [r["ok"] for r in results] == [True, True, False, True, False, False, False]
+        assert results[2]["error"] == "Insufficient remaining budget"
+        assert results[4]["error"] == "Proposal appears more than once in the batch"
+        assert results[5]["error"] == "Proposal not found"
+        assert results[6]["error"] == "approved_amount must be > 0"
+
+        test_db.expire_all()
+        assert sample_category.remaining_budget == 100000.0
+        assert [p.status for p in extra] == ["Approved", "Pending", "Rejected"]
+        assert extra[2].decision_notes == "No"
+
+        category = next(
+            c
+            for c in client.get("/dashboard/summary", headers=finance_headers).json()["categories"]
+            if c["id"] == sample_category.id
+        )
+        assert category["approved_total"] == 900000.0
+        assert (category["pending_count"], category["approved_count"], category["rejected_count"]) == (1, 2, 1)
+
+        # Already decided proposals are reported, not re-applied
+        response = client.post(
+            "/proposals/decisions",
+            json={"items": [{"proposal_id": sample_proposal.id, "decision": "reject"}]},
+            headers=finance_headers,
+        )
+        assert response.json()["results"][0]["error"] == "Only pending proposals can be rejected"
+
+    def test_bulk_decisions_unauthorized(self, client, auth_headers, sample_proposal):
+        """Test bulk decisions as non-finance user"""
+        response = client.post(
+            "/proposals/decisions",
+            json={"items": [{"proposal_id": sample_proposal.id, "decision": "reject"}]},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 403
+
 
 @pytest.mark.api
 class TestDashboardEndpoints:
@@ -574,6 +1037,71 @@ class TestDashboardEndpoints:
         assert "kpis" in data
         assert "total_allocated" in data["kpis"]
 
+    def test_dashboard_summary_tracks_proposal_changes(
+        self, client, auth_headers, finance_headers, sample_ministry, sample_category
+    ):
+        """Test the aggregates follow create, update, approve, reject and delete"""
+
+        def summary():
+            data = client.get("/dashboard/summary", headers=finance_headers).json()
+            category = next(c for c in data["categories"] if c["id"] == sample_category.id)
+            ministry = next(m for m in data["ministries"] if m["ministry_id"] == sample_ministry.id)
+            return category, ministry, data["kpis"]
+
+        ids = []
+        for amount in (100.0, 200.0, 300.0):
+            response = client.post(
+                "/proposals",
+                json={"category_id": sample_category.id, "title": f"P{amount}", "requested_amount": amount},
+                headers=auth_headers,
+            )
+            ids.append(response.json()["id"])
+        client.put(f"/proposals/{ids[2]}", json={"requested_amount": 350.0}, headers=auth_headers)
+        client.post(f"/proposals/{ids[0]}/approve", json={"approved_amount": 80.0}, headers=finance_headers)
+        client.post(f"/proposals/{ids[1]}/reject", json={}, headers=finance_headers)
+
+        category, ministry, kpis = summary()
+        assert category["requested_total"] == 650.0
+        assert category["approved_total"] == 80.0
+        assert (category["pending_count"], category["approved_count"], category["rejected_count"]) == (1, 1, 1)
+        assert ministry["requested_total"] == 650.0
+        assert ministry["approved_total"] == 80.0
+        assert kpis["total_approved"] == 80.0
+
+        client.delete(f"/proposals/{ids[2]}", headers=auth_headers)
+        category, ministry, _ = summary()
+        assert category["requested_total"] == 300.0
+        assert category["pending_count"] == 0
+
+    def test_dashboard_stats_rebuild(self, client, test_db, finance_headers, sample_proposal):
+        """Test rebuilding the aggregates picks up rows written outside the services"""
+        from repositories.stats import StatsRepository
+
+        StatsRepository.rebuild(test_db)
+
+        data = client.get("/dashboard/summary", headers=finance_headers).json()
+        ministry = next(m for m in data["ministries"] if m["ministry_id"] == sample_proposal.ministry_id)
+        assert ministry["requested_total"] == sample_proposal.requested_amount
+        assert ministry["pending_count"] == 1
+
+    def test_dashboard_etag_follows_approvals(
+        self, client, finance_headers, sample_proposal, etags_enabled
+    ):
+        """Test the dashboard ETag changes when a decision changes the aggregates"""
+        etag = client.get("/dashboard/summary", headers=finance_headers).headers["ETag"]
+        headers = {**finance_headers, "If-None-Match": etag}
+        assert client.get("/dashboard/summary", headers=headers).status_code == 304
+
+        client.post(
+            "/proposals/decisions",
+            json={"items": [{"proposal_id": sample_proposal.id, "decision": "reject"}]},
+            headers=finance_headers,
+        )
+        assert client.get("/dashboard/summary", headers=headers).status_code == 200
+
+        # Unauthenticated polls are still refused, not answered from the ETag
+        assert client.get("/dashboard/summary", headers={"If-None-Match": etag}).status_code == 403
+
     def test_dashboard_unauthorized(self, client, auth_headers):
         """Test dashboard access as non-finance user"""
         response = client.get("/dashboard/summary", headers=auth_headers)
@@ -640,3 +1168,199 @@ class TestContractParsingEndpoints:
 
         assert response.status_code == 400
         assert "Unsupported file type" in response.json()["detail"]
+
+    def test_parse_contract_stream_json(self, client, auth_headers, sample_category, monkeypatch):
+        """Test streaming JSON parsing emits one NDJSON draft per element"""
+        import json
+
+        from settings import settings
+
+        # Tiny chunks force elements to straddle chunk boundaries
+        monkeypatch.setattr(settings, "CONTRACT_CHUNK_SIZE", 3)
+        records = [
+            {"ministry_name": "Test Ministry", "category": "Test Category", "title": f"Stream {i}", "requested_amount": 1000 + i}
+            for i in range(5)
+        ]
+
+        response = client.post(
+            "/contracts/parse/stream",
+            files={"file": ("test.json", json.dumps(records), "application/json")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        drafts = [json.loads(line) for line in response.text.splitlines()]
+        assert [d["title"] for d in drafts] == [f"Stream {i}" for i in range(5)]
+        assert all(d["valid"] for d in drafts)
+        assert drafts[0]["requested_amount"] == 1000.0
+
+    def test_parse_contract_parallel_matches_inline(
+        self, client, auth_headers, sample_category, monkeypatch
+    ):
+        """Test normalizing in the process pool gives the inline drafts, in order"""
+        import json
+
+        from settings import settings
+
+        records = [
+            {"dept": "Test Ministry", "category": "Test Category", "project": f"Row {i}", "amount": "x" if i % 7 == 0 else i + 1}
+            for i in range(25)
+        ]
+        # A record extract_fields cannot handle stops the file part-way through
+        broken = [*records[:10], ["not", "a", "record"], *records[10:]]
+
+        # A file cut short fails while it is being read
+        truncated = json.dumps(records)[:-60]
+
+        def parse(content: list | str) -> list[str]:
+            body = content if isinstance(content, str) else json.dumps(content)
+            response = client.post(
+                "/contracts/parse/stream",
+                files={"file": ("test.json", body, "application/json")},
+                headers=auth_headers,
+            )
+            assert response.status_code == 200
+            lines: list[str] = response.text.splitlines()
+            return lines
+
+        inline = [parse(content) for content in (records, broken, truncated)]
+        monkeypatch.setattr(settings, "CONTRACT_PARSE_WORKERS", 2)
+        monkeypatch.setattr(settings, "CONTRACT_PARSE_CHUNK_ROWS", 4)
+        assert [parse(content) for content in (records, broken, truncated)] == inline
+        assert len(inline[1]) == 11 and "error" in json.loads(inline[1][-1])
+        assert "error" in json.loads(inline[2][-1])
+
+    def test_parse_contract_stream_csv(self, client, auth_headers, sample_category):
+        """Test streaming CSV parsing, including a quoted field spanning lines"""
+        import json
+
+        csv_content = 'ministry_name,category,title,description,requested_amount\nTest Ministry,Test Category,Road,"two\nlines",500\n'
+
+        response = client.post(
+            "/contracts/parse/stream",
+            files={"file": ("test.csv", csv_content, "text/csv")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        drafts = [json.loads(line) for line in response.text.splitlines()]
+        assert len(drafts) == 1
+        assert drafts[0]["description"] == "two\nlines"
+
+    def test_parse_contract_stream_malformed_json(self, client, auth_headers):
+        """Test a parse error part-way through is reported as a final error line"""
+        import json
+
+        response = client.post(
+            "/contracts/parse/stream",
+            files={"file": ("test.json", '[{"title": "ok"}, {"title": ', "application/json")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0]["title"] == "ok"
+        assert "Failed to parse file" in lines[-1]["error"]
+
+    def test_parse_contract_stream_invalid_format(self, client, auth_headers):
+        """Test unsupported file types are rejected before streaming starts"""
+        response = client.post(
+            "/contracts/parse/stream",
+            files={"file": ("test.txt", "nope", "text/plain")},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+
+    def test_import_contract_drafts(
+        self, client, auth_headers, finance_headers, sample_ministry, sample_category, monkeypatch
+    ):
+        """Test drafts are created in chunks, with failures reported by index and the summary kept in step"""
+        from settings import settings
+
+        monkeypatch.setattr(settings, "CONTRACT_IMPORT_CHUNK_SIZE", 2)
+        drafts = [
+            {"ministry_id": sample_ministry.id, "category_id": sample_category.id, "title": "A", "requested_amount": 10},
+            {"ministry_name": "test ministry", "category_id": sample_category.id, "title": "B", "requested_amount": 20},
+            {"ministry_name": "Brand New Agency", "category_id": sample_category.id, "title": "C", "requested_amount": 30},
+            {"ministry_name": "Brand New Agency", "category_id": 9999, "title": "D", "requested_amount": 40},
+            {"ministry_name": "Brand New Agency", "category_id": sample_category.id, "title": "", "requested_amount": 0},
+        ]
+
+        response = client.post("/contracts/import", json={"drafts": drafts}, headers=finance_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["created"], data["failed"]) == (3, 2)
+        assert [e["index"] for e in data["errors"]] == [3, 4]
+        assert data["errors"][0]["errors"] == ["Category does not exist"]
+        assert len(data["errors"][1]["errors"]) == 2
+
+        created = [client.get(f"/proposals/{i}", headers=finance_headers).json() for i in data["ids"]]
+        assert [p["title"] for p in created] == ["A", "B", "C"]
+        assert created[0]["ministry"]["id"] == created[1]["ministry"]["id"] == sample_ministry.id
+        assert created[2]["ministry"]["name"] == "Brand New Agency"
+
+        summary = client.get("/dashboard/summary", headers=finance_headers).json()
+        category = next(c for c in summary["categories"] if c["id"] == sample_category.id)
+        assert category["pending_count"] == 3
+
+        # Ministry users can only import into their own ministry
+        response = client.post(
+            "/contracts/import",
+            json={"drafts": [{"ministry_id": 9999, "category_id": sample_category.id, "title": "E", "requested_amount": 1}]},
+            headers=auth_headers,
+        )
+        assert response.json()["errors"][0]["errors"] == ["You can only create proposals for your own ministry"]
+
+        # Exactly one of drafts and job_id
+        response = client.post("/contracts/import", json={}, headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_parse_contract_resolves_names_in_batch(
+        self, client, test_db, auth_headers, sample_category, sample_proposal
+    ):
+        """Test name matching, ministry creation and duplicate flags with a constant query count"""
+        from sqlalchemy import event
+
+        def parse(rows):
+            lines = ["ministry,category,title,requested_amount"] + rows
+            statements = []
+
+            def count(*args):
+                statements.append(args[2])
+
+            event.listen(test_db.get_bind().engine, "before_cursor_execute", count)
+            try:
+                response = client.post(
+                    "/contracts/parse",
+                    files={"file": ("test.csv", "\n".join(lines), "text/csv")},
+                    headers=auth_headers,
+                )
+            finally:
+                event.remove(test_db.get_bind().engine, "before_cursor_execute", count)
+            assert response.status_code == 200
+            return response.json()["drafts"], len(statements)
+
+        drafts, _ = parse(
+            [
+                "test ministry,TEST CATEGORY,Exact,10",
+                "Test Min,Categ,Partial,20",
+                "Brand New Agency,Nope,Created,30",
+                "New Agency,Test Category,Reuses created,40",
+                "Test Ministry,Test Category,Test Proposal,500000",
+            ]
+        )
+        assert [d["ministry_id"] == sample_proposal.ministry_id for d in drafts] == [
+            True, True, False, False, True,
+        ]
+        assert drafts[0]["category_id"] == sample_category.id
+        assert drafts[1]["category_id"] == sample_category.id
+        assert "unknown category" in drafts[2]["errors"]
+        assert drafts[2]["ministry_id"] is not None
+        assert drafts[3]["ministry_id"] == drafts[2]["ministry_id"]
+        assert drafts[4]["errors"] == ["possible duplicate"]
+
+        _, few = parse([f"Test Ministry,Test Category,Row {i},{i + 1}" for i in range(5)])
+        _, many = parse([f"Test Ministry,Test Category,Row {i},{i + 1}" for i in range(100)])
+        assert many == few
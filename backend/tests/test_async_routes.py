@@ -0,0 +1,151 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from async_routes import router as async_router
+from auth import create_access_token, get_password_hash
+from database import Base, async_database_url, get_async_db
+from database import Category as DBCategory
+from database import Ministry as DBMinistry
+from database import Proposal as DBProposal
+from database import User as DBUser
+from main import app as main_app
+
+
+@pytest.fixture(scope="function")
+def async_client():
+    """Client for an app serving only the async router, backed by aiosqlite"""
+    tmp_db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    tmp_db.close()
+    db_url = f"sqlite:///{tmp_db.name}"
+
+    # Seed with a regular engine; the async engine reads the committed file
+    sync_engine = create_engine(db_url)
+    Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(bind=sync_engine)() as db:
+        ministry = DBMinistry(name="Async Ministry")
+        category = DBCategory(name="Async Category", allocated_budget=1000.0, remaining_budget=1000.0)
+        db.add_all([ministry, category])
+        db.flush()
+        db.add(
+            DBUser(
+                username="finance",
+                email="finance@example.com",
+                hashed_password=get_password_hash("fin"),
+                role="finance",
+            )
+        )
+        db.add_all(
+            DBProposal(
+                ministry_id=ministry.id,
+                category_id=category.id,
+                title=f"Async Proposal {i}",
+                requested_amount=100.0,
+                status="Pending",
+            )
+            for i in range(3)
+        )
+        db.commit()
+
+    async_engine = create_async_engine(async_database_url(db_url))
+    session_factory = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(async_router)
+    app.exception_handlers.update(main_app.exception_handlers)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    with TestClient(app) as client:
+        yield client
+
+    asyncio.run(async_engine.dispose())
+    sync_engine.dispose()
+    os.unlink(tmp_db.name)
+
+
+@pytest.fixture(scope="function")
+def async_finance_headers():
+    token = create_access_token({"sub": "finance"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.api
+class TestAsyncRoutes:
+    """Test the AsyncSession variants of the hot routes"""
+
+    def test_async_database_url(self):
+        """Test sync URLs map to their async drivers"""
+        assert async_database_url("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+        assert (
+            async_database_url("postgresql+psycopg://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+        )
+
+    def test_list_reads(self, async_client):
+        """Test categories, ministries and proposals are served asynchronously"""
+        assert async_client.get("/categories").json()[0]["name"] == "Async Category"
+        assert async_client.get("/ministries").json()[0]["name"] == "Async Ministry"
+
+        proposals = async_client.get("/proposals").json()
+        assert len(proposals) == 3
+        assert proposals[0]["ministry"]["name"] == "Async Ministry"
+
+        page = async_client.get("/proposals/page", params={"limit": 2}).json()
+        assert len(page["items"]) == 2
+        assert page["next_cursor"] is not None
+
+        assert async_client.get("/proposals/999").status_code == 404
+
+    def test_fast_json_list_reads(self, async_client, monkeypatch):
+        """Test the fast list responses match the response_model output on the async routes"""
+        from settings import settings
+
+        paths = ("/categories", "/ministries", "/proposals", "/proposals?status=Pending")
+        default = [async_client.get(path).content for path in paths]
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+        assert [async_client.get(path).content for path in paths] == default
+
+    def test_approve_and_dashboard(self, async_client, async_finance_headers):
+        """Test approvals and the dashboard through the async session"""
+        proposal_id = async_client.get("/proposals").json()[0]["id"]
+
+        response = async_client.post(
+            f"/proposals/{proposal_id}/approve",
+            json={"approved_amount": 60.0},
+            headers=async_finance_headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["status"] == "Approved"
+        assert response.json()["ministry"]["name"] == "Async Ministry"
+
+        summary = async_client.get("/dashboard/summary", headers=async_finance_headers).json()
+        assert summary["categories"][0]["remaining_budget"] == 940.0
+        assert summary["categories"][0]["approved_total"] == 60.0
+
+        response = async_client.post(
+            f"/proposals/{proposal_id}/reject", json={}, headers=async_finance_headers
+        )
+        assert response.status_code == 400
+
+    def test_finance_role_required(self, async_client):
+        """Test async auth rejects missing and unknown users"""
+        assert async_client.get("/dashboard/summary").status_code == 403
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'ghost'})}"}
+        assert async_client.get("/dashboard/summary", headers=headers).status_code == 401
@@ -71,6 +71,64 @@ class TestPasswordHashing:
         assert hash2.startswith(("$2a$", "$2b$", "$2y$"))
 
 
+@pytest.mark.auth
+class TestPasswordHashingPool:
+    """Test the bounded bcrypt worker pool and rehash-on-login"""
+
+    def test_hashing_inline_when_pool_disabled(self, monkeypatch):
+        """Test PASSWORD_HASH_WORKERS=0 hashes on the calling thread"""
+        from settings import settings
+
+        monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+        hashed = get_password_hash("inline")
+        assert verify_password("inline", hashed) is True
+
+    def test_saturated_pool_returns_429(self, client, sample_user, monkeypatch):
+        """Test login is rejected with 429 when no hashing slot is free"""
+        import threading
+
+        import auth
+
+        monkeypatch.setattr(auth, "_hash_slots", threading.BoundedSemaphore(1))
+        auth._hash_slots.acquire()
+
+        response = client.post(
+            "/auth/login", json={"username": "testuser", "password": "testpassword"}
+        )
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+
+    def test_login_rehashes_outdated_cost(self, test_db, sample_user):
+        """Test a hash with a different bcrypt cost is upgraded on login"""
+        from passlib.context import CryptContext
+
+        from auth import password_needs_rehash
+
+        cheap = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+        sample_user.hashed_password = cheap.hash("testpassword")
+        test_db.commit()
+        assert password_needs_rehash(sample_user.hashed_password) is True
+
+        assert authenticate_user(test_db, "testuser", "testpassword") is not None
+
+        test_db.refresh(sample_user)
+        assert password_needs_rehash(sample_user.hashed_password) is False
+        assert verify_password("testpassword", sample_user.hashed_password) is True
+
+    def test_login_upgrades_legacy_sha256(self, test_db, sample_user):
+        """Test a legacy SHA256 hash is replaced by bcrypt on login"""
+        import hashlib
+
+        sample_user.hashed_password = hashlib.sha256(b"testpassword").hexdigest()
+        test_db.commit()
+
+        assert authenticate_user(test_db, "testuser", "testpassword") is not None
+
+        test_db.refresh(sample_user)
+        assert sample_user.hashed_password.startswith("$2")
+
+
 @pytest.mark.auth
 class TestTokenCreation:
     """Test JWT token creation and validation"""
@@ -191,6 +249,64 @@ class TestCurrentUser:
         assert exc_info.value.status_code == 401
 
 
+@pytest.mark.auth
+class TestUserCache:
+    """Test the per-token authenticated user cache"""
+
+    def test_cached_user_skips_database(self, test_db, sample_user):
+        """Test a second lookup with the same token issues no query"""
+        from sqlalchemy import event
+
+        token = create_access_token({"sub": "testuser"})
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        first = get_current_user(credentials, test_db)
+
+        statements = []
+        engine = test_db.get_bind().engine
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            second = get_current_user(credentials, test_db)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert second == first
+        assert second.ministry_id == sample_user.ministry_id
+        assert statements == []
+
+    def test_user_update_invalidates_cache(self, test_db, sample_user, finance_user):
+        """Test changing a user drops its cached snapshot"""
+        token = create_access_token({"sub": "testuser"})
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        assert get_current_user(credentials, test_db).role == "ministry"
+
+        sample_user.role = "finance"
+        test_db.commit()
+
+        assert get_current_user(credentials, test_db).role == "finance"
+
+    def test_cache_ttl_and_lru_eviction(self):
+        """Test entries expire and the least recently used entry is evicted"""
+        import time
+
+        from auth import CurrentUser, TokenUserCache
+
+        cache = TokenUserCache(max_size=2, ttl_seconds=60)
+        users = [CurrentUser(id=i, username=f"u{i}", role="finance", ministry_id=None, is_active=True) for i in range(3)]
+        far_future = time.time() + 3600
+
+        cache.put("a", users[0], far_future)
+        cache.put("b", users[1], far_future)
+        assert cache.get("a") == users[0]  # "b" is now least recently used
+        cache.put("c", users[2], far_future)
+        assert cache.get("b") is None
+        assert cache.get("a") == users[0]
+
+        # A token expiring before the TTL bounds the entry's lifetime
+        cache.put("expired", users[2], time.time() - 1)
+        assert cache.get("expired") is None
+
+
 @pytest.mark.auth
 class TestRoleValidation:
     """Test role-based access validation"""
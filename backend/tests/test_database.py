@@ -2,7 +2,7 @@ import sys
 from pathlib import Path
 
 import pytest
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, ProgrammingError
 
 # Add the backend directory to the Python path
 backend_dir = Path(__file__).parent.parent
@@ -395,3 +395,628 @@ class TestDatabaseIntegrity:
         # So we'll test the relationship integrity instead
         assert sample_proposal.category_id == category_id
         assert sample_proposal.category.name == sample_category.name
+
+
+def _capture_statements(engine, run):
+    """Run a callable and return the (statement, parameters) it sent to the database."""
+    from sqlalchemy import event
+
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def _explain(connection, statement, parameters):
+    """Return the query plan of a statement as one lowercase string."""
+    cursor = connection.connection.cursor()
+    if connection.dialect.name == "sqlite":
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return "\n".join(str(row[-1]) for row in cursor.fetchall()).lower()
+    # On PostgreSQL tiny test tables always favour a seq scan, so only ask whether an index is usable
+    cursor.execute("SET LOCAL enable_seqscan = off")
+    cursor.execute(f"EXPLAIN {statement}", parameters)
+    return "\n".join(str(row[0]) for row in cursor.fetchall()).lower()
+
+
+def _proposal_queries(db, ministry_id, category_id):
+    """The repository calls whose statements must be served by an index."""
+    from repositories.proposals import ProposalRepository
+
+    return {
+        "get_all": lambda: ProposalRepository.get_all(db),
+        "get_all_by_ministry": lambda: ProposalRepository.get_all(db, ministry_id=ministry_id),
+        "get_all_by_category": lambda: ProposalRepository.get_all(db, category_id=category_id),
+        "get_all_by_status": lambda: ProposalRepository.get_all(db, status="Pending"),
+        "get_page": lambda: ProposalRepository.get_page(db, 10, fields=["title"]),
+        "check_duplicate": lambda: ProposalRepository.check_duplicate(
+            db, ministry_id, "Test Proposal", 500000.0
+        ),
+        "approved_totals": lambda: ProposalRepository.get_approved_totals_by_category(db),
+    }
+
+
+def _assert_queries_use_indexes(db, ministry_id, category_id):
+    engine = db.get_bind().engine
+    connection = db.connection()
+    for name, run in _proposal_queries(db, ministry_id, category_id).items():
+        statements = _capture_statements(engine, run)
+        assert statements, f"{name} issued no SQL"
+        for statement, parameters in statements:
+            plan = _explain(connection, statement, parameters)
+            if connection.dialect.name == "sqlite":
+                proposal_lines = [line for line in plan.splitlines() if "proposals" in line]
+                assert proposal_lines, f"{name}: proposals missing from plan\n{plan}"
+                for line in proposal_lines:
+                    assert "index" in line, f"{name} scans proposals without an index:\n{plan}"
+            else:
+                assert "seq scan on proposals" not in plan, f"{name}:\n{plan}"
+
+
+@pytest.mark.database
+class TestQueryPlans:
+    """Test that the proposal repository queries are served by indexes"""
+
+    def test_proposal_queries_use_indexes_sqlite(self, test_db, sample_proposal):
+        """Test EXPLAIN QUERY PLAN of each repository query on SQLite"""
+        _assert_queries_use_indexes(
+            test_db, sample_proposal.ministry_id, sample_proposal.category_id
+        )
+
+    def test_proposal_queries_use_indexes_postgres(self):
+        """Test EXPLAIN of each repository query on PostgreSQL (set TEST_POSTGRES_URL)"""
+        import os
+
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+
+        from database import Base
+
+        postgres_url = os.getenv("TEST_POSTGRES_URL")
+        if not postgres_url:
+            pytest.skip("TEST_POSTGRES_URL not set")
+
+        engine = create_engine(postgres_url)
+        Base.metadata.create_all(bind=engine)
+        connection = engine.connect()
+        transaction = connection.begin()
+        try:
+            db = Session(bind=connection)
+            ministry = DBMinistry(name="Plan Ministry")
+            category = DBCategory(name="Plan Category", allocated_budget=1.0, remaining_budget=1.0)
+            db.add_all([ministry, category])
+            db.flush()
+            _assert_queries_use_indexes(db, ministry.id, category.id)
+        finally:
+            transaction.rollback()
+            connection.close()
+            engine.dispose()
+
+
+def _assert_loaded_dataset_accepts_inserts(engine):
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import Session
+
+    from benchmarks.datagen import DatasetGenerator, DatasetSizes, load_database
+
+    counts = load_database(engine, DatasetGenerator(DatasetSizes(3, 4, 50)))
+    with Session(engine) as db:
+        ministry = DBMinistry(name="Added After Load")
+        category = DBCategory(name="Added After Load", allocated_budget=1.0, remaining_budget=1.0)
+        db.add_all([ministry, category])
+        db.flush()
+        proposal = DBProposal(
+            ministry_id=ministry.id,
+            category_id=category.id,
+            title="Added After Load",
+            requested_amount=1.0,
+        )
+        db.add(proposal)
+        db.commit()
+        assert (ministry.id, category.id, proposal.id) == (4, 5, 51)
+        assert db.scalar(select(func.count()).select_from(DBProposal)) == counts["proposals"] + 1
+
+
+@pytest.mark.database
+class TestDatasetLoad:
+    """Test the synthetic dataset loader leaves the database usable by the server"""
+
+    def test_inserts_after_load_sqlite(self, tmp_path):
+        """Test rows inserted after a SQLite load get fresh IDs"""
+        from sqlalchemy import create_engine
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'scale.db'}")
+        try:
+            _assert_loaded_dataset_accepts_inserts(engine)
+        finally:
+            engine.dispose()
+
+    def test_inserts_after_load_postgres(self):
+        """Test PostgreSQL sequences are advanced past the loaded IDs (set TEST_POSTGRES_URL)"""
+        import os
+
+        from sqlalchemy import create_engine
+
+        from database import Base
+
+        postgres_url = os.getenv("TEST_POSTGRES_URL")
+        if not postgres_url:
+            pytest.skip("TEST_POSTGRES_URL not set")
+
+        engine = create_engine(postgres_url)
+        Base.metadata.drop_all(bind=engine)
+        try:
+            _assert_loaded_dataset_accepts_inserts(engine)
+        finally:
+            Base.metadata.drop_all(bind=engine)
+            engine.dispose()
+
+
+def _assert_first_aggregates_recorded_concurrently(engine):
+    import threading
+
+    from sqlalchemy.orm import sessionmaker
+
+    from database import CategoryStats as DBCategoryStats
+    from database import MinistryStats as DBMinistryStats
+    from repositories.stats import StatsRepository
+
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        ministry = DBMinistry(name="Stats Ministry")
+        category = DBCategory(name="Stats Category", allocated_budget=1.0, remaining_budget=1.0)
+        db.add_all([ministry, category])
+        db.commit()
+        snapshot = {
+            "ministry_id": ministry.id,
+            "category_id": category.id,
+            "status": "Pending",
+            "requested_amount": 10.0,
+            "approved_amount": None,
+        }
+
+    # Both transactions find no aggregates row; the second waits on the first's insert
+    first, second = session_factory(), session_factory()
+
+    def record_second() -> None:
+        StatsRepository.record_change(second, None, snapshot)
+        second.commit()
+
+    try:
+        StatsRepository.record_change(first, None, snapshot)
+        waiting = threading.Thread(target=record_second)
+        waiting.start()
+        first.commit()
+        waiting.join(10)
+        assert not waiting.is_alive()
+    finally:
+        first.close()
+        second.close()
+
+    with session_factory() as db:
+        for model in (DBCategoryStats, DBMinistryStats):
+            stats = db.query(model).one()
+            assert (stats.pending_count, stats.requested_total) == (2, 20.0)
+
+
+@pytest.mark.database
+class TestProposalStats:
+    """Test the dashboard aggregates are kept by upserts"""
+
+    def test_record_changes_upserts(self, test_db, sample_ministry, sample_category):
+        """Test the first change creates a category's aggregates and later ones add to them"""
+        from database import CategoryStats as DBCategoryStats
+        from repositories.stats import StatsRepository
+
+        pending = {
+            "ministry_id": sample_ministry.id,
+            "category_id": sample_category.id,
+            "status": "Pending",
+            "requested_amount": 100.0,
+            "approved_amount": None,
+        }
+        approved = {**pending, "status": "Approved", "approved_amount": 60.0}
+        StatsRepository.record_changes(test_db, [(None, pending), (None, pending)])
+        StatsRepository.record_change(test_db, pending, approved)
+        test_db.commit()
+
+        stats = test_db.get(DBCategoryStats, sample_category.id)
+        assert stats is not None
+        assert (stats.pending_count, stats.approved_count) == (1, 1)
+        assert (stats.requested_total, stats.approved_total) == (200.0, 60.0)
+
+    def test_first_aggregates_recorded_concurrently_postgres(self):
+        """Test two transactions can record a category's first aggregates (set TEST_POSTGRES_URL)"""
+        import os
+
+        from sqlalchemy import create_engine
+
+        from database import Base
+
+        postgres_url = os.getenv("TEST_POSTGRES_URL")
+        if not postgres_url:
+            pytest.skip("TEST_POSTGRES_URL not set")
+
+        engine = create_engine(postgres_url)
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        try:
+            _assert_first_aggregates_recorded_concurrently(engine)
+        finally:
+            Base.metadata.drop_all(bind=engine)
+            engine.dispose()
+
+
+@pytest.mark.database
+class TestConnectionPool:
+    """Test pool configuration, idle pre-ping and pool metrics"""
+
+    def _engine(self, tmp_path, monkeypatch, **overrides):
+        from sqlalchemy import create_engine
+
+        from database import InstrumentedQueuePool, pool_options
+        from settings import settings
+
+        for name, value in overrides.items():
+            monkeypatch.setattr(settings, name, value)
+        url = f"sqlite:///{tmp_path / 'pool.db'}"
+        return create_engine(url, poolclass=InstrumentedQueuePool, **pool_options(url))
+
+    def test_pool_options_from_settings(self, monkeypatch):
+        """Test sizing settings apply except for in-memory SQLite"""
+        from database import pool_options
+        from settings import settings
+
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+        monkeypatch.setattr(settings, "DB_POOL_PRE_PING", "idle")
+
+        options = pool_options("postgresql://db/app")
+        assert options["pool_size"] == 7
+        assert options["pool_pre_ping"] is False
+        assert "pool_size" not in pool_options("sqlite:///:memory:")
+        assert "pool_size" not in pool_options("sqlite+aiosqlite:///pool.db")
+
+    def test_async_engine_from_settings(self, tmp_path, monkeypatch):
+        """Test the async engine builds for SQLite and PostgreSQL URLs, sized only where it pools"""
+        import asyncio
+
+        from sqlalchemy.pool import NullPool, QueuePool
+
+        from database import async_database_url, make_async_engine
+        from settings import settings
+
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+        sqlite_engine = make_async_engine(async_database_url(f"sqlite:///{tmp_path / 'pool.db'}"))
+        postgres_engine = make_async_engine(async_database_url("postgresql://u:p@db/app"))
+        try:
+            assert isinstance(sqlite_engine.pool, NullPool)
+            assert isinstance(postgres_engine.pool, QueuePool)
+            assert postgres_engine.pool.size() == 7
+        finally:
+            asyncio.run(sqlite_engine.dispose())
+            asyncio.run(postgres_engine.dispose())
+
+    def test_pool_metrics(self, tmp_path, monkeypatch):
+        """Test pool gauges and the checkout wait histogram are exported"""
+        from prometheus_client import REGISTRY
+
+        from database import register_pool_metrics
+
+        engine = self._engine(tmp_path, monkeypatch, DB_POOL_SIZE=3)
+        register_pool_metrics(engine, "test")
+        labels = {"engine": "test"}
+        waits_before = REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count") or 0
+
+        with engine.connect():
+            assert REGISTRY.get_sample_value("db_pool_checked_out", labels) == 1
+            assert REGISTRY.get_sample_value("db_pool_size", labels) == 3
+        assert REGISTRY.get_sample_value("db_pool_checked_out", labels) == 0
+        assert REGISTRY.get_sample_value("db_pool_checked_in", labels) == 1
+        waits_after = REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count")
+        assert waits_after is not None and waits_after > waits_before
+        engine.dispose()
+
+    def test_idle_pre_ping_replaces_dead_connection(self, tmp_path, monkeypatch):
+        """Test a connection idle past the threshold is pinged and replaced if dead"""
+        from sqlalchemy import text
+
+        from database import enable_idle_pre_ping
+
+        engine = self._engine(tmp_path, monkeypatch, DB_POOL_PRE_PING="idle")
+        enable_idle_pre_ping(engine, idle_seconds=60)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        # Kill the pooled connection; used moments ago, it is handed out unchecked
+        record = engine.pool._pool.queue[0]
+        record.dbapi_connection.close()
+        with pytest.raises(ProgrammingError), engine.connect() as conn:
+            conn.exec_driver_sql("SELECT 1")
+
+        # Idle past the threshold, it is pinged, found dead and replaced
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        record = engine.pool._pool.queue[0]
+        record.dbapi_connection.close()
+        record.info["checked_in_at"] -= 120
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+        engine.dispose()
+
+
+@pytest.mark.database
+class TestQueryTracking:
+    """Test per-request statement counting and the slow query log"""
+
+    def test_track_queries_and_slow_query_log(self, tmp_path, monkeypatch, caplog):
+        """Test statements are counted per context and slow ones logged without their values"""
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.exc import OperationalError
+
+        from database import enable_query_tracking, track_queries
+        from settings import settings
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'queries.db'}")
+        enable_query_tracking(engine)
+        enable_query_tracking(engine)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            with track_queries() as stats:
+                conn.execute(text("SELECT 2"))
+                with pytest.raises(OperationalError):
+                    conn.execute(text("SELECT * FROM missing_table"))
+                monkeypatch.setattr(settings, "SLOW_QUERY_MS", 1e-6)
+                with caplog.at_level("WARNING", logger="database"):
+                    conn.execute(text("SELECT :secret"), {"secret": "hunter2"})
+
+        assert stats.count == 2
+        assert stats.slowest_seconds > 0
+        assert "Slow query" in caplog.text and "SELECT ?" in caplog.text
+        assert "1 parameters redacted" in caplog.text
+        assert "hunter2" not in caplog.text
+        engine.dispose()
+
+
+@pytest.mark.database
+class TestSQLiteTuning:
+    """Test SQLite production mode pragmas and the single-writer lock"""
+
+    def _engine(self, tmp_path):
+        from sqlalchemy import create_engine
+
+        from database import enable_sqlite_tuning
+
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'tuned.db'}", connect_args={"check_same_thread": False}
+        )
+        enable_sqlite_tuning(engine)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        return engine
+
+    def test_pragmas_applied(self, tmp_path):
+        """Test WAL journaling, synchronous and busy timeout are set per connection"""
+        from settings import settings
+
+        engine = self._engine(tmp_path)
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+            assert (
+                conn.exec_driver_sql("PRAGMA busy_timeout").scalar()
+                == settings.SQLITE_BUSY_TIMEOUT_MS
+            )
+        engine.dispose()
+
+    def test_writes_are_serialized_but_reads_are_not(self, tmp_path):
+        """Test a second writer waits for the first to commit while readers proceed"""
+        import threading
+
+        engine = self._engine(tmp_path)
+        order = []
+        first_wrote = threading.Event()
+
+        def second_writer():
+            first_wrote.wait()
+            with engine.begin() as conn:
+                conn.exec_driver_sql("INSERT INTO items (name) VALUES ('second')")
+                order.append("second")
+
+        thread = threading.Thread(target=second_writer)
+        thread.start()
+        with engine.begin() as conn:
+            conn.exec_driver_sql("INSERT INTO items (name) VALUES ('first')")
+            first_wrote.set()
+            # A reader is not blocked by the open write transaction
+            with engine.connect() as reader:
+                assert reader.exec_driver_sql("SELECT count(*) FROM items").scalar() == 0
+            thread.join(timeout=0.2)
+            assert thread.is_alive()
+            order.append("first")
+        thread.join(timeout=5)
+
+        assert order == ["first", "second"]
+        with engine.connect() as conn:
+            names = conn.exec_driver_sql("SELECT name FROM items ORDER BY id").scalars().all()
+        assert names == ["first", "second"]
+        engine.dispose()
+
+
+@pytest.mark.database
+class TestOptimisticApproval:
+    """Test the lock-free conditional-UPDATE approval path"""
+
+    @pytest.fixture
+    def db(self, tmp_path, monkeypatch):
+        """A standalone database, since the optimistic path rolls back on conflicts"""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+
+        from database import Base
+        from settings import settings
+
+        monkeypatch.setattr(settings, "APPROVAL_STRATEGY", "optimistic")
+        engine = create_engine(f"sqlite:///{tmp_path / 'approvals.db'}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        ministry = DBMinistry(name="Ministry")
+        category = DBCategory(name="Category", allocated_budget=1000.0, remaining_budget=1000.0)
+        session.add_all([ministry, category])
+        session.flush()
+        for title in ("A", "B"):
+            session.add(
+                DBProposal(
+                    ministry_id=ministry.id,
+                    category_id=category.id,
+                    title=title,
+                    requested_amount=600.0,
+                    status="Pending",
+                )
+            )
+        session.commit()
+        yield session
+        session.close()
+        engine.dispose()
+
+    def _proposals(self, db):
+        return db.query(DBProposal).order_by(DBProposal.id).all()
+
+    def test_conditional_budget_decrement(self, db):
+        """Test approvals succeed while budget remains and fail without side effects after"""
+        from exceptions import InsufficientBudgetError
+        from services.approvals import ApprovalService
+
+        first, second = self._proposals(db)
+        approved = ApprovalService.approve_proposal(db, first.id, 600.0)
+        assert approved.status == "Approved"
+
+        with pytest.raises(InsufficientBudgetError):
+            ApprovalService.approve_proposal(db, second.id, 500.0)
+
+        db.expire_all()
+        assert db.query(DBCategory).one().remaining_budget == 400.0
+        assert second.status == "Pending"
+        assert second.approved_amount is None
+
+    def test_lost_race_is_retried(self, db, monkeypatch):
+        """Test a compare-and-set that misses is retried and counted"""
+        from prometheus_client import REGISTRY
+
+        from repositories.proposals import ProposalRepository
+        from services.approvals import ApprovalService
+
+        original = ProposalRepository.decide_if_unchanged
+        calls = []
+
+        def flaky(session, proposal, values):
+            calls.append(proposal.id)
+            return len(calls) > 1 and original(session, proposal, values)
+
+        monkeypatch.setattr(ProposalRepository, "decide_if_unchanged", flaky)
+        retries_before = REGISTRY.get_sample_value("approval_retries_total") or 0
+
+        first, _ = self._proposals(db)
+        assert ApprovalService.approve_proposal(db, first.id, 100.0).status == "Approved"
+        assert len(calls) == 2
+        assert REGISTRY.get_sample_value("approval_retries_total") == retries_before + 1
+
+    def test_gives_up_after_max_retries(self, db, monkeypatch):
+        """Test a proposal that never settles raises ConcurrentUpdateError"""
+        from exceptions import ConcurrentUpdateError
+        from repositories.proposals import ProposalRepository
+        from services.approvals import ApprovalService
+
+        monkeypatch.setattr(ProposalRepository, "decide_if_unchanged", lambda *args: False)
+
+        first, _ = self._proposals(db)
+        with pytest.raises(ConcurrentUpdateError):
+            ApprovalService.approve_proposal(db, first.id, 100.0)
+        db.expire_all()
+        assert db.query(DBCategory).one().remaining_budget == 1000.0
+
+    def test_already_decided(self, db):
+        """Test a decided proposal is rejected by validation, not retried"""
+        from exceptions import InvalidProposalStatusError
+        from services.approvals import ApprovalService
+
+        first, _ = self._proposals(db)
+        ApprovalService.reject_proposal(db, first.id)
+        with pytest.raises(InvalidProposalStatusError):
+            ApprovalService.approve_proposal(db, first.id, 100.0)
+
+    def test_sharded_budget(self, db, monkeypatch):
+        """Test approvals draw from shards, rebalance when one runs dry and collapse back"""
+        from database import CategoryBudgetShard as DBCategoryBudgetShard
+        from exceptions import InsufficientBudgetError
+        from repositories.budgets import BudgetShardRepository
+        from services.approvals import ApprovalService
+        from settings import settings
+
+        monkeypatch.setattr(settings, "BUDGET_SHARDS", 4)
+        first, second = self._proposals(db)
+
+        # No shards yet: the first approval spreads the rest of the budget over 4 shards
+        ApprovalService.approve_proposal(db, first.id, 600.0)
+        category = db.query(DBCategory).one()
+        shards = db.query(DBCategoryBudgetShard).all()
+        assert category.remaining_budget == 0.0
+        assert sorted(s.remaining_budget for s in shards) == [100.0] * 4
+        assert category.available_budget == 400.0
+
+        # More than any single shard holds: rebalanced from the pooled total
+        ApprovalService.approve_proposal(db, second.id, 150.0)
+        db.expire_all()
+        assert sum(s.remaining_budget for s in db.query(DBCategoryBudgetShard)) == 250.0
+        assert db.query(DBCategory).one().available_budget == 250.0
+
+        db.add(
+            DBProposal(
+                ministry_id=first.ministry_id,
+                category_id=category.id,
+                title="C",
+                requested_amount=600.0,
+                status="Pending",
+            )
+        )
+        db.commit()
+        third = self._proposals(db)[2]
+        with pytest.raises(InsufficientBudgetError):
+            ApprovalService.approve_proposal(db, third.id, 300.0)
+
+        BudgetShardRepository.collapse(db)
+        db.commit()
+        assert db.query(DBCategoryBudgetShard).count() == 0
+        assert db.query(DBCategory).one().remaining_budget == 250.0
+
+    def test_rebalance_splits_in_cents(self, db, monkeypatch):
+        """Test a pooled budget that does not divide evenly never leaves a shard negative"""
+        from database import CategoryBudgetShard as DBCategoryBudgetShard
+        from repositories.budgets import BudgetShardRepository
+        from settings import settings
+
+        monkeypatch.setattr(settings, "BUDGET_SHARDS", 4)
+        for total, expected in (
+            (0.03, [0.01, 0.01, 0.01, 0.0]),
+            (100.02, [25.01, 25.01, 25.0, 25.0]),
+            (0.004, [0.004, 0.0, 0.0, 0.0]),
+        ):
+            values = BudgetShardRepository._split(total, 4)
+            assert values == pytest.approx(expected)
+            assert min(values) >= 0
+            assert sum(values) == pytest.approx(total)
+
+        category = db.query(DBCategory).one()
+        category.remaining_budget = 1000.0
+        db.commit()
+        assert BudgetShardRepository.rebalance(db, category.id, 999.97)
+        shards = db.query(DBCategoryBudgetShard).order_by(DBCategoryBudgetShard.shard).all()
+        assert [s.remaining_budget for s in shards] == pytest.approx([0.01, 0.01, 0.01, 0.0])
+        assert db.query(DBCategory).one().available_budget == pytest.approx(0.03)
@@ -0,0 +1,209 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import services.imports
+from auth import create_access_token
+from database import Base, get_db
+from database import Category as DBCategory
+from database import ImportJob as DBImportJob
+from database import Ministry as DBMinistry
+from database import User as DBUser
+from main import app
+from settings import settings
+
+
+@pytest.fixture(scope="function")
+def jobs_client(tmp_path, monkeypatch):
+    """Client whose requests and job workers share a file database (jobs use their own sessions)"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with session_factory() as db:
+        ministry = DBMinistry(name="Test Ministry")
+        db.add_all([ministry, DBCategory(name="Test Category", allocated_budget=1000.0, remaining_budget=1000.0)])
+        db.flush()
+        for username, role in (("importer", "ministry"), ("other", "ministry"), ("finance", "finance")):
+            db.add(
+                DBUser(
+                    username=username,
+                    email=f"{username}@example.com",
+                    hashed_password="unused",
+                    role=role,
+                    ministry_id=ministry.id if role == "ministry" else None,
+                )
+            )
+        db.commit()
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr(services.imports, "SessionLocal", session_factory)
+    monkeypatch.setattr(settings, "CONTRACT_JOB_DIR", str(tmp_path / "uploads"))
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def headers(username: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+
+def wait_for(client: TestClient, job_id: str) -> dict:
+    for _ in range(200):
+        job: dict = client.get(f"/contracts/jobs/{job_id}", headers=headers("importer")).json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.mark.api
+class TestImportJobs:
+    """Test background contract import jobs"""
+
+    def test_import_job_progress_and_results(self, jobs_client, monkeypatch):
+        """Test a job returns at once, finishes in the background and pages its drafts in file order"""
+        monkeypatch.setattr(settings, "CONTRACT_BATCH_SIZE", 4)
+        lines = ["ministry_name,category,title,requested_amount"] + [
+            f"Test Ministry,Test Category,Row {i},{'x' if i % 5 == 0 else i + 1}" for i in range(23)
+        ]
+
+        response = jobs_client.post(
+            "/contracts/jobs",
+            files={"file": ("big.csv", "\n".join(lines), "text/csv")},
+            headers=headers("importer"),
+        )
+        assert response.status_code == 202
+        assert response.json()["status"] in ("queued", "running", "completed")
+
+        job = wait_for(jobs_client, response.json()["id"])
+        assert job["status"] == "completed"
+        assert (job["rows_processed"], job["valid_rows"], job["error_rows"]) == (23, 18, 5)
+        assert job["progress"] == 1.0
+        assert job["eta_seconds"] is None
+
+        drafts: list[dict] = []
+        after: str | None = None
+        while True:
+            page = jobs_client.get(
+                f"/contracts/jobs/{job['id']}/results",
+                params={"limit": 10, **({"after": after} if after else {})},
+                headers=headers("importer"),
+            ).json()
+            drafts += page["items"]
+            if (after := page["next_after"]) is None:
+                break
+        assert [d["title"] for d in drafts] == [f"Row {i}" for i in range(23)]
+        assert [d["row_number"] for d in drafts] == list(range(1, 24))
+
+        invalid = jobs_client.get(
+            f"/contracts/jobs/{job['id']}/results",
+            params={"valid": False},
+            headers=headers("finance"),
+        ).json()["items"]
+        assert [d["title"] for d in invalid] == [f"Row {i}" for i in range(0, 23, 5)]
+        assert all("invalid amount" in d["errors"] for d in invalid)
+
+        # Other ministry users cannot see the job
+        other = jobs_client.get(f"/contracts/jobs/{job['id']}", headers=headers("other"))
+        assert other.status_code == 404
+
+    def test_import_job_parse_error(self, jobs_client):
+        """Test a file that breaks part-way fails the job but keeps the rows before the error"""
+        response = jobs_client.post(
+            "/contracts/jobs",
+            files={
+                "file": (
+                    "broken.json",
+                    '[{"ministry_name": "Test Ministry", "category": "Test Category", '
+                    '"title": "Kept", "requested_amount": 10}, {"title": ',
+                    "application/json",
+                )
+            },
+            headers=headers("importer"),
+        )
+
+        job = wait_for(jobs_client, response.json()["id"])
+        assert job["status"] == "failed"
+        assert job["error"].startswith("Failed to parse file")
+        assert job["rows_processed"] == 1
+
+    def test_import_job_into_proposals(self, jobs_client, monkeypatch):
+        """Test the valid drafts of a completed job are created as proposals"""
+        monkeypatch.setattr(settings, "CONTRACT_IMPORT_CHUNK_SIZE", 3)
+        lines = ["ministry_name,category,title,requested_amount"] + [
+            f"Test Ministry,Test Category,Row {i},{'x' if i % 4 == 0 else i + 1}" for i in range(10)
+        ]
+        response = jobs_client.post(
+            "/contracts/jobs",
+            files={"file": ("rows.csv", "\n".join(lines), "text/csv")},
+            headers=headers("importer"),
+        )
+        job = wait_for(jobs_client, response.json()["id"])
+
+        # Only the owner (or finance) may import the job
+        other = jobs_client.post("/contracts/import", json={"job_id": job["id"]}, headers=headers("other"))
+        assert other.status_code == 404
+
+        response = jobs_client.post("/contracts/import", json={"job_id": job["id"]}, headers=headers("importer"))
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["created"], data["failed"]) == (7, 0)
+
+        titles = [p["title"] for p in jobs_client.get("/proposals", headers=headers("finance")).json()]
+        assert sorted(titles) == sorted(f"Row {i}" for i in range(10) if i % 4)
+
+        # A retried import creates nothing more
+        again = jobs_client.post("/contracts/import", json={"job_id": job["id"]}, headers=headers("importer"))
+        assert again.status_code == 409
+        assert len(jobs_client.get("/proposals", headers=headers("finance")).json()) == len(titles)
+        status = jobs_client.get(f"/contracts/jobs/{job['id']}", headers=headers("importer")).json()
+        assert status["status"] == "imported"
+
+    def test_recover_jobs_leaves_live_workers_alone(self, jobs_client, monkeypatch):
+        """Test startup recovery only fails jobs of this worker's earlier life or with a stale heartbeat"""
+        from datetime import UTC, datetime, timedelta
+
+        from repositories.imports import ImportJobRepository
+        from services.imports import ImportJobService, _worker_id
+
+        monkeypatch.setattr(settings, "CONTRACT_JOB_STALE_SECONDS", 60)
+        now = datetime.now(UTC)
+        with services.imports.SessionLocal() as db:
+            for job_id, worker, touched in (
+                ("live", "elsewhere:1", now),
+                ("stale", "elsewhere:2", now - timedelta(minutes=5)),
+                ("mine", _worker_id(), now),
+            ):
+                ImportJobRepository.create(
+                    db,
+                    {"id": job_id, "owner_id": 1, "filename": "c.csv", "file_type": "csv", "status": "queued"},
+                )
+                assert ImportJobRepository.mark_started(db, job_id, worker)
+                # A job is claimed once, however many workers it was queued on
+                assert not ImportJobRepository.mark_started(db, job_id, "elsewhere:3")
+                ImportJobRepository.add_rows(db, job_id, 1, [], 0)
+                db.query(DBImportJob).filter_by(id=job_id).update({"updated_at": touched})
+                db.commit()
+
+            ImportJobService.recover_jobs(db)
+            statuses = {job.id: job.status for job in db.query(DBImportJob)}
+        assert statuses == {"live": "running", "stale": "failed", "mine": "failed"}
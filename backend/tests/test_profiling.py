@@ -0,0 +1,119 @@
+import sys
+import threading
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import profiling
+from settings import settings
+
+
+@pytest.fixture(scope="function")
+def profiling_enabled(monkeypatch):
+    """Turn profiling on for one test"""
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+
+
+def spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def hoard(stop: threading.Event, kept: list) -> None:
+    while not stop.is_set():
+        kept.append(bytearray(10000))
+        stop.wait(0.001)
+
+
+@pytest.mark.api
+class TestProfilingEndpoints:
+    """Test the on-demand profiling endpoints"""
+
+    def test_profiling_disabled_by_default(self, client, finance_headers):
+        """Test that both profiles answer 404 unless profiling is enabled"""
+        for path in ("/debug/profile/cpu", "/debug/profile/allocations"):
+            response = client.get(path, params={"seconds": 0.01}, headers=finance_headers)
+            assert response.status_code == 404
+        assert not tracemalloc.is_tracing()
+
+    def test_profiling_requires_finance(self, client, auth_headers, profiling_enabled):
+        """Test that ministry users cannot profile"""
+        response = client.get("/debug/profile/cpu", params={"seconds": 0.01}, headers=auth_headers)
+        assert response.status_code == 403
+
+    def test_cpu_profile_collapsed_stacks(self, client, finance_headers, profiling_enabled):
+        """Test that a CPU profile returns collapsed stacks including a busy thread"""
+        stop = threading.Event()
+        worker = threading.Thread(target=spin, args=(stop,), name="spinner")
+        worker.start()
+        try:
+            response = client.get(
+                "/debug/profile/cpu",
+                params={"seconds": 0.3, "interval_ms": 5},
+                headers=finance_headers,
+            )
+        finally:
+            stop.set()
+            worker.join()
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        lines = response.text.splitlines()
+        stacks = {}
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            stacks[stack] = int(count)
+        spinner = [stack for stack in stacks if stack.startswith("spinner;")]
+        assert spinner
+        assert any(stack.endswith("test_profiling.py:22)") for stack in spinner)
+        assert sum(stacks[stack] for stack in spinner) >= 10
+
+    def test_allocation_profile_top_sites(self, client, finance_headers, profiling_enabled):
+        """Test that an allocation profile reports the site holding new memory"""
+        stop = threading.Event()
+        kept: list = []
+        worker = threading.Thread(target=hoard, args=(stop, kept))
+        worker.start()
+        try:
+            response = client.get(
+                "/debug/profile/allocations",
+                params={"seconds": 0.3, "top": 5},
+                headers=finance_headers,
+            )
+        finally:
+            stop.set()
+            worker.join()
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["sites"]) <= 5
+        top = data["sites"][0]
+        assert top["file"].endswith("test_profiling.py")
+        assert top["line"] == 29
+        assert top["size_diff"] >= 10 * 10000
+        assert data["peak_bytes"] >= top["size"]
+        assert not tracemalloc.is_tracing()
+
+    def test_profile_limits(self, client, finance_headers, profiling_enabled):
+        """Test that out of range durations and intervals are rejected"""
+        too_long = settings.PROFILING_MAX_SECONDS + 1
+        for params in ({"seconds": too_long}, {"seconds": 0}, {"seconds": 0.1, "interval_ms": 0}):
+            response = client.get("/debug/profile/cpu", params=params, headers=finance_headers)
+            assert response.status_code == 400
+        response = client.get(
+            "/debug/profile/allocations", params={"seconds": 0.1, "top": 0}, headers=finance_headers
+        )
+        assert response.status_code == 400
+
+    def test_one_profile_at_a_time(self, client, finance_headers, profiling_enabled):
+        """Test that a profile requested while another runs is refused"""
+        with profiling._profile_lock:
+            response = client.get(
+                "/debug/profile/allocations", params={"seconds": 0.01}, headers=finance_headers
+            )
+        assert response.status_code == 409
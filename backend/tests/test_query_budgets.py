@@ -0,0 +1,363 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi.routing import APIRoute
+
+import main
+import services.imports
+from settings import settings
+
+# The most SQL statements each route may issue per request, cold user cache included.
+# Routes are exercised against several ministries, categories and proposals, so a
+# per-row query (N+1) shows up as a blown budget; lower a budget when a route improves.
+ROUTE_BUDGETS = {
+    ("POST", "/auth/register"): 6,
+    ("POST", "/auth/login"): 1,
+    ("GET", "/auth/me"): 2,
+    ("GET", "/categories"): 1,
+    ("POST", "/categories"): 6,
+    ("GET", "/categories/{category_id}"): 1,
+    ("PUT", "/categories/{category_id}"): 9,
+    ("DELETE", "/categories/{category_id}"): 8,
+    ("GET", "/categories/{category_id}/balance"): 3,
+    ("GET", "/categories/{category_id}/ledger"): 2,
+    ("GET", "/ministries"): 1,
+    ("POST", "/ministries"): 4,
+    ("POST", "/ministries/find-or-create"): 4,
+    ("GET", "/"): 0,
+    ("GET", "/health"): 1,
+    ("GET", "/metrics"): 0,
+    ("GET", "/proposals"): 1,
+    ("GET", "/proposals/page"): 1,
+    ("POST", "/proposals"): 9,
+    ("GET", "/proposals/{proposal_id}"): 1,
+    ("PUT", "/proposals/{proposal_id}"): 10,
+    ("DELETE", "/proposals/{proposal_id}"): 5,
+    ("POST", "/proposals/decisions"): 15,
+    ("POST", "/proposals/{proposal_id}/approve"): 10,
+    ("POST", "/proposals/{proposal_id}/reject"): 8,
+    ("POST", "/contracts/parse"): 4,
+    ("POST", "/contracts/parse/stream"): 4,
+    ("POST", "/contracts/jobs"): 3,
+    ("GET", "/contracts/jobs/{job_id}"): 3,
+    ("GET", "/contracts/jobs/{job_id}/results"): 3,
+    ("POST", "/contracts/import"): 11,
+    ("GET", "/dashboard/summary"): 3,
+    ("GET", "/events"): 1,
+    ("GET", "/debug/profile/cpu"): 1,
+    ("GET", "/debug/profile/allocations"): 1,
+}
+
+
+@pytest.fixture(scope="function")
+def spending(test_db, sample_ministry, sample_category, sample_user):
+    """Several ministries, categories and proposals, some already decided"""
+    from database import Category as DBCategory
+    from database import Ministry as DBMinistry
+    from database import Proposal as DBProposal
+    from repositories.stats import StatsRepository
+
+    ministries = [sample_ministry] + [DBMinistry(name=f"Ministry {i}") for i in range(3)]
+    categories = [sample_category] + [
+        DBCategory(name=f"Category {i}", allocated_budget=1000000.0, remaining_budget=1000000.0)
+        for i in range(3)
+    ]
+    test_db.add_all(ministries + categories)
+    test_db.flush()
+    proposals = [
+        DBProposal(
+            ministry_id=ministries[i % 4].id,
+            category_id=categories[i // 4].id,
+            title=f"Proposal {i}",
+            requested_amount=1000.0 + i,
+            status="Rejected" if i % 5 == 4 else "Pending",
+        )
+        for i in range(16)
+    ]
+    test_db.add_all(proposals)
+    test_db.commit()
+    # Rows added directly bypass the services, so seed the aggregates
+    StatsRepository.rebuild(test_db)
+    # Proposals of the test user's ministry that are still pending
+    pending = [
+        p for p in proposals if p.ministry_id == sample_ministry.id and p.status == "Pending"
+    ]
+    return SimpleNamespace(
+        ministries=ministries, categories=categories, proposals=proposals, pending=pending
+    )
+
+
+@pytest.fixture(scope="function")
+def import_job(test_db, sample_user, sample_category):
+    """A completed import job of sample_user with valid and invalid rows"""
+    from repositories.imports import ImportJobRepository
+
+    job = ImportJobRepository.create(
+        test_db,
+        {"id": "budgetjob", "owner_id": sample_user.id, "filename": "c.csv", "file_type": "csv"},
+    )
+    drafts = [
+        {
+            "valid": i % 3 != 2,
+            "ministry_id": sample_user.ministry_id,
+            "category_id": sample_category.id,
+            "title": f"Imported {i}",
+            "requested_amount": 100.0 + i,
+        }
+        for i in range(9)
+    ]
+    ImportJobRepository.add_rows(test_db, "budgetjob", 1, drafts, 0)
+    ImportJobRepository.mark_finished(test_db, "budgetjob")
+    return job
+
+
+def contract_csv(rows: int) -> str:
+    lines = ["ministry_name,category,title,requested_amount"]
+    lines += [f"Test Ministry,Category {i % 3},Project {i},{1000 + i}" for i in range(rows)]
+    return "\n".join(lines)
+
+
+@pytest.mark.api
+class TestQueryBudgets:
+    """Test that every route stays within its SQL statement budget"""
+
+    def test_every_route_has_a_budget(self):
+        """Test that each route of the app has a budget, and each budget a route"""
+        routes = {
+            (method, route.path)
+            for route in main.app.routes
+            if isinstance(route, APIRoute)
+            for method in route.methods
+        }
+        assert routes == set(ROUTE_BUDGETS)
+
+    def test_auth_budgets(self, client, query_budget, sample_ministry, sample_user, auth_headers):
+        """Test the query budgets of the auth routes"""
+        with query_budget(ROUTE_BUDGETS["POST", "/auth/register"]):
+            response = client.post(
+                "/auth/register",
+                json={
+                    "username": "budgeted",
+                    "email": "budgeted@example.com",
+                    "password": "password123",
+                    "role": "ministry",
+                    "ministry_id": sample_ministry.id,
+                },
+            )
+        assert response.status_code == 200
+        with query_budget(ROUTE_BUDGETS["POST", "/auth/login"]):
+            response = client.post(
+                "/auth/login", json={"username": "testuser", "password": "testpassword"}
+            )
+        assert response.status_code == 200
+        with query_budget(ROUTE_BUDGETS["GET", "/auth/me"]):
+            response = client.get("/auth/me", headers=auth_headers)
+        assert response.status_code == 200
+
+    def test_category_budgets(self, client, query_budget, finance_headers, spending):
+        """Test the query budgets of the category routes"""
+        with query_budget(ROUTE_BUDGETS["GET", "/categories"]):
+            assert client.get("/categories").status_code == 200
+        with query_budget(ROUTE_BUDGETS["GET", "/categories/{category_id}"]):
+            assert client.get(f"/categories/{spending.categories[1].id}").status_code == 200
+        # Created through the API so that its budget history starts in the ledger
+        with query_budget(ROUTE_BUDGETS["POST", "/categories"]):
+            response = client.post(
+                "/categories",
+                json={"name": "Budgeted", "allocated_budget": 1000.0},
+                headers=finance_headers,
+            )
+        assert response.status_code == 200
+        category_id = response.json()["id"]
+        with query_budget(ROUTE_BUDGETS["PUT", "/categories/{category_id}"]):
+            response = client.put(
+                f"/categories/{category_id}",
+                json={"name": "Renamed", "allocated_budget": 2000.0},
+                headers=finance_headers,
+            )
+        assert response.status_code == 200
+        with query_budget(ROUTE_BUDGETS["GET", "/categories/{category_id}/balance"]):
+            response = client.get(f"/categories/{category_id}/balance", headers=finance_headers)
+        assert response.status_code == 200
+        with query_budget(ROUTE_BUDGETS["GET", "/categories/{category_id}/ledger"]):
+            response = client.get(f"/categories/{category_id}/ledger", headers=finance_headers)
+        assert len(response.json()["items"]) == 2
+        with query_budget(ROUTE_BUDGETS["DELETE", "/categories/{category_id}"]):
+            response = client.delete(f"/categories/{category_id}", headers=finance_headers)
+        assert response.status_code == 200
+
+    def test_ministry_budgets(self, client, query_budget, finance_headers, auth_headers, spending):
+        """Test the query budgets of the ministry routes"""
+        with query_budget(ROUTE_BUDGETS["GET", "/ministries"]):
+            assert client.get("/ministries").status_code == 200
+        with query_budget(ROUTE_BUDGETS["POST", "/ministries"]):
+            response = client.post(
+                "/ministries", json={"name": "Budgeted Ministry"}, headers=finance_headers
+            )
+        assert response.status_code == 200
+        with query_budget(ROUTE_BUDGETS["POST", "/ministries/find-or-create"]):
+            response = client.post(
+                "/ministries/find-or-create",
+                params={"ministry_name": "Found Ministry"},
+                headers=auth_headers,
+            )
+        assert response.status_code == 200
+
+    def test_service_budgets(self, client, query_budget, auth_headers, monkeypatch):
+        """Test the query budgets of the root, health, metrics and event routes"""
+
+        async def one_frame(user_id, last_event_id, kinds):
+            yield "retry: 1000\n\n"
+
+        # The real stream never ends; the route's own work is what is budgeted
+        monkeypatch.setattr(main, "open_event_stream", one_frame)
+        with query_budget(ROUTE_BUDGETS["GET", "/"]):
+            assert client.get("/").status_code == 200
+        with query_budget(ROUTE_BUDGETS["GET", "/health"]):
+            assert client.get("/health").status_code == 200
+        with query_budget(ROUTE_BUDGETS["GET", "/metrics"]):
+            assert client.get("/metrics").status_code == 200
+        with query_budget(ROUTE_BUDGETS["GET", "/events"]):
+            assert client.get("/events", headers=auth_headers).status_code == 200
+
+    def test_proposal_budgets(self, client, query_budget, auth_headers, spending):
+        """Test the query budgets of the proposal routes"""
+        proposal = spending.pending[0]
+        with query_budget(ROUTE_BUDGETS["GET", "/proposals"]):
+            response = client.get("/proposals")
+        assert len(response.json()) == len(spending.proposals)
+        with query_budget(ROUTE_BUDGETS["GET", "/proposals/page"]):
+            response = client.get("/proposals/page", params={"limit": 10})
+        assert response.status_code == 200
+        with query_budget(ROUTE_BUDGETS["GET", "/proposals/{proposal_id}"]):
+            assert client.get(f"/proposals/{proposal.id}").status_code == 200
+        with query_budget(ROUTE_BUDGETS["POST", "/proposals"]):
+            response = client.post(
+                "/proposals",
+                json={
+                    "category_id": spending.categories[2].id,
+                    "title": "Budgeted Proposal",
+                    "requested_amount": 1000.0,
+                },
+                headers=auth_headers,
+            )
+        assert response.status_code == 200
+        with query_budget(ROUTE_BUDGETS["PUT", "/proposals/{proposal_id}"]):
+            response = client.put(
+                f"/proposals/{proposal.id}",
+                json={"title": "Updated", "category_id": spending.categories[3].id},
+                headers=auth_headers,
+            )
+        assert response.status_code == 200
+        with query_budget(ROUTE_BUDGETS["DELETE", "/proposals/{proposal_id}"]):
+            response = client.delete(f"/proposals/{response.json()['id']}", headers=auth_headers)
+        assert response.status_code == 200
+
+    def test_decision_budgets(self, client, query_budget, finance_headers, spending):
+        """Test the query budgets of the approval routes"""
+        first, second, *rest = (p for p in spending.proposals if p.status == "Pending")
+        with query_budget(ROUTE_BUDGETS["POST", "/proposals/{proposal_id}/approve"]):
+            response = client.post(
+                f"/proposals/{first.id}/approve",
+                json={"approved_amount": 500.0},
+                headers=finance_headers,
+            )
+        assert response.status_code == 200
+        with query_budget(ROUTE_BUDGETS["POST", "/proposals/{proposal_id}/reject"]):
+            response = client.post(
+                f"/proposals/{second.id}/reject",
+                json={"decision_notes": "No"},
+                headers=finance_headers,
+            )
+        assert response.status_code == 200
+        items = [
+            {"proposal_id": p.id, "decision": "approve", "approved_amount": 100.0}
+            if i % 2
+            else {"proposal_id": p.id, "decision": "reject"}
+            for i, p in enumerate(rest)
+        ]
+        with query_budget(ROUTE_BUDGETS["POST", "/proposals/decisions"]):
+            response = client.post(
+                "/proposals/decisions", json={"items": items}, headers=finance_headers
+            )
+        assert response.json()["applied"] == len(items)
+        with query_budget(ROUTE_BUDGETS["GET", "/dashboard/summary"]):
+            response = client.get("/dashboard/summary", headers=finance_headers)
+        assert response.status_code == 200
+
+    def test_contract_budgets(self, client, query_budget, auth_headers, spending):
+        """Test the query budgets of contract parsing and draft import"""
+        content = contract_csv(30)
+        with query_budget(ROUTE_BUDGETS["POST", "/contracts/parse"]):
+            response = client.post(
+                "/contracts/parse",
+                files={"file": ("contract.csv", content, "text/csv")},
+                headers=auth_headers,
+            )
+        drafts = response.json()["drafts"]
+        assert len(drafts) == 30
+        with query_budget(ROUTE_BUDGETS["POST", "/contracts/parse/stream"]):
+            response = client.post(
+                "/contracts/parse/stream",
+                files={"file": ("contract.csv", content, "text/csv")},
+                headers=auth_headers,
+            )
+        assert len(response.text.splitlines()) >= 30
+        with query_budget(ROUTE_BUDGETS["POST", "/contracts/import"]):
+            response = client.post(
+                "/contracts/import", json={"drafts": drafts}, headers=auth_headers
+            )
+        assert response.json()["created"] == 30
+
+    def test_import_job_budgets(
+        self, client, query_budget, auth_headers, import_job, monkeypatch, tmp_path
+    ):
+        """Test the query budgets of the import job routes"""
+        queued = []
+        # Jobs run on their own sessions; only the submission itself is budgeted
+        monkeypatch.setattr(
+            services.imports,
+            "_get_job_executor",
+            lambda: SimpleNamespace(submit=lambda *args: queued.append(args)),
+        )
+        monkeypatch.setattr(settings, "CONTRACT_JOB_DIR", str(tmp_path))
+        with query_budget(ROUTE_BUDGETS["POST", "/contracts/jobs"]):
+            response = client.post(
+                "/contracts/jobs",
+                files={"file": ("contract.csv", contract_csv(30), "text/csv")},
+                headers=auth_headers,
+            )
+        assert response.status_code == 202
+        assert len(queued) == 1
+        with query_budget(ROUTE_BUDGETS["GET", "/contracts/jobs/{job_id}"]):
+            response = client.get(f"/contracts/jobs/{import_job.id}", headers=auth_headers)
+        assert response.json()["status"] == "completed"
+        with query_budget(ROUTE_BUDGETS["GET", "/contracts/jobs/{job_id}/results"]):
+            response = client.get(f"/contracts/jobs/{import_job.id}/results", headers=auth_headers)
+        assert len(response.json()["items"]) == 9
+        with query_budget(ROUTE_BUDGETS["POST", "/contracts/import"]):
+            response = client.post(
+                "/contracts/import", json={"job_id": import_job.id}, headers=auth_headers
+            )
+        assert response.json()["created"] == 6
+
+    def test_profiling_budgets(self, client, query_budget, finance_headers, monkeypatch):
+        """Test the query budgets of the profiling routes"""
+        monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+        with query_budget(ROUTE_BUDGETS["GET", "/debug/profile/cpu"]):
+            response = client.get(
+                "/debug/profile/cpu", params={"seconds": 0.05}, headers=finance_headers
+            )
+        assert response.status_code == 200
+        with query_budget(ROUTE_BUDGETS["GET", "/debug/profile/allocations"]):
+            response = client.get(
+                "/debug/profile/allocations", params={"seconds": 0.05}, headers=finance_headers
+            )
+        assert response.status_code == 200
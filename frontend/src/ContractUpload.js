@@ -6,6 +6,7 @@ const ContractUpload = ({ onCreated }) => {
   const [drafts, setDrafts] = useState([]);
   const [error, setError] = useState(null);
   const [parsing, setParsing] = useState(false);
+  const [importing, setImporting] = useState(false);
 
   const onSelect = (e) => {
     setFile(e.target.files[0] || null);
@@ -122,6 +123,36 @@ const ContractUpload = ({ onCreated }) => {
     }
   };
 
+  const createAllValid = async () => {
+    const pending = drafts
+      .map((d, i) => ({ d, i }))
+      .filter(({ d }) => d.valid && !d.isCreating && !d.isCreated);
+    if (pending.length === 0) { return; }
+    const indexes = new Set(pending.map(({ i }) => i));
+    setImporting(true);
+    setDrafts(prev => prev.map((x, i) => indexes.has(i) ? { ...x, isCreating: true } : x));
+    try {
+      const res = await uploadAPI.importDrafts(pending.map(({ d }) => ({
+        ministry_name: d.ministry_name,
+        category_id: d.category_id,
+        title: d.title,
+        description: d.description || null,
+        requested_amount: d.requested_amount
+      })));
+      // Errors are reported by position in the request
+      const failed = new Set(res.errors.map(err => pending[err.index].i));
+      setDrafts(prev => prev.map((x, i) => indexes.has(i) ? { ...x, isCreating: false, isCreated: !failed.has(i) } : x));
+      setError(res.failed > 0 ? `${res.failed} draft(s) could not be created: ${res.errors[0].errors.join(', ')}` : null);
+      onCreated && onCreated();
+    } catch (e) {
+      setDrafts(prev => prev.map((x, i) => indexes.has(i) ? { ...x, isCreating: false } : x));
+      const detail = e?.response?.data?.detail;
+      setError(typeof detail === 'string' ? detail : 'Failed to create proposals from drafts');
+    } finally {
+      setImporting(false);
+    }
+  };
+
   return (
     <div className="card">
       <h2 className="page-title">Upload Contract</h2>
@@ -139,6 +170,15 @@ const ContractUpload = ({ onCreated }) => {
       {drafts.length > 0 && (
         <div className="categories-table" style={{ marginTop: 20 }}>
           <h3>Parsed Drafts</h3>
+          <div className="form-actions">
+            <button
+              className="btn btn-primary"
+              onClick={createAllValid}
+              disabled={importing || !drafts.some(d => d.valid && !d.isCreated)}
+            >
+              {importing ? 'Creating…' : 'Create All Valid'}
+            </button>
+          </div>
           <table>
             <thead>
               <tr>
@@ -104,6 +104,10 @@ export const uploadAPI = {
       headers: { 'Content-Type': 'multipart/form-data' }
     });
     return response.data;
+  },
+  importDrafts: async (drafts) => {
+    const response = await api.post('/contracts/import', { drafts });
+    return response.data;
   }
 };
 